@@ -13,6 +13,13 @@ from .character_ranker import rank_characters, analyze_character_trends
 
 logger = logging.getLogger(__name__)
 
+# 인기도 점수 가중치 (조회수 1, 추천수 10, 댓글수 5)
+VIEW_WEIGHT = 1.0
+RECOMMEND_WEIGHT = 10.0
+COMMENT_WEIGHT = 5.0
+# 증가 속도(시간당)를 몇 시간치 반응으로 환산해 더할지 (참여도 갱신 크롤링으로 계산된 게시글만)
+VELOCITY_HORIZON_HOURS = 24.0
+
 
 def calculate_daily_stats(posts: List[Dict]) -> Dict[str, any]:
     """
@@ -111,6 +118,9 @@ def identify_hot_posts(posts: List[Dict], top_n: int = 10) -> List[Dict]:
     """
     인기 게시글 식별 (조회수 + 추천수 + 댓글 수 종합)
     
+    시간당 증가 속도(views_per_hour 등)가 있으면 VELOCITY_HORIZON_HOURS 동안의 예상 증가분을 더함
+    (지금 빠르게 반응이 늘고 있는 게시글이 오래돼서 누적값만 큰 게시글보다 앞설 수 있음)
+    
     Args:
         posts: 게시글 목록
         top_n: 반환할 상위 개수
@@ -120,15 +130,12 @@ def identify_hot_posts(posts: List[Dict], top_n: int = 10) -> List[Dict]:
     """
     def calculate_score(post: Dict) -> float:
         """인기도 점수 계산"""
-        view_weight = 1.0
-        recommend_weight = 10.0
-        comment_weight = 5.0
-        
-        return (
-            post.get("view_count", 0) * view_weight +
-            post.get("recommend_count", 0) * recommend_weight +
-            post.get("comment_count", 0) * comment_weight
+        total = (
+            (post.get("view_count") or 0) * VIEW_WEIGHT +
+            (post.get("recommend_count") or 0) * RECOMMEND_WEIGHT +
+            (post.get("comment_count") or 0) * COMMENT_WEIGHT
         )
+        return total + velocity_score(post) * VELOCITY_HORIZON_HOURS
     
     scored_posts = [(post, calculate_score(post)) for post in posts]
     scored_posts.sort(key=lambda x: x[1], reverse=True)
@@ -143,6 +150,23 @@ def identify_hot_posts(posts: List[Dict], top_n: int = 10) -> List[Dict]:
     return result
 
 
+def velocity_score(post: Dict) -> float:
+    """시간당 증가 속도를 인기도 점수와 같은 가중치로 합친 값 (증가 속도가 없으면 0)"""
+    return max(
+        (post.get("views_per_hour") or 0) * VIEW_WEIGHT +
+        (post.get("recommends_per_hour") or 0) * RECOMMEND_WEIGHT +
+        (post.get("comments_per_hour") or 0) * COMMENT_WEIGHT,
+        0.0
+    )
+
+
+def analysis_text(post: Dict) -> str:
+    """키워드/캐릭터 분석에 사용할 텍스트 (제목 + 수집된 본문)"""
+    title = post.get("title") or ""
+    body = post.get("body") or ""
+    return f"{title} {body}" if body else title
+
+
 def generate_daily_report(
     posts: List[Dict],
     previous_posts: Optional[List[Dict]] = None,
@@ -164,24 +188,24 @@ def generate_daily_report(
     # 기본 통계
     stats = calculate_daily_stats(posts)
     
-    # 게시글 제목 추출
-    titles = [p.get("title", "") for p in posts if p.get("title")]
-    previous_titles = [p.get("title", "") for p in (previous_posts or []) if p.get("title")]
+    # 분석 대상 텍스트 (제목 + 본문, 본문이 없으면 제목만)
+    texts = [analysis_text(p) for p in posts if p.get("title")]
+    previous_texts = [analysis_text(p) for p in (previous_posts or []) if p.get("title")]
     
     # 키워드 추출
-    keywords = extract_keywords_tfidf(titles, top_n=30)
+    keywords = extract_keywords_tfidf(texts, top_n=30)
     
     # 캐릭터 랭킹
-    character_rankings = rank_characters(titles, top_n=20)
+    character_rankings = rank_characters(texts, top_n=20)
     
     # 트렌드 분석 (이전 데이터가 있는 경우)
     trending_topics = []
     character_trends = []
     
     if previous_posts:
-        previous_keywords = extract_keywords_tfidf(previous_titles, top_n=30)
+        previous_keywords = extract_keywords_tfidf(previous_texts, top_n=30)
         trending_topics = find_trending_topics(keywords, previous_keywords)
-        character_trends = analyze_character_trends(titles, previous_titles)
+        character_trends = analyze_character_trends(texts, previous_texts)
     
     # 인기 게시글
     hot_posts = identify_hot_posts(posts, top_n=10)
@@ -0,0 +1,69 @@
+"""
+이벤트 루프 지연(loop lag) 측정
+- 일정 간격으로 sleep 한 뒤 실제로 깨어난 시각과의 차이를 기록
+- 크롤링 중에도 API가 응답 가능한지(루프가 막히지 않는지) 확인하는 용도
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정기"""
+    
+    def __init__(self, interval: float = 0.05, window: int = 1200):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - start - self.interval, 0.0)
+            self._samples.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+    
+    def start(self) -> None:
+        """현재 이벤트 루프에서 측정 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """측정 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def reset(self) -> None:
+        """측정값 초기화"""
+        self._samples.clear()
+        self._max_lag = 0.0
+    
+    def snapshot(self) -> Dict[str, float]:
+        """최근 구간의 지연 통계 (밀리초)"""
+        samples = sorted(self._samples)
+        
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(int(len(samples) * p), len(samples) - 1)] * 1000
+        
+        return {
+            "samples": len(samples),
+            "interval_ms": self.interval * 1000,
+            "p50_ms": round(percentile(0.50), 2),
+            "p99_ms": round(percentile(0.99), 2),
+            "max_recent_ms": round(samples[-1] * 1000, 2) if samples else 0.0,
+            "max_ms": round(self._max_lag * 1000, 2),
+        }
+
+
+# API 서버 전역 측정기 (main.py lifespan에서 시작)
+loop_monitor = LoopLagMonitor()
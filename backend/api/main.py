@@ -9,11 +9,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
 from models.database import init_db
 from api.routes import router
+from api.loop_monitor import loop_monitor
+from crawler.parse_pool import shutdown_parse_pool
+from crawler.browser_pool import shutdown_browser_pool
+from crawler.telemetry import metrics
 
 
 @asynccontextmanager
@@ -21,8 +26,13 @@ async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
     # 시작 시 데이터베이스 초기화
     await init_db()
+    # 이벤트 루프 지연 측정 시작 (크롤링 중 API 응답성 확인용)
+    loop_monitor.start()
     yield
     # 종료 시 정리 작업
+    await loop_monitor.stop()
+    shutdown_parse_pool()
+    await shutdown_browser_pool()
 
 
 settings = get_settings()
@@ -63,6 +73,18 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/loop-lag")
+async def loop_lag():
+    """이벤트 루프 지연 통계 (크롤링 중에도 낮게 유지되어야 함)"""
+    return loop_monitor.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def crawl_metrics():
+    """크롤링 지표 (Prometheus 텍스트 형식, 서버 시작 이후 누적)"""
+    return PlainTextResponse(metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -12,10 +12,19 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from models.database import get_db, Post, DailyReport, CharacterMention, ChatServiceCharacter
-from crawler.multi_crawler import crawl_all_targets
+from config import get_settings
+
+from models.database import (
+    get_db, get_high_water_marks, latest_characters_condition, Post, PostMetricSnapshot, DailyReport, CharacterMention, ChatServiceCharacter,
+)
+from models.ingestion import ingest_stream, ingest_missing_bodies, replace_service_characters
+from models.work_queue import crawl_task_specs, enqueue_tasks, queue_stats
+from models.breakers import list_breakers, reset_breaker, tracked_breakers
+from crawler.multi_crawler import stream_all_targets
 from crawler.character_service_crawler import crawl_all_character_services
-from analyzer.trend_analyzer import generate_daily_report
+from crawler.page_cache import confirm_pages
+from crawler.telemetry import crawl_run
+from analyzer.trend_analyzer import generate_daily_report, VIEW_WEIGHT, RECOMMEND_WEIGHT, COMMENT_WEIGHT
 
 router = APIRouter()
 
@@ -34,6 +43,20 @@ class PostResponse(BaseModel):
     recommend_count: int
     comment_count: int
     url: Optional[str]
+    views_per_hour: Optional[float] = None
+    recommends_per_hour: Optional[float] = None
+    comments_per_hour: Optional[float] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class PostMetricSnapshotResponse(BaseModel):
+    """게시글 카운터 스냅샷 응답 모델"""
+    captured_at: datetime
+    view_count: int
+    recommend_count: int
+    comment_count: int
     
     class Config:
         from_attributes = True
@@ -84,6 +107,8 @@ class CrawlRequest(BaseModel):
     """크롤링 요청 모델"""
     gallery_id: Optional[str] = None
     pages: Optional[int] = 5
+    incremental: bool = True  # 마지막으로 저장된 게시글까지만 크롤링
+    fetch_bodies: Optional[bool] = None  # 새 게시글 본문까지 수집 (None이면 설정값)
 
 
 class CrawlResponse(BaseModel):
@@ -124,13 +149,15 @@ async def get_popular_posts(
     limit: int = Query(15, ge=1, le=50),
     days: int = Query(7, ge=1, le=30),
     exclude_notices: bool = Query(True, description="공지사항 제외 여부"),
+    sort: str = Query("recommend", pattern="^(recommend|velocity)$",
+                      description="recommend: 추천수 순, velocity: 시간당 반응 증가 속도 순"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     인기 게시글 조회
     
     인기도 기준:
-    - 추천수(recommend_count) 우선
+    - 추천수(recommend_count) 우선 (sort=velocity: 참여도 갱신 크롤링으로 계산된 시간당 증가 속도 우선)
     - 최근 N일 이내 크롤링된 데이터
     - 공지사항/안내글 자동 제외 (exclude_notices=True)
     """
@@ -147,13 +174,20 @@ async def get_popular_posts(
         '디시콘', '공유전용'
     ]
     
+    if sort == "velocity":
+        # 인기도 점수(identify_hot_posts)와 같은 가중치
+        ordering = (desc(
+            func.coalesce(Post.views_per_hour, 0) * VIEW_WEIGHT +
+            func.coalesce(Post.recommends_per_hour, 0) * RECOMMEND_WEIGHT +
+            func.coalesce(Post.comments_per_hour, 0) * COMMENT_WEIGHT
+        ), desc(Post.recommend_count))
+    else:
+        ordering = (desc(Post.recommend_count), desc(Post.view_count))
+    
     # 더 많은 게시글을 가져와서 필터링 (limit * 5)
     query = select(Post).where(
         Post.crawled_at >= cutoff_date
-    ).order_by(
-        desc(Post.recommend_count),
-        desc(Post.view_count)
-    ).limit(limit * 5)
+    ).order_by(*ordering).limit(limit * 5)
     
     result = await db.execute(query)
     all_posts = result.scalars().all()
@@ -173,16 +207,36 @@ async def get_popular_posts(
         return all_posts[:limit]
 
 
-@router.get("/posts/{post_id}", response_model=PostResponse)
-async def get_post(post_id: str, db: AsyncSession = Depends(get_db)):
-    """특정 게시글 조회"""
-    result = await db.execute(select(Post).where(Post.post_id == post_id))
-    post = result.scalar_one_or_none()
+async def _find_post(db: AsyncSession, post_id: str, gallery_id: Optional[str]) -> Post:
+    """게시글 번호로 찾기 (번호는 갤러리 안에서만 고유 - 여러 갤러리에 있으면 gallery_id 필요)"""
+    query = select(Post).where(Post.post_id == post_id)
+    if gallery_id:
+        query = query.where(Post.gallery_id == gallery_id)
+    posts = (await db.execute(query.limit(2))).scalars().all()
     
-    if not post:
+    if not posts:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
-    
-    return post
+    if len(posts) > 1:
+        raise HTTPException(status_code=409, detail="여러 갤러리에 같은 번호의 게시글이 있습니다. gallery_id를 지정하세요")
+    return posts[0]
+
+
+@router.get("/posts/{post_id}", response_model=PostResponse)
+async def get_post(post_id: str, gallery_id: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    """특정 게시글 조회"""
+    return await _find_post(db, post_id, gallery_id)
+
+
+@router.get("/posts/{post_id}/metrics", response_model=List[PostMetricSnapshotResponse])
+async def get_post_metrics(post_id: str, gallery_id: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    """게시글 카운터 변화 (참여도 갱신 크롤링 스냅샷, 오래된 순)"""
+    post = await _find_post(db, post_id, gallery_id)
+    result = await db.execute(
+        select(PostMetricSnapshot)
+        .where(PostMetricSnapshot.post_id == post.id)
+        .order_by(PostMetricSnapshot.captured_at)
+    )
+    return result.scalars().all()
 
 
 @router.get("/posts/stats/daily", response_model=StatsResponse)
@@ -348,38 +402,27 @@ async def trigger_crawl(
 ):
     """수동 크롤링 트리거 - 모든 갤러리"""
     try:
-        posts = await crawl_all_targets(pages=request.pages)
+        high_water_marks = await get_high_water_marks(db) if request.incremental else None
         
-        # DB에 저장
-        saved_count = 0
-        for post_data in posts:
-            # 중복 체크
-            existing = await db.execute(
-                select(Post).where(Post.post_id == post_data.post_id)
-            )
-            if existing.scalar_one_or_none():
-                continue
+        # 요청/파싱 지표는 crawl_state_dir/runs 에 실행 요약으로 저장
+        with crawl_run("api_crawl"):
+            # 크롤링하면서 배치마다 저장 (신규는 추가, 기존 게시글은 카운터 갱신, breaker가 열린 갤러리는 건너뜀)
+            async with tracked_breakers() as breakers:
+                result = await ingest_stream(db, stream_all_targets(pages=request.pages, high_water_marks=high_water_marks,
+                                                                    breakers=breakers))
+            message = f"크롤링 완료: {result.total}개 수집, {result.inserted}개 저장, {result.updated}개 갱신"
             
-            post = Post(
-                post_id=post_data.post_id,
-                gallery_id=post_data.gallery_id,
-                title=post_data.title,
-                author=post_data.author,
-                created_at=post_data.created_at,
-                view_count=post_data.view_count,
-                recommend_count=post_data.recommend_count,
-                comment_count=post_data.comment_count,
-                url=post_data.url
-            )
-            db.add(post)
-            saved_count += 1
-        
-        await db.commit()
+            # 새 게시글 본문 수집 (선택)
+            fetch_bodies = request.fetch_bodies if request.fetch_bodies is not None else get_settings().fetch_post_bodies
+            if fetch_bodies:
+                body_count = await ingest_missing_bodies(db)
+                await db.commit()
+                message += f", 본문 {body_count}개 수집"
         
         return CrawlResponse(
             success=True,
-            message=f"크롤링 완료: {len(posts)}개 수집, {saved_count}개 저장",
-            posts_count=saved_count
+            message=message,
+            posts_count=result.inserted
         )
     except Exception as e:
         return CrawlResponse(
@@ -389,6 +432,106 @@ async def trigger_crawl(
         )
 
 
+@router.post("/crawl/engagement", response_model=CrawlResponse)
+async def refresh_engagement_crawl(
+    pages: Optional[int] = Query(None, ge=1, le=20, description="갤러리별로 다시 볼 최근 페이지 수 (기본: 설정값)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    참여도 갱신 크롤링
+    
+    최근 페이지를 다시 크롤링해 이미 저장된 게시글의 조회수/추천수/댓글수와 시간당 증가 속도를 갱신
+    """
+    settings = get_settings()
+    try:
+        with crawl_run("engagement_refresh"):
+            async with tracked_breakers() as breakers:
+                result = await ingest_stream(db, stream_all_targets(pages=pages or settings.engagement_refresh_pages,
+                                                                    breakers=breakers), refresh=True)
+        return CrawlResponse(
+            success=True,
+            message=f"참여도 갱신 완료: 갱신 {result.updated}개, 신규 {result.inserted}개",
+            posts_count=result.total
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"참여도 갱신 실패: {str(e)}")
+
+
+class EnqueueCrawlRequest(BaseModel):
+    """크롤링 작업 큐 추가 요청 모델"""
+    pages: int = 3
+    start_page: int = 1
+    targets: Optional[List[str]] = None
+    priority: int = 0
+    batch: Optional[str] = None  # 기본: 오늘 날짜 (같은 배치의 같은 구간은 한 번만 추가)
+
+
+@router.post("/crawl/tasks")
+async def enqueue_crawl_tasks(
+    request: EnqueueCrawlRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """크롤링 작업 큐에 갤러리별 페이지 구간 추가 (worker.py 프로세스가 처리)"""
+    batch = request.batch or datetime.utcnow().strftime("%Y-%m-%d")
+    specs = crawl_task_specs(request.pages, start_page=request.start_page, target_ids=request.targets,
+                             priority=request.priority, batch=batch)
+    added = await enqueue_tasks(db, specs)
+    await db.commit()
+    return {"requested": len(specs), "added": added, "batch": batch}
+
+
+@router.get("/crawl/tasks")
+async def get_crawl_task_stats(db: AsyncSession = Depends(get_db)):
+    """상태별 크롤링 작업 수"""
+    return await queue_stats(db)
+
+
+class CrawlBreakerResponse(BaseModel):
+    """대상별 circuit breaker / 파서 상태 응답 모델"""
+    target_id: str
+    state: str  # closed, open, half_open
+    consecutive_failures: int
+    consecutive_empty: int
+    trips: int
+    opened_at: Optional[datetime]
+    open_until: Optional[datetime]
+    last_reason: Optional[str]
+    last_error: Optional[str]
+    last_success_at: Optional[datetime]
+    pages_fetched: int
+    pages_failed: int
+    pages_empty: int
+    pages_unchanged: int
+    rows_parsed: int
+    runs_skipped: int
+    rows_per_page: float = 0.0  # 받은 페이지당 평균 파싱 행 수 (선택자가 맞지 않으면 0에 가까워짐)
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+@router.get("/crawl/breakers", response_model=List[CrawlBreakerResponse])
+async def get_crawl_breakers(db: AsyncSession = Depends(get_db)):
+    """대상별 circuit breaker 상태와 파서 상태 카운터"""
+    responses = []
+    for breaker in await list_breakers(db):
+        response = CrawlBreakerResponse.model_validate(breaker)
+        if breaker.pages_fetched:
+            response.rows_per_page = round(breaker.rows_parsed / breaker.pages_fetched, 2)
+        responses.append(response)
+    return responses
+
+
+@router.post("/crawl/breakers/{target_id}/reset")
+async def reset_crawl_breaker(target_id: str, db: AsyncSession = Depends(get_db)):
+    """circuit breaker를 닫힘으로 되돌림 (파서 수정 후 대기 시간 없이 다시 크롤링)"""
+    if not await reset_breaker(db, target_id):
+        raise HTTPException(status_code=404, detail=f"저장된 breaker가 없습니다: {target_id}")
+    await db.commit()
+    return {"target_id": target_id, "state": "closed"}
+
+
 @router.post("/reports/generate")
 async def generate_report(
     date: Optional[str] = None,
@@ -427,15 +570,20 @@ async def generate_report(
     posts_dict = [
         {
             "title": p.title,
+            "body": p.body_text,
             "view_count": p.view_count,
             "recommend_count": p.recommend_count,
-            "comment_count": p.comment_count
+            "comment_count": p.comment_count,
+            "views_per_hour": p.views_per_hour,
+            "recommends_per_hour": p.recommends_per_hour,
+            "comments_per_hour": p.comments_per_hour
         }
         for p in posts
     ]
     prev_posts_dict = [
         {
             "title": p.title,
+            "body": p.body_text,
             "view_count": p.view_count,
             "recommend_count": p.recommend_count,
             "comment_count": p.comment_count
@@ -491,6 +639,7 @@ class ChatServiceCharacterResponse(BaseModel):
     """캐릭터챗 서비스 캐릭터 응답 모델"""
     id: int
     service: str
+    period: str
     character_id: str
     rank: int
     name: str
@@ -510,31 +659,15 @@ class ChatServiceCharacterResponse(BaseModel):
 async def get_chat_service_characters(
     service: Optional[str] = Query(None, description="서비스 필터 (zeta, babechat)"),
     limit: int = Query(30, ge=1, le=100),
+    period: str = Query("daily", description="랭킹 기간 (daily, weekly, monthly, new, overall)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """캐릭터챗 서비스 순위 조회 (최신 크롤링 데이터)"""
-    # 가장 최근 크롤링 시간 조회
-    recent_crawl_query = select(func.max(ChatServiceCharacter.crawled_at))
-    if service:
-        recent_crawl_query = recent_crawl_query.where(ChatServiceCharacter.service == service)
-    
-    result = await db.execute(recent_crawl_query)
-    recent_crawl_time = result.scalar()
-    
-    if not recent_crawl_time:
+    """캐릭터챗 서비스 순위 조회 (서비스별 최신 크롤링 데이터)"""
+    latest = await latest_characters_condition(db, period, service)
+    if latest is None:
         return []
     
-    # 최근 크롤링 시간 기준 5분 이내의 데이터 조회
-    # (동일 크롤링 세션에서 생성된 데이터를 모두 포함)
-    time_threshold = recent_crawl_time - timedelta(minutes=5)
-    
-    query = select(ChatServiceCharacter).where(
-        ChatServiceCharacter.crawled_at >= time_threshold,
-        ChatServiceCharacter.crawled_at <= recent_crawl_time
-    )
-    
-    if service:
-        query = query.where(ChatServiceCharacter.service == service)
+    query = select(ChatServiceCharacter).where(ChatServiceCharacter.period == period, latest)
     
     query = query.order_by(
         ChatServiceCharacter.service,
@@ -561,47 +694,32 @@ async def crawl_chat_services(
     services = request.services
     try:
         # 크롤링 실행
-        results = await crawl_all_character_services(services)
+        with crawl_run("character_services"):
+            results = await crawl_all_character_services(services)
         
-        # 기존 데이터 삭제 (선택된 서비스만)
-        services_to_delete = services if services else ['zeta', 'babechat', 'lunatalk']
-        for service in services_to_delete:
-            await db.execute(
-                select(ChatServiceCharacter).where(ChatServiceCharacter.service == service)
-            )
-            delete_query = ChatServiceCharacter.__table__.delete().where(
-                ChatServiceCharacter.service == service
-            )
-            await db.execute(delete_query)
-        
-        # 새 데이터 저장
+        # 서비스/기간별로 기존 데이터를 새 결과로 교체 (실패했거나 바뀌지 않아 비어 있으면 이전 순위 유지)
         saved_count = 0
-        for service_name, characters in results.items():
-            for char_data in characters:
-                character = ChatServiceCharacter(
-                    service=service_name,
-                    character_id=char_data.character_id,
-                    rank=char_data.rank,
-                    name=char_data.name,
-                    author=char_data.author,
-                    views=char_data.views,
-                    tags=char_data.tags,
-                    description=char_data.description,
-                    thumbnail_url=char_data.thumbnail_url,
-                    character_url=char_data.character_url
-                )
-                db.add(character)
-                saved_count += 1
+        for service_name, by_period in results.items():
+            for period, characters in by_period.items():
+                if characters:
+                    saved_count += await replace_service_characters(db, service_name, characters, period=period)
         
         await db.commit()
+        # 저장을 마친 랭킹 페이지만 페이지 캐시에 확정 (다음 크롤링에서 바뀌지 않았으면 파싱 생략)
+        for cache in confirm_pages(chars for by_period in results.values() for chars in by_period.values()):
+            cache.save()
         
-        total_crawled = sum(len(chars) for chars in results.values())
+        total_crawled = sum(len(chars) for by_period in results.values() for chars in by_period.values())
         
         return {
             "success": True,
             "message": f"크롤링 완료: {total_crawled}개 수집, {saved_count}개 저장",
             "results": {
-                service: len(chars) for service, chars in results.items()
+                service: sum(len(chars) for chars in by_period.values()) for service, by_period in results.items()
+            },
+            "periods": {
+                service: {period: len(chars) for period, chars in by_period.items()}
+                for service, by_period in results.items()
             }
         }
     except Exception as e:
@@ -617,35 +735,24 @@ async def crawl_chat_services(
 async def get_popular_tags(
     limit: int = Query(20, ge=1, le=50),
     service: Optional[str] = Query(None, description="서비스 필터 (zeta, lunatalk)"),
+    period: str = Query("daily", description="랭킹 기간 (daily, weekly, monthly, new, overall)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     인기 해시태그 조회
     캐릭터들의 태그를 집계하여 가장 많이 사용된 태그 반환
     """
-    # 최근 크롤링 데이터 시간 확인
-    recent_crawl_query = select(func.max(ChatServiceCharacter.crawled_at))
-    if service:
-        recent_crawl_query = recent_crawl_query.where(ChatServiceCharacter.service == service)
-    
-    result = await db.execute(recent_crawl_query)
-    recent_crawl_time = result.scalar()
-    
-    if not recent_crawl_time:
+    # 서비스별 최근 크롤링 데이터
+    latest = await latest_characters_condition(db, period, service)
+    if latest is None:
         return []
     
-    # 최근 5분 이내의 데이터 조회
-    time_threshold = recent_crawl_time - timedelta(minutes=5)
-    
     query = select(ChatServiceCharacter.tags).where(
-        ChatServiceCharacter.crawled_at >= time_threshold,
-        ChatServiceCharacter.crawled_at <= recent_crawl_time,
+        ChatServiceCharacter.period == period,
+        latest,
         ChatServiceCharacter.tags.isnot(None)
     )
     
-    if service:
-        query = query.where(ChatServiceCharacter.service == service)
-    
     result = await db.execute(query)
     all_tags_lists = result.scalars().all()
     
@@ -0,0 +1,316 @@
+"""
+과거 게시글 백필 스크립트
+갤러리/게시판을 수천 페이지 또는 지정한 날짜까지 거슬러 올라가며 수집
+- 페이지마다 게시글 저장(upsert_posts)과 진행 위치(models/checkpoints.py)를 한 트랜잭션으로 커밋
+  -> 중단/재시작해도 마지막으로 저장한 페이지 다음부터 이어서 진행
+- 일반 크롤링보다 낮은 우선순위
+  - run: 호스트별 요청 간격을 backfill_delay_factor배로 늘려 일반 크롤링에 속도를 양보
+  - enqueue: 작업 큐(worker.py)에 일일 크롤링보다 낮은 우선순위로 추가 (날짜 기준 종료는 지원하지 않음)
+- 여러 갤러리는 동시에 진행 (같은 호스트의 요청 간격은 속도 제한기가 유지)
+- circuit breaker가 열린 갤러리는 건너뛰고, 백필 중 요청 실패/0행 페이지도 breaker에 기록
+- 페이지 위치 찾기(crawler/page_locator.py)로 필요한 페이지로 바로 이동
+  - 이어서 진행할 때: 그 사이 새 글로 밀린 만큼 체크포인트의 가장 오래된 게시글 위치를 다시 찾음
+  - --start-date: 처음부터 넘기지 않고 해당 날짜의 페이지부터 시작
+  - repair: 날짜/게시글 번호 구간만 다시 수집 (누락 구간 복구)
+
+실행 예:
+    python backfill.py run --until 2025-01-01
+    python backfill.py run --target wrtnai --pages 3000
+    python backfill.py run --target characterai --reset --start-date 2025-06-01
+    python backfill.py repair --target wrtnai --before 2025-03-01 --since 2025-02-01
+    python backfill.py repair --target wrtnai --max-id 1523000 --min-id 1520000
+    python backfill.py enqueue --pages 2000 --start-page 4
+    python backfill.py status
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from contextlib import aclosing
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import get_settings
+from crawler.archive import PageArchive
+from crawler.circuit_breaker import TargetBreaker
+from crawler.http_client import HttpClientRegistry
+from crawler.multi_crawler import iter_target_pages, locate_target_page
+from crawler.rate_limiter import HostRateLimiter
+from crawler.telemetry import crawl_run
+from crawler.records import CrawledPost
+from models.breakers import tracked_breakers
+from models.checkpoints import DONE, advance_checkpoint, list_checkpoints, reached_until, start_checkpoint
+from models.database import AsyncSessionLocal, CrawlCheckpoint, init_db
+from models.ingestion import IngestResult, upsert_posts
+from models.work_queue import crawl_task_specs, enqueue_tasks
+
+logger = logging.getLogger("backfill")
+
+CHECKPOINT_PREFIX = "backfill:"
+# 진행 상황을 로그로 남기는 페이지 간격
+PROGRESS_LOG_PAGES = 50
+
+
+async def _start_page(gallery_config: dict, http: HttpClientRegistry, checkpoint: CrawlCheckpoint,
+                      start_date: Optional[datetime]) -> int:
+    """백필을 시작할 페이지 (페이지 위치 찾기로 이동할 수 있으면 이동)"""
+    name = checkpoint.name
+    if checkpoint.pages_done and checkpoint.oldest_post_id and checkpoint.oldest_post_id.isdigit():
+        # 이어서 진행: 마지막으로 저장한 게시글이 지금 있는 페이지 (체크포인트 근처부터 탐색)
+        location = await locate_target_page(gallery_config, http, target_post_id=int(checkpoint.oldest_post_id),
+                                            hint=checkpoint.next_page)
+        if location is not None:
+            # 그 페이지의 남은 게시글을 빠뜨리지 않도록 찾은 페이지부터 (밀리지 않았으면 한 페이지 다시 봄)
+            logger.info(f"[{name}] 마지막으로 저장한 게시글 위치: {location.page}페이지 "
+                        f"(체크포인트 {checkpoint.next_page}페이지, 요청 {location.fetches}회)")
+            return location.page
+    elif not checkpoint.pages_done and start_date is not None:
+        location = await locate_target_page(gallery_config, http, target_date=start_date)
+        if location is not None:
+            logger.info(f"[{name}] {start_date:%Y-%m-%d} 위치: {location.page}페이지부터 시작 (요청 {location.fetches}회)")
+            return location.page
+    return checkpoint.next_page
+
+
+async def backfill_target(gallery_config: dict, http: HttpClientRegistry, last_page: int,
+                          until_date: Optional[datetime] = None, reset: bool = False,
+                          start_date: Optional[datetime] = None,
+                          breaker: Optional[TargetBreaker] = None) -> Optional[CrawlCheckpoint]:
+    """
+    갤러리 하나를 체크포인트부터 last_page 또는 until_date까지 백필
+    
+    게시글을 받지 못한 페이지(요청 실패, 차단, 게시판 끝)에서는 멈추고 다음 실행 때 그 페이지부터 다시 시도
+    
+    Args:
+        start_date: 새로 시작할 때 이 날짜의 페이지부터 시작 (이어서 진행할 때는 무시)
+        breaker: 갤러리의 circuit breaker (열려 있으면 요청하지 않고 체크포인트 그대로 반환)
+    
+    Returns:
+        갱신된 체크포인트 (지원하지 않는 타입/목록 소스면 None)
+    """
+    name = f"{CHECKPOINT_PREFIX}{gallery_config['id']}"
+    async with AsyncSessionLocal() as session:
+        checkpoint = await start_checkpoint(session, name, gallery_config['id'], last_page, until_date, reset)
+        await session.commit()
+        if checkpoint.status == DONE:
+            logger.info(f"[{name}] 이미 완료됨 ({checkpoint.next_page - 1}페이지까지, 범위를 늘리거나 --reset으로 다시 실행)")
+            return checkpoint
+        if breaker is not None and not breaker.allow():
+            breaker.skip()
+            return checkpoint
+        
+        checkpoint.next_page = min(await _start_page(gallery_config, http, checkpoint, start_date), checkpoint.last_page)
+        await session.commit()
+        
+        pages = iter_target_pages(gallery_config, checkpoint.last_page, http, start_page=checkpoint.next_page,
+                                  breaker=breaker)
+        if pages is None:
+            logger.warning(f"[{name}] 지원하지 않는 타입/목록 소스: {gallery_config['type']}")
+            return None
+        
+        page = checkpoint.next_page
+        logger.info(f"[{name}] {page}페이지부터 시작 (최대 {checkpoint.last_page}페이지, 종료 날짜 {until_date or '없음'})")
+        async with aclosing(pages):
+            async for posts in pages:
+                if not posts:
+                    checkpoint.last_error = f"{page}페이지에서 게시글을 받지 못함 (요청 실패, 차단 또는 게시판 끝)"
+                    checkpoint.updated_at = datetime.utcnow()
+                    await session.commit()
+                    logger.warning(f"[{name}] {checkpoint.last_error} - 다음 실행 때 이 페이지부터 다시 시도")
+                    break
+                
+                result = await upsert_posts(session, posts)
+                finished = advance_checkpoint(checkpoint, page, posts, result.inserted)
+                await session.commit()
+                
+                if finished or checkpoint.pages_done % PROGRESS_LOG_PAGES == 0:
+                    logger.info(f"[{name}] {page}페이지까지 저장: 신규 {checkpoint.posts_saved}개, "
+                                f"가장 오래된 게시글 {checkpoint.oldest_created_at}")
+                if finished:
+                    logger.info(f"[{name}] 완료")
+                    break
+                page += 1
+    return checkpoint
+
+
+def _older_than(posts: List[CrawledPost], since_date: Optional[datetime], min_post_id: Optional[int]) -> bool:
+    """페이지 게시글이 모두 수집 구간보다 오래됐는지"""
+    if min_post_id is not None:
+        ids = [int(post.post_id) for post in posts if post.post_id.isdigit()]
+        return bool(ids) and max(ids) < min_post_id
+    return reached_until(posts, since_date)
+
+
+async def repair_range(gallery_config: dict, http: HttpClientRegistry,
+                       before: Optional[datetime] = None, since: Optional[datetime] = None,
+                       max_post_id: Optional[int] = None, min_post_id: Optional[int] = None,
+                       max_pages: Optional[int] = None) -> IngestResult:
+    """
+    날짜/게시글 번호 구간만 다시 수집 (체크포인트 없음)
+    
+    구간의 최신 쪽 끝(before 또는 max_post_id)이 있는 페이지를 찾아 거기서부터
+    구간보다 오래된 게시글만 나오는 페이지까지 크롤링 (둘 다 없으면 1페이지부터)
+    """
+    name = f"repair:{gallery_config['id']}"
+    max_pages = max_pages or get_settings().backfill_max_pages
+    start_page = 1
+    if before is not None or max_post_id is not None:
+        location = await locate_target_page(gallery_config, http, target_date=None if max_post_id is not None else before,
+                                            target_post_id=max_post_id)
+        if location is None:
+            logger.warning(f"[{name}] 지원하지 않는 타입/목록 소스: {gallery_config['type']}")
+            return IngestResult()
+        start_page = location.page
+    
+    pages = iter_target_pages(gallery_config, start_page + max_pages - 1, http, start_page=start_page)
+    if pages is None:
+        logger.warning(f"[{name}] 지원하지 않는 타입/목록 소스: {gallery_config['type']}")
+        return IngestResult()
+    
+    result = IngestResult()
+    page = start_page
+    async with AsyncSessionLocal() as session:
+        async with aclosing(pages):
+            async for posts in pages:
+                if not posts:
+                    logger.warning(f"[{name}] {page}페이지에서 게시글을 받지 못해 중단")
+                    break
+                result += await upsert_posts(session, posts)
+                await session.commit()
+                if _older_than(posts, since, min_post_id):
+                    break
+                page += 1
+    logger.info(f"[{name}] {start_page}~{page}페이지 복구: 신규 {result.inserted}개, 갱신 {result.updated}개")
+    return result
+
+
+def _galleries(targets: Optional[List[str]]) -> List[dict]:
+    return [gallery_config for gallery_config in get_settings().target_galleries
+            if not targets or gallery_config["id"] in targets]
+
+
+def _log_failures(galleries: List[dict], results: List, prefix: str) -> None:
+    for gallery_config, result in zip(galleries, results):
+        if isinstance(result, Exception):
+            logger.error(f"[{prefix}{gallery_config['id']}] 실패: {result}")
+
+
+async def run(targets: Optional[List[str]], last_page: int, until_date: Optional[datetime], reset: bool,
+              start_date: Optional[datetime] = None) -> None:
+    settings = get_settings()
+    galleries = _galleries(targets)
+    await init_db()
+    
+    with crawl_run("backfill"):
+        async with tracked_breakers([gallery_config["id"] for gallery_config in galleries]) as breakers:
+            async with HttpClientRegistry(rate_limiter=HostRateLimiter.scaled(settings.backfill_delay_factor),
+                                          archive=PageArchive.from_settings()) as http:
+                results = await asyncio.gather(
+                    *[backfill_target(gallery_config, http, last_page, until_date, reset, start_date,
+                                      breakers[gallery_config["id"]])
+                      for gallery_config in galleries],
+                    return_exceptions=True
+                )
+                http.log_stats()
+    
+    # 실패한 페이지 전까지는 체크포인트가 저장되어 있음
+    _log_failures(galleries, results, CHECKPOINT_PREFIX)
+
+
+async def repair(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    galleries = _galleries(args.target)
+    await init_db()
+    
+    with crawl_run("repair"):
+        async with HttpClientRegistry(rate_limiter=HostRateLimiter.scaled(settings.backfill_delay_factor),
+                                      archive=PageArchive.from_settings()) as http:
+            results = await asyncio.gather(
+                *[repair_range(gallery_config, http, args.before, args.since, args.max_id, args.min_id, args.pages)
+                  for gallery_config in galleries],
+                return_exceptions=True
+            )
+    _log_failures(galleries, results, "repair:")
+
+
+async def enqueue(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    specs = crawl_task_specs(args.pages, start_page=args.start_page, target_ids=args.target,
+                             priority=settings.backfill_task_priority, batch=args.batch,
+                             pages_per_task=args.pages_per_task)
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        added = await enqueue_tasks(session, specs)
+        await session.commit()
+    print(f"📥 백필 작업 {added}개 추가 (요청 {len(specs)}개, 우선순위 {settings.backfill_task_priority}, "
+          f"배치 '{args.batch}')")
+
+
+async def status() -> None:
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        checkpoints = await list_checkpoints(session, CHECKPOINT_PREFIX)
+    if not checkpoints:
+        print("진행 중인 백필이 없습니다")
+        return
+    for checkpoint in checkpoints:
+        print(f"📌 {checkpoint.target_id}: {checkpoint.status}, 다음 {checkpoint.next_page}/{checkpoint.last_page}페이지, "
+              f"신규 {checkpoint.posts_saved}개, 가장 오래된 게시글 {checkpoint.oldest_created_at}"
+              + (f" ({checkpoint.last_error})" if checkpoint.last_error else ""))
+
+
+def _date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="과거 게시글 백필")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="체크포인트부터 이어서 백필")
+    run_parser.add_argument("--target", action="append", help="대상 갤러리 ID (여러 번 지정 가능, 기본: 전부)")
+    run_parser.add_argument("--pages", type=int, default=settings.backfill_max_pages, help="마지막 페이지")
+    run_parser.add_argument("--until", type=_date, default=None,
+                            help="이 날짜(YYYY-MM-DD)보다 오래된 게시글만 나오면 종료")
+    run_parser.add_argument("--reset", action="store_true", help="체크포인트를 버리고 1페이지부터 다시")
+    run_parser.add_argument("--start-date", type=_date, default=None,
+                            help="새로 시작할 때 이 날짜(YYYY-MM-DD)의 페이지부터 시작")
+    
+    repair_parser = commands.add_parser("repair", help="날짜/게시글 번호 구간만 다시 수집")
+    repair_parser.add_argument("--target", action="append", help="대상 갤러리 ID (여러 번 지정 가능, 기본: 전부)")
+    repair_parser.add_argument("--before", type=_date, default=None, help="구간의 최신 쪽 끝 날짜 (YYYY-MM-DD)")
+    repair_parser.add_argument("--since", type=_date, default=None, help="구간의 오래된 쪽 끝 날짜 (YYYY-MM-DD)")
+    repair_parser.add_argument("--max-id", type=int, default=None, help="구간의 최신 쪽 끝 게시글 번호")
+    repair_parser.add_argument("--min-id", type=int, default=None, help="구간의 오래된 쪽 끝 게시글 번호")
+    repair_parser.add_argument("--pages", type=int, default=None, help="최대 페이지 수 (기본: backfill_max_pages)")
+    
+    enqueue_parser = commands.add_parser("enqueue", help="작업 큐에 낮은 우선순위로 추가 (worker.py가 처리)")
+    enqueue_parser.add_argument("--target", action="append", help="대상 갤러리 ID (여러 번 지정 가능, 기본: 전부)")
+    enqueue_parser.add_argument("--pages", type=int, default=settings.backfill_max_pages, help="마지막 페이지")
+    enqueue_parser.add_argument("--start-page", type=int, default=settings.max_pages_per_crawl + 1,
+                                help="첫 페이지 (기본: 일일 크롤링 범위 다음)")
+    enqueue_parser.add_argument("--pages-per-task", type=int, default=settings.crawl_task_pages)
+    enqueue_parser.add_argument("--batch", default="backfill", help="배치 이름 (같은 배치 안의 같은 구간은 한 번만 추가)")
+    
+    commands.add_parser("status", help="백필 진행 상황")
+    args = parser.parse_args()
+    
+    if args.command == "run":
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(run(args.target, args.pages, args.until, args.reset, args.start_date))
+    elif args.command == "repair":
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(repair(args))
+    elif args.command == "enqueue":
+        asyncio.run(enqueue(args))
+    else:
+        asyncio.run(status())
+
+
+if __name__ == "__main__":
+    main()
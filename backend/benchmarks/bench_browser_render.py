@@ -0,0 +1,88 @@
+"""
+헤드리스 브라우저 렌더링 벤치마크 (로컬 모의 사이트)
+- 베이비챗 랭킹을 스크립트로만 그려지는 SPA fixture(babechat_spa)로 응답하는 모의 서버를 띄우고
+  BrowserPool로 여러 번 렌더링 (브라우저 하나 + 컨텍스트 풀 재사용)
+- 렌더링 결과가 하이드레이션 JSON fixture의 결과와 같은지 확인 (parity)
+- 페이지별 렌더링 시간 p50/p99, 차단한 요청 수를 같은 페이지의 HTTP fetch 지연과 나란히 출력
+- playwright 패키지 + 브라우저 설치 필요 (pip install playwright && playwright install chromium)
+
+실행: python benchmarks/bench_browser_render.py [렌더링 횟수] [풀 크기]
+"""
+import asyncio
+import sys
+import time
+import logging
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.mock_sites import MockSiteConfig, MockSites, serve_in_thread
+from crawler import babechat_crawler
+from crawler.babechat_crawler import BabeChatCrawler, RANKING_SELECTOR
+from crawler.browser_pool import BrowserPool, _percentile
+from crawler.http_client import HttpClientRegistry
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+async def run(renders: int, size: int, overrides: dict):
+    expected = babechat_crawler.parse_rankings(
+        (FIXTURES_DIR / "babechat_ranking.html").read_text(encoding="utf-8"), 30
+    )
+    
+    # 같은 페이지를 HTTP로만 받았을 때의 지연 (비교용)
+    fetch_times = []
+    async with HttpClientRegistry(host_overrides=overrides) as http:
+        for _ in range(renders):
+            start = time.perf_counter()
+            await http.get(BabeChatCrawler.RANKING_URL)
+            fetch_times.append((time.perf_counter() - start) * 1000)
+    
+    async with BrowserPool(size=size, host_overrides=overrides) as browser:
+        start = time.perf_counter()
+        await browser.start()
+        startup_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            browser.render(BabeChatCrawler.RANKING_URL, RANKING_SELECTOR) for _ in range(renders)
+        ])
+        elapsed = time.perf_counter() - start
+        stats = browser.stats()
+    
+    parity = all(babechat_crawler.parse_rankings(result.html, 30) == expected for result in results)
+    return startup_ms, elapsed, stats, fetch_times, parity
+
+
+def main():
+    logging.disable(logging.WARNING)
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    
+    sites = MockSites(MockSiteConfig(latency_ms=30, jitter_ms=10, babechat_spa=True, seed=42))
+    server, thread, origin = serve_in_thread(sites)
+    
+    print("=" * 60)
+    print(f"브라우저 렌더링 벤치마크 ({renders}회, 컨텍스트 {size}개, 모의 사이트 {origin})")
+    print("=" * 60)
+    
+    try:
+        startup_ms, elapsed, stats, fetch_times, parity = asyncio.run(run(renders, size, sites.overrides(origin)))
+    except Exception as e:
+        print(f"  브라우저를 실행하지 못했습니다: {e}")
+        sys.exit(1)
+    finally:
+        server.should_exit = True
+        thread.join()
+    
+    print(f"  브라우저 시작: {startup_ms:.0f}ms (한 번만)")
+    print(f"  렌더링: {stats['renders']}회, {elapsed:.2f}s ({stats['renders'] / elapsed:.1f} pages/sec), "
+          f"p50 {stats['p50_ms']}ms / p99 {stats['p99_ms']}ms, 실패 {stats['failures']}회")
+    print(f"  차단한 요청 (이미지/폰트/미디어): {stats['blocked_requests']}개")
+    print(f"  HTTP fetch (같은 페이지): p50 {_percentile(fetch_times, 50):.1f}ms / p99 {_percentile(fetch_times, 99):.1f}ms")
+    print(f"  결과 일치 (하이드레이션 JSON fixture와 비교): {'OK' if parity else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+디시인사이드 목록 소스 벤치마크 (데스크톱 vs 모바일)
+- 같은 게시글의 데스크톱/모바일 목록 fixture로 두 파서의 CrawledPost가 같은지 확인 (parity)
+  - 모바일 목록은 오늘 이전 게시글의 작성 시각을 날짜까지만 보여주므로 created_at은 날짜 단위로 비교
+- 페이지당 전송 크기(원본/gzip)와 백엔드별 파싱 시간 비교
+
+실행: python benchmarks/bench_dcinside_mobile.py [반복 횟수]
+"""
+import gzip
+import sys
+import time
+import logging
+from dataclasses import replace
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawler import list_parser
+from crawler.dcinside_crawler import parse_mobile_post_list, parse_post_list
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+SOURCES = [
+    ("desktop", FIXTURES_DIR / "dcinside_list.html", lambda html, backend: parse_post_list(html, "wrtnai", backend)),
+    ("mobile", FIXTURES_DIR / "dcinside_mobile_list.html",
+     lambda html, backend: parse_mobile_post_list(html, "wrtnai", backend, is_minor=True)),
+]
+
+
+def available_backends():
+    """설치된 패키지 기준으로 실행 가능한 백엔드"""
+    return [b for b in list_parser.BACKENDS if list_parser.resolve_backend(b) == b]
+
+
+def _day_precision(posts):
+    return [replace(post, created_at=post.created_at.date() if post.created_at else None) for post in posts]
+
+
+def _ms_per_page(parse, html: str, backend: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(html, backend)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def _saving(desktop: float, mobile: float) -> str:
+    return f"{(1 - mobile / desktop) * 100:5.1f}%"
+
+
+def main():
+    logging.disable(logging.INFO)
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    backends = available_backends()
+    failed = False
+    
+    print("=" * 60)
+    print(f"디시인사이드 목록 소스 벤치마크 (백엔드: {', '.join(backends)}, 반복 {iterations}회)")
+    print("=" * 60)
+    
+    pages = {name: (path.read_text(encoding="utf-8"), parse) for name, path, parse in SOURCES}
+    
+    # parity 확인 (소스 x 백엔드 전부 데스크톱/soup 결과와 비교)
+    baseline = _day_precision(pages["desktop"][1](pages["desktop"][0], backends[-1]))
+    for name, (html, parse) in pages.items():
+        for backend in backends:
+            if _day_precision(parse(html, backend)) != baseline:
+                failed = True
+                print(f"❌ {name}/{backend} 결과가 desktop/{backends[-1]}와 다릅니다")
+    print(f"\n게시글 {len(baseline)}개/페이지")
+    
+    # 페이지당 전송 크기
+    sizes = {}
+    print("\n[페이지 크기]")
+    for name, (html, _) in pages.items():
+        raw = html.encode("utf-8")
+        sizes[name] = (len(raw), len(gzip.compress(raw)))
+        print(f"  {name:>7}: {sizes[name][0]:8,} bytes (gzip {sizes[name][1]:7,} bytes)")
+    print(f"  {'절감':>6}: {_saving(sizes['desktop'][0], sizes['mobile'][0])} (gzip "
+          f"{_saving(sizes['desktop'][1], sizes['mobile'][1])})")
+    
+    # 파싱 시간
+    print("\n[파싱 시간]")
+    for backend in backends:
+        timings = {name: _ms_per_page(parse, html, backend, iterations) for name, (html, parse) in pages.items()}
+        print(f"  {backend:>5}: desktop {timings['desktop']:6.2f} ms/page, mobile {timings['mobile']:6.2f} ms/page "
+              f"(절감 {_saving(timings['desktop'], timings['mobile'])})")
+    
+    print()
+    if failed:
+        print("❌ 데스크톱/모바일 결과 불일치")
+        sys.exit(1)
+    print("✅ 데스크톱/모바일 결과 동일 (작성 시각은 날짜 단위)")
+
+
+if __name__ == "__main__":
+    main()
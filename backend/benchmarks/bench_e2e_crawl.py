@@ -0,0 +1,187 @@
+"""
+전체 크롤링 벤치마크 (로컬 모의 사이트)
+- benchmarks/mock_sites.py 서버를 별도 스레드에서 띄우고 crawl_host_overrides로 모든 요청을 그쪽으로 보냄
+- crawl_all_targets(게시판 목록) + crawl_all_character_services(캐릭터 순위)를 실제 코드 그대로 실행
+- pages/sec, fetch 지연 p50/p99, 파싱 시간, posts/sec, 응답 코드별 횟수 출력
+- --browser: 베이비챗을 SPA 페이지로 응답하고 브라우저 풀로 렌더링 (렌더링 시간을 fetch 지연과 나란히 출력)
+- 계측 모듈(crawler/telemetry.py)의 실행 요약으로 호스트별/파서별 지표 출력
+- 실제 사이트에 요청하지 않으므로 크롤러 처리량 회귀를 오프라인에서 확인할 수 있음
+
+실행: python benchmarks/bench_e2e_crawl.py --pages 10 --latency-ms 50 --rate-limit-rate 0.02
+"""
+import argparse
+import asyncio
+import functools
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import get_settings
+from benchmarks.mock_sites import MockSiteConfig, MockSites, serve_in_thread
+from crawler import arcalive_crawler, dcinside_crawler, lunatalk_crawler, zeta_crawler
+from crawler.browser_pool import get_browser_pool, shutdown_browser_pool
+from crawler.character_service_crawler import crawl_all_character_services
+from crawler.http_client import HttpClientRegistry
+from crawler.multi_crawler import crawl_all_targets
+from crawler.parse_pool import shutdown_parse_pool
+from crawler.telemetry import crawl_run
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+class Recorder:
+    """fetch 지연/파싱 시간 기록 (레지스트리 get과 파서 함수를 감싸서 측정)"""
+    
+    def __init__(self):
+        self.fetch_latencies: List[float] = []
+        self.parse_times: List[float] = []
+        self._lock = threading.Lock()
+    
+    def install(self) -> None:
+        recorder = self
+        original_get = HttpClientRegistry.get
+        
+        async def timed_get(self, url: str, **kwargs):
+            response = await original_get(self, url, **kwargs)
+            # 속도 제한 대기는 빼고 요청 전송~본문 수신 시간만
+            recorder.fetch_latencies.append(response.elapsed.total_seconds())
+            return response
+        
+        HttpClientRegistry.get = timed_get
+        # 파서는 parse_pool 스레드에서도 실행되므로 모듈 전역 함수를 교체
+        for module, name in ((dcinside_crawler, "parse_post_list"), (arcalive_crawler, "parse_post_list"),
+                             (zeta_crawler, "parse_rankings"), (lunatalk_crawler, "parse_rankings")):
+            setattr(module, name, self._timed(getattr(module, name)))
+    
+    def _timed(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.parse_times.append(time.perf_counter() - start)
+        return wrapper
+
+
+async def run(pages: int) -> Dict[str, float]:
+    with crawl_run("bench_e2e") as telemetry:
+        start = time.perf_counter()
+        posts = await crawl_all_targets(pages=pages)
+        posts_elapsed = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        characters = await crawl_all_character_services(["zeta", "lunatalk", "babechat"])
+        character_requests = sum(len(by_period) for by_period in characters.values())
+        characters_elapsed = time.perf_counter() - start
+    
+    browser_stats = get_browser_pool().stats() if get_settings().babechat_use_browser else None
+    await shutdown_browser_pool()
+    shutdown_parse_pool()
+    return {
+        "browser": browser_stats,
+        "posts": len(posts),
+        "posts_elapsed": posts_elapsed,
+        "characters": sum(len(chars) for by_period in characters.values() for chars in by_period.values()),
+        "characters_elapsed": characters_elapsed,
+        "character_requests": character_requests,
+        "telemetry": telemetry.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 사이트 대상 전체 크롤링 벤치마크")
+    parser.add_argument("--pages", type=int, default=10, help="갤러리별 페이지 수")
+    parser.add_argument("--delay", type=float, default=0.01, help="호스트별 요청 간격 (초, 속도 제한기 시작값/최소값)")
+    parser.add_argument("--executor", default=None, help="파싱 실행 위치 (thread/process/inline, 기본: 설정값)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 확률")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="403 응답 확률")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument("--browser", action="store_true", help="베이비챗을 헤드리스 브라우저로 렌더링 (playwright 필요)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    sites = MockSites(MockSiteConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        forbidden_rate=args.forbidden_rate, rate_limit_rate=args.rate_limit_rate,
+        babechat_spa=args.browser, seed=args.seed,
+    ))
+    server, thread, origin = serve_in_thread(sites)
+    
+    settings = get_settings()
+    state_dir = tempfile.TemporaryDirectory()
+    settings.crawl_host_overrides = sites.overrides(origin)
+    settings.crawl_state_dir = state_dir.name  # 학습한 속도를 실제 상태 파일에 섞지 않음
+    settings.archive_enabled = False
+    settings.crawl_delay_seconds = args.delay
+    settings.rate_limit_min_delay_seconds = args.delay
+    settings.babechat_use_browser = args.browser
+    if args.executor:
+        settings.parse_executor = args.executor
+    
+    recorder = Recorder()
+    recorder.install()
+    
+    print("=" * 60)
+    print(f"전체 크롤링 벤치마크 (모의 사이트 {origin})")
+    print(f"  갤러리 {len(settings.target_galleries)}개 x {args.pages}페이지, 요청 간격 {args.delay}s, "
+          f"파싱 {settings.parse_executor}")
+    print(f"  응답 지연 {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, 주입: 500 {args.error_rate:.0%} / "
+          f"403 {args.forbidden_rate:.0%} / 429 {args.rate_limit_rate:.0%}")
+    print("=" * 60)
+    
+    try:
+        result = asyncio.run(run(args.pages))
+    finally:
+        server.should_exit = True
+        thread.join()
+        state_dir.cleanup()
+    
+    elapsed = result["posts_elapsed"] + result["characters_elapsed"]
+    fetches = recorder.fetch_latencies
+    parse_total = sum(recorder.parse_times)
+    
+    print(f"  요청: {len(fetches)}회, {elapsed:.2f}s ({len(fetches) / elapsed:.1f} pages/sec)")
+    print(f"  fetch 지연: p50 {percentile(fetches, 50) * 1000:.1f}ms / p99 {percentile(fetches, 99) * 1000:.1f}ms")
+    print(f"  파싱: {len(recorder.parse_times)}회, 합계 {parse_total:.2f}s "
+          f"(페이지당 {parse_total / max(len(recorder.parse_times), 1) * 1000:.1f}ms)")
+    print(f"  게시글: {result['posts']}개, {result['posts_elapsed']:.2f}s "
+          f"({result['posts'] / result['posts_elapsed']:.1f} posts/sec)")
+    print(f"  캐릭터: {result['characters']}개 (서비스/기간 {result['character_requests']}개 동시), "
+          f"{result['characters_elapsed']:.2f}s")
+    if result["browser"]:
+        browser = result["browser"]
+        print(f"  브라우저 렌더링: {browser['renders']}회 (실패 {browser['failures']}회), "
+              f"p50 {browser['p50_ms']}ms / p99 {browser['p99_ms']}ms, 차단한 요청 {browser['blocked_requests']}개")
+    for host, statuses in sorted(sites.statuses.items()):
+        counts = ", ".join(f"{status} x{count}" for status, count in sorted(statuses.items()))
+        print(f"  [{host}] {counts}")
+    
+    telemetry = result["telemetry"]
+    for host, data in sorted(telemetry["hosts"].items()):
+        if "requests" in data:
+            print(f"  [계측 {host}] 요청 {data['requests']}회, p50 {data['latency_ms']['p50']}ms / "
+                  f"p99 {data['latency_ms']['p99']}ms, {data['bytes']:,}바이트, 재시도 {data['retries']}회")
+    for parser, data in sorted(telemetry["parsers"].items()):
+        print(f"  [계측 {parser}] {data['pages']}페이지, 페이지당 {data['rows_per_page']}행, "
+              f"p50 {data['parse_ms']['p50']}ms / p99 {data['parse_ms']['p99']}ms")
+
+
+if __name__ == "__main__":
+    main()
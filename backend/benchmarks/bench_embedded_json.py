@@ -0,0 +1,100 @@
+"""
+하이드레이션 JSON 파서 벤치마크
+- 제타 fixture로 JSON 경로(parse_rankings_json)와 DOM 경로(parse_rankings_dom)의 결과가 같은지 확인 (parity)
+  - 화면의 조회수는 "8.2만"처럼 반올림된 값이라 조회수는 표시 단위 안의 오차만 허용
+  - JSON 경로에만 있는 필드(작성자/썸네일) 채워진 수 출력
+- 두 경로의 초당 처리 페이지 수 비교
+- 베이비챗 fixture(화면은 비어 있고 JSON만 있는 SPA)에서 JSON 경로로 캐릭터를 읽는지 확인
+
+실행: python benchmarks/bench_embedded_json.py [반복 횟수]
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawler import babechat_crawler
+from crawler.zeta_crawler import parse_rankings_dom, parse_rankings_json
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+COMPARED_FIELDS = ("character_id", "rank", "name", "description", "tags", "character_url")
+
+
+def views_match(exact: int, displayed: int) -> bool:
+    """화면 표시값(반올림, 예: "8.2만")이 정확한 조회수의 표시 단위 안에 있는지"""
+    if displayed >= 1_000_000:
+        unit = 10_000
+    elif displayed >= 10_000:
+        unit = 1_000
+    elif displayed >= 1_000:
+        unit = 100
+    else:
+        unit = 1
+    return abs(exact - displayed) <= unit
+
+
+def compare(json_chars, dom_chars) -> list:
+    """필드가 다른 캐릭터 목록 [(순위, 필드, JSON 값, DOM 값), ...]"""
+    diffs = []
+    if len(json_chars) != len(dom_chars):
+        diffs.append((None, "count", len(json_chars), len(dom_chars)))
+    for json_char, dom_char in zip(json_chars, dom_chars):
+        for field in COMPARED_FIELDS:
+            if getattr(json_char, field) != getattr(dom_char, field):
+                diffs.append((dom_char.rank, field, getattr(json_char, field), getattr(dom_char, field)))
+        if not views_match(json_char.views, dom_char.views):
+            diffs.append((dom_char.rank, "views", json_char.views, dom_char.views))
+    return diffs
+
+
+def pages_per_sec(func, html: str, limit: int, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(html, limit)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    print("=" * 60)
+    print(f"하이드레이션 JSON 파서 벤치마크 ({iterations}회 반복)")
+    print("=" * 60)
+    
+    zeta = (FIXTURES_DIR / "zeta_ranking.html").read_text(encoding="utf-8")
+    ok = True
+    for limit in (30, 10_000):
+        json_chars = parse_rankings_json(zeta, limit)
+        dom_chars = parse_rankings_dom(zeta, limit)
+        diffs = compare(json_chars or [], dom_chars)
+        ok = ok and not diffs
+        print(f"\n[zeta] limit={limit}: JSON {len(json_chars or [])}개 / DOM {len(dom_chars)}개 "
+              f"[{'OK' if not diffs else 'MISMATCH'}]")
+        for rank, field, json_value, dom_value in diffs[:10]:
+            print(f"  #{rank} {field}: JSON={json_value!r} DOM={dom_value!r}")
+    
+    json_chars = parse_rankings_json(zeta, 10_000) or []
+    authors = sum(1 for c in json_chars if c.author)
+    thumbnails = sum(1 for c in json_chars if c.thumbnail_url)
+    print(f"  JSON 전용 필드: 작성자 {authors}/{len(json_chars)}, 썸네일 {thumbnails}/{len(json_chars)}")
+    
+    json_speed = pages_per_sec(parse_rankings_json, zeta, 30, iterations)
+    dom_speed = pages_per_sec(parse_rankings_dom, zeta, 30, iterations)
+    print(f"  속도: JSON {json_speed:8.1f} pages/sec, DOM {dom_speed:6.1f} pages/sec ({json_speed / dom_speed:.1f}배)")
+    
+    babechat = (FIXTURES_DIR / "babechat_ranking.html").read_text(encoding="utf-8")
+    characters = babechat_crawler.parse_rankings(babechat, 30)
+    print(f"\n[babechat] JSON {len(characters)}개 "
+          f"(1위: {characters[0].name}, 작성자 {characters[0].author}, {characters[0].views:,}회)" if characters
+          else "\n[babechat] JSON에서 캐릭터를 찾지 못했습니다")
+    
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
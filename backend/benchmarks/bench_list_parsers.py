@@ -0,0 +1,72 @@
+"""
+목록 페이지 파서 백엔드 벤치마크
+- 저장된 HTML fixture로 백엔드별 CrawledPost 결과가 동일한지 확인 (parity)
+- 백엔드별 초당 처리 페이지 수(pages/sec) 출력
+
+실행: python benchmarks/bench_list_parsers.py [반복 횟수]
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawler import list_parser
+from crawler.dcinside_crawler import parse_post_list as parse_dcinside
+from crawler.arcalive_crawler import parse_post_list as parse_arcalive
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+CASES = [
+    ("dcinside", FIXTURES_DIR / "dcinside_list.html", lambda html, backend: parse_dcinside(html, "wrtnai", backend)),
+    ("arcalive", FIXTURES_DIR / "arcalive_list.html", lambda html, backend: parse_arcalive(html, "characterai", backend)),
+]
+
+
+def available_backends():
+    """설치된 패키지 기준으로 실행 가능한 백엔드"""
+    return [b for b in list_parser.BACKENDS if list_parser.resolve_backend(b) == b]
+
+
+def main():
+    logging.disable(logging.INFO)
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    backends = available_backends()
+    failed = False
+    
+    print("=" * 60)
+    print(f"목록 파서 벤치마크 (백엔드: {', '.join(backends)}, 반복 {iterations}회)")
+    print("=" * 60)
+    
+    for site, path, parse in CASES:
+        html = path.read_text(encoding="utf-8")
+        
+        # parity 확인
+        results = {backend: parse(html, backend) for backend in backends}
+        baseline_backend = backends[-1]
+        baseline = results[baseline_backend]
+        for backend, posts in results.items():
+            if posts != baseline:
+                failed = True
+                print(f"❌ [{site}] {backend} 결과가 {baseline_backend}와 다릅니다")
+        print(f"\n[{site}] {path.name} ({len(html):,} bytes, 게시글 {len(baseline)}개)")
+        
+        # 처리 속도
+        for backend in backends:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                parse(html, backend)
+            elapsed = time.perf_counter() - start
+            print(f"  {backend:>5}: {iterations / elapsed:8.1f} pages/sec ({elapsed / iterations * 1000:.2f} ms/page)")
+    
+    print()
+    if failed:
+        print("❌ 백엔드 간 결과 불일치")
+        sys.exit(1)
+    print("✅ 모든 백엔드 결과 동일")
+
+
+if __name__ == "__main__":
+    main()
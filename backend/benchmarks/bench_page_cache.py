@@ -0,0 +1,123 @@
+"""
+페이지 캐시 벤치마크 (조건부 요청 + 본문 해시)
+- 로컬 모의 사이트를 대상으로 같은 크롤링(게시판 목록 + 캐릭터 순위)을 두 번 실행
+  - 1회차: 캐시가 비어 있어 모든 페이지를 받아 파싱
+  - 2회차: 페이지가 그대로이므로 파싱/저장 없이 끝나야 함
+- 모의 사이트의 ETag 지원을 켜면 304 응답, 끄면 200 응답의 본문 해시로 변경 여부를 판단
+- 실행별 요청 수, 응답 코드, 받은 바이트, 파싱/생략 페이지 수, 수집 게시글 수 비교
+- 페이지 캐시는 저장을 마친 페이지만 확정하므로 실제 저장 경로(ingest_stream, 캐릭터 순위 교체)로 임시 DB에 저장
+
+실행: python benchmarks/bench_page_cache.py [--pages 10] [--no-etags]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 설정/엔진이 만들어지기 전에 임시 DB와 상태 디렉터리로 바꿈 (캐시/학습한 속도를 실제 상태 파일에 섞지 않음)
+_temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_temp_dir.name}/bench.db"
+os.environ["CRAWL_STATE_DIR"] = _temp_dir.name
+
+from benchmarks.mock_sites import MockSiteConfig, MockSites, serve_in_thread
+from config import get_settings
+from crawler.character_service_crawler import crawl_all_character_services
+from crawler.multi_crawler import stream_all_targets
+from crawler.page_cache import confirm_pages
+from crawler.parse_pool import shutdown_parse_pool
+from crawler.telemetry import crawl_run
+from models.database import get_db_session, init_db
+from models.ingestion import ingest_stream, replace_service_characters
+
+
+async def run(name: str, pages: int) -> Dict[str, Any]:
+    await init_db()
+    with crawl_run(name) as telemetry:
+        start = time.perf_counter()
+        async with get_db_session() as session:
+            result = await ingest_stream(session, stream_all_targets(pages=pages))
+            characters = await crawl_all_character_services(["zeta", "lunatalk"])
+            for service, by_period in characters.items():
+                for period, chars in by_period.items():
+                    if chars:
+                        await replace_service_characters(session, service, chars, period=period)
+            await session.commit()
+        for cache in confirm_pages(chars for by_period in characters.values() for chars in by_period.values()):
+            cache.save()
+        elapsed = time.perf_counter() - start
+    
+    summary = telemetry.summary()
+    hosts = [data for data in summary["hosts"].values() if "requests" in data]
+    statuses: Dict[str, int] = {}
+    for data in hosts:
+        for status, count in data["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "elapsed": elapsed,
+        "requests": sum(data["requests"] for data in hosts),
+        "statuses": statuses,
+        "bytes": sum(data["bytes"] for data in hosts),
+        "parsed": sum(data["pages"] for data in summary["parsers"].values()),
+        "skipped": sum(data["skipped"] for data in summary["parsers"].values()),
+        "posts": result.total,
+        "characters": sum(len(chars) for by_period in characters.values() for chars in by_period.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 캐시 벤치마크 (같은 크롤링 두 번)")
+    parser.add_argument("--pages", type=int, default=10, help="갤러리별 페이지 수")
+    parser.add_argument("--no-etags", action="store_true", help="모의 사이트 ETag/304 끄기 (본문 해시로만 판단)")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    sites = MockSites(MockSiteConfig(latency_ms=args.latency_ms, jitter_ms=0.0, etags=not args.no_etags, seed=42))
+    server, thread, origin = serve_in_thread(sites)
+    
+    settings = get_settings()
+    settings.crawl_host_overrides = sites.overrides(origin)
+    settings.archive_enabled = False
+    settings.crawl_delay_seconds = 0.01
+    settings.rate_limit_min_delay_seconds = 0.01
+    settings.page_cache_enabled = True
+    
+    print("=" * 60)
+    print(f"페이지 캐시 벤치마크 (모의 사이트 {origin}, ETag {'끔' if args.no_etags else '켬'})")
+    print(f"  갤러리 {len(settings.target_galleries)}개 x {args.pages}페이지 + 제타/루나톡 랭킹")
+    print("=" * 60)
+    
+    try:
+        results = {name: asyncio.run(run(name, args.pages)) for name in ("cold", "warm")}
+    finally:
+        shutdown_parse_pool()
+        server.should_exit = True
+        thread.join()
+        _temp_dir.cleanup()
+    
+    for name, result in results.items():
+        statuses = ", ".join(f"{status} x{count}" for status, count in sorted(result["statuses"].items()))
+        print(f"\n[{name}] {result['elapsed']:.2f}s")
+        print(f"  요청: {result['requests']}회 ({statuses}), {result['bytes']:,}바이트")
+        print(f"  파싱: {result['parsed']}페이지, 생략: {result['skipped']}페이지")
+        print(f"  수집: 게시글 {result['posts']}개, 캐릭터 {result['characters']}개")
+    
+    cold, warm = results["cold"], results["warm"]
+    print()
+    if warm["parsed"] or warm["posts"] or warm["characters"] or warm["skipped"] != cold["parsed"]:
+        print("❌ 2회차에 파싱/수집된 페이지가 있습니다")
+        sys.exit(1)
+    print(f"✅ 2회차 파싱 {cold['parsed']}페이지 모두 생략, 받은 바이트 "
+          f"{(1 - warm['bytes'] / max(cold['bytes'], 1)) * 100:.1f}% 감소")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+파싱 오프로드 벤치마크
+- 가짜 fetch(네트워크 지연 흉내)와 fixture HTML로 목록 페이지 파이프라인 실행
+- 실행 방식(inline/thread/process)별 총 소요 시간과 이벤트 루프 지연(p99/max) 비교
+- inline은 파싱 동안 루프가 멈추고, thread/process는 루프 지연이 낮게 유지되어야 함
+
+실행: python benchmarks/bench_parse_offload.py [페이지 수] [파서 백엔드]
+"""
+import asyncio
+import functools
+import sys
+import time
+import logging
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import get_settings
+from api.loop_monitor import LoopLagMonitor
+from crawler.dcinside_crawler import parse_post_list
+from crawler.page_pipeline import crawl_pages
+from crawler.parse_pool import EXECUTORS, shutdown_parse_pool
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "dcinside_list.html"
+FETCH_LATENCY = 0.05  # 페이지당 가짜 네트워크 지연 (초)
+
+
+async def run(kind: str, pages: int, html: str):
+    settings = get_settings()
+    settings.parse_executor = kind
+    
+    async def fetch(page: int):
+        await asyncio.sleep(FETCH_LATENCY)
+        return html
+    
+    monitor = LoopLagMonitor(interval=0.005)
+    monitor.start()
+    start = time.perf_counter()
+    posts, _ = await crawl_pages(
+        fetch,
+        functools.partial(parse_post_list, gallery_id="wrtnai"),
+        pages, pages
+    )
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+    shutdown_parse_pool()
+    return elapsed, len(posts), monitor.snapshot()
+
+
+def main():
+    logging.disable(logging.INFO)
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    settings = get_settings()
+    if len(sys.argv) > 2:
+        settings.list_parser_backend = sys.argv[2]
+    html = FIXTURE.read_text(encoding="utf-8")
+    
+    print("=" * 60)
+    print(f"파싱 오프로드 벤치마크 ({pages}페이지, 파서 {settings.list_parser_backend}, fetch 지연 {FETCH_LATENCY * 1000:.0f}ms)")
+    print("=" * 60)
+    
+    for kind in EXECUTORS:
+        elapsed, count, lag = asyncio.run(run(kind, pages, html))
+        print(f"  {kind:>7}: {elapsed:6.2f}s, 게시글 {count}개, "
+              f"루프 지연 p50 {lag['p50_ms']:6.2f}ms / p99 {lag['p99_ms']:6.2f}ms / max {lag['max_ms']:6.2f}ms")
+    
+    print(f"\n(fetch만 순차 실행했을 때의 최소 시간: {pages * FETCH_LATENCY:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
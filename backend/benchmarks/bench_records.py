@@ -0,0 +1,76 @@
+"""
+크롤링 레코드 메모리 벤치마크
+- 공통 레코드(crawler/records.py, slots)와 이전 방식(__dict__가 있는 dataclass) 비교
+- N개 생성 시 할당된 메모리(tracemalloc)와 레코드당 바이트, to_row() 변환 속도 출력
+
+실행: python benchmarks/bench_records.py [레코드 수]
+"""
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawler.records import CrawledPost
+
+
+@dataclass
+class LegacyCrawledPost:
+    """이전 크롤러별 게시글 dataclass (slots 없음)"""
+    post_id: str
+    gallery_id: str
+    title: str
+    author: Optional[str]
+    created_at: Optional[datetime]
+    view_count: int
+    recommend_count: int
+    comment_count: int
+    url: str
+
+
+def build(cls, count: int) -> list:
+    # post_id 외의 필드 값은 같은 객체를 공유 (레코드 자체의 크기 차이가 드러나도록)
+    created_at = datetime(2026, 1, 1)
+    return [cls(str(i), "wrtnai", "제목", "작성자", created_at, i, 0, 0, "https://gall.dcinside.com/")
+            for i in range(count)]
+
+
+def measure(cls, count: int) -> int:
+    """레코드 count개가 차지하는 메모리 (바이트)"""
+    tracemalloc.start()
+    records = build(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    
+    print("=" * 60)
+    print(f"크롤링 레코드 메모리 벤치마크 ({count:,}개)")
+    print("=" * 60)
+    
+    legacy = measure(LegacyCrawledPost, count)
+    slotted = measure(CrawledPost, count)
+    print(f"  이전 (dataclass):      {legacy / 1024 / 1024:7.1f} MB ({legacy / count:5.0f} B/개)")
+    print(f"  공통 레코드 (slots):   {slotted / 1024 / 1024:7.1f} MB ({slotted / count:5.0f} B/개)")
+    print(f"  절감: {(1 - slotted / legacy):.0%}")
+    
+    records = build(CrawledPost, count)
+    crawled_at = datetime.utcnow()
+    start = time.perf_counter()
+    for record in records:
+        record.to_row(crawled_at)
+    elapsed = time.perf_counter() - start
+    print(f"  to_row(): {count / elapsed:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
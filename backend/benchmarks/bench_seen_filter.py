@@ -0,0 +1,116 @@
+"""
+저장된 게시글 필터 벤치마크 (Bloom filter + (gallery_id, post_id) 키)
+- 임시 SQLite DB에 페이지 크기(50개) 배치로 게시글을 저장하며 필터 사용/미사용 비교
+  - 신규: 처음 보는 게시글 (필터가 있으면 DB 확인 없이 INSERT)
+  - 재수집: 같은 게시글을 카운터 변화 없이 다시 저장 (양쪽 모두 쓰기 없음, 필터 유무와 관계없이 확인 조회 필요)
+- 문장 종류별 실행 횟수와 시간, 필터 오탐률 출력
+
+실행: python benchmarks/bench_seen_filter.py [게시글 수]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 설정/엔진이 만들어지기 전에 임시 DB와 상태 디렉터리로 바꿈
+_temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_temp_dir.name}/bench.db"
+os.environ["CRAWL_STATE_DIR"] = _temp_dir.name
+
+from sqlalchemy import event
+
+from config import get_settings
+from crawler.records import CrawledPost
+from crawler.seen_filter import BloomFilter
+from models import ingestion
+from models.database import async_engine, get_db_session, init_db
+
+PAGE_SIZE = 50
+
+statements: Counter = Counter()
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements[statement.split(None, 1)[0].upper()] += 1
+
+
+def build(gallery_id: str, count: int) -> list:
+    created_at = datetime(2026, 1, 1)
+    return [CrawledPost(str(i), gallery_id, "제목", "작성자", created_at, 10, 0, 0, f"https://example.com/{i}")
+            for i in range(1, count + 1)]
+
+
+async def ingest(posts: list) -> tuple:
+    """페이지 크기 배치로 저장 (배치마다 커밋) -> (초, 문장 종류별 횟수)"""
+    statements.clear()
+    start = time.perf_counter()
+    for offset in range(0, len(posts), PAGE_SIZE):
+        async with get_db_session() as session:
+            await ingestion.upsert_posts(session, posts[offset:offset + PAGE_SIZE])
+    return time.perf_counter() - start, dict(statements)
+
+
+def _format(counts: dict) -> str:
+    return ", ".join(f"{name} {counts.get(name, 0)}" for name in ("SELECT", "INSERT", "UPDATE"))
+
+
+async def run(count: int) -> None:
+    await init_db()
+    settings = get_settings()
+    
+    for enabled in (False, True):
+        settings.seen_filter_enabled = enabled
+        ingestion._seen = None
+        posts = build("filter_on" if enabled else "filter_off", count)
+        label = "필터 사용" if enabled else "필터 없음"
+        if enabled:
+            # DB의 기존 키로 필터를 채우는 비용은 프로세스당 한 번 (이후에는 파일에서 불러옴)
+            async with get_db_session() as session:
+                await ingestion.seen_posts(session)
+        
+        print(f"\n[{label}]")
+        for name in ("신규", "재수집"):
+            elapsed, counts = await ingest(posts)
+            print(f"  {name:>4}: {elapsed * 1000:8.1f} ms ({count / elapsed:8,.0f} posts/sec) - {_format(counts)}")
+
+
+def false_positive_rate(capacity: int, error_rate: float) -> float:
+    bloom = BloomFilter.for_capacity(capacity, error_rate)
+    for i in range(capacity):
+        bloom.add(f"wrtnai\x00{i}".encode())
+    probes = min(capacity, 100_000)
+    return sum(f"arcalive\x00{i}".encode() in bloom for i in range(probes)) / probes
+
+
+def main():
+    logging.disable(logging.WARNING)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    settings = get_settings()
+    
+    print("=" * 60)
+    print(f"저장된 게시글 필터 벤치마크 (게시글 {count:,}개, 배치 {PAGE_SIZE}개)")
+    print("=" * 60)
+    
+    try:
+        asyncio.run(run(count))
+    finally:
+        _temp_dir.cleanup()
+    
+    capacity = 200_000
+    bloom = BloomFilter.for_capacity(settings.seen_filter_capacity, settings.seen_filter_error_rate)
+    print(f"\n[필터 크기] 설정값 {settings.seen_filter_capacity:,}개 / 오탐률 {settings.seen_filter_error_rate}: "
+          f"{bloom.bits / 8 / 1024 / 1024:.1f} MB, 해시 {bloom.hashes}개")
+    print(f"[오탐률] {capacity:,}개 저장 후 측정: {false_positive_rate(capacity, settings.seen_filter_error_rate):.4%}")
+
+
+if __name__ == "__main__":
+    main()
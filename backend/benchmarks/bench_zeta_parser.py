@@ -0,0 +1,174 @@
+"""
+제타 랭킹 파서 벤치마크
+- fixture 페이지의 카드 영역(DOM 경로)을 캐릭터 ID만 바꿔 N배로 늘린 페이지로 이전 구현(링크마다 문서 전체 검색)과 비교
+- 두 구현의 결과가 같은지 확인 (parity) 후 배율별 파싱 시간/속도 향상 출력
+- 이전 구현은 카드 수의 제곱, 현재 구현은 카드 수에 비례해서 늘어나야 함
+
+실행: python benchmarks/bench_zeta_parser.py [최대 배율]
+"""
+import re
+import sys
+import time
+import logging
+import uuid
+from pathlib import Path
+from typing import List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from crawler.zeta_crawler import CharacterData, ZetaCrawler, extract_character_id, parse_rankings_dom, parse_views
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "zeta_ranking.html"
+UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def legacy_parse_rankings(html: str, limit: int = 30) -> List[CharacterData]:
+    """
+    이전 구현 (조회수 링크마다 soup.find_all('a', href=href)로 문서 전체 검색 - O(링크 수²))
+    
+    Args:
+        html: 제타 메인(랭킹) 페이지 HTML
+        limit: 수집할 캐릭터 수
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    characters = []
+    
+    # /ko/plots/{UUID}/profile 형식의 링크 찾기
+    plot_links = soup.find_all('a', href=re.compile(r'/ko/plots/[^/]+/profile'))
+    
+    # 중복 제거를 위해 이미 처리한 캐릭터 ID 추적
+    seen_ids = set()
+    rank = 1
+    
+    for link in plot_links:
+        if rank > limit:
+            break
+        
+        href = link.get('href', '')
+        char_id = extract_character_id(href)
+        
+        # 중복 체크
+        if char_id in seen_ids:
+            continue
+        
+        try:
+            text = link.get_text(strip=True)
+            
+            # 조회수 링크인지 확인 (숫자만 있는 텍스트)
+            if not re.match(r'^[\d,\.]+[만천]?$', text):
+                continue
+            
+            views = parse_views(text)
+            
+            # 같은 href를 가진 다른 링크에서 이름 링크 찾기
+            all_same_href = soup.find_all('a', href=href)
+            name_link = None
+            for l in all_same_href:
+                l_text = l.get_text(strip=True)
+                if l_text != text:  # 조회수가 아닌 링크
+                    name_link = l
+                    break
+            
+            if not name_link:
+                continue
+            
+            # 이름 링크에서 span 요소들 추출
+            spans = name_link.find_all('span')
+            if len(spans) < 2:
+                continue
+            
+            name = spans[0].get_text(strip=True)
+            description = spans[1].get_text(strip=True) if len(spans) > 1 else None
+            
+            if not name:
+                continue
+            
+            # 태그 추출 (부모에서 찾기)
+            tags = None
+            parent = name_link.parent
+            if parent:
+                # 부모 내의 모든 div를 검색하여 '#'로 시작하는 텍스트 찾기
+                all_divs = parent.find_all('div')
+                for div in all_divs:
+                    div_text = div.get_text(strip=True)
+                    if div_text and div_text.startswith('#'):
+                        # '#'로 구분하여 태그 리스트 생성
+                        tags = [t.strip() for t in div_text.split('#') if t.strip()]
+                        break
+            
+            character_url = f"{ZetaCrawler.BASE_URL}{href}"
+            
+            characters.append(CharacterData(
+                character_id=char_id,
+                rank=rank,
+                name=name,
+                author=None,
+                views=views,
+                tags=tags,
+                description=description,
+                thumbnail_url=None,
+                character_url=character_url
+            ))
+            
+            seen_ids.add(char_id)
+            rank += 1
+        
+        except Exception:
+            continue
+    
+    return characters
+
+
+def scale_fixture(html: str, copies: int) -> str:
+    """<main> 안의 카드 영역을 copies배로 늘림 (복사본마다 캐릭터 ID를 새로 만들어 중복 제거에 걸리지 않게 함)"""
+    start = html.index("<main")
+    start = html.index(">", start) + 1
+    end = html.index("</main>")
+    content = html[start:end]
+    
+    sections = [content]
+    for i in range(1, copies):
+        sections.append(UUID_RE.sub(lambda m: str(uuid.uuid5(uuid.NAMESPACE_URL, f"{m.group(0)}/{i}")), content))
+    return html[:start] + "".join(sections) + html[end:]
+
+
+def best_of(func, html: str, limit: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html, limit)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    logging.disable(logging.WARNING)
+    max_copies = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    fixture = FIXTURE.read_text(encoding="utf-8")
+    
+    print("=" * 60)
+    print("제타 랭킹 파서 벤치마크 (이전: 링크마다 문서 전체 검색, 현재: href 색인 한 번)")
+    print("=" * 60)
+    
+    copies = 1
+    while copies <= max_copies:
+        html = scale_fixture(fixture, copies)
+        limit = 10_000  # 페이지의 모든 캐릭터
+        current = parse_rankings_dom(html, limit)
+        legacy = legacy_parse_rankings(html, limit)
+        parity = "OK" if current == legacy else "MISMATCH"
+        
+        legacy_time = best_of(legacy_parse_rankings, html, limit)
+        current_time = best_of(parse_rankings_dom, html, limit)
+        links = html.count('/profile"')
+        print(f"  x{copies:<3} 링크 {links:>5}개, 캐릭터 {len(current):>4}개 [{parity}] "
+              f"이전 {legacy_time * 1000:8.1f}ms, 현재 {current_time * 1000:7.1f}ms "
+              f"({legacy_time / current_time:5.1f}배)")
+        copies *= 2
+
+
+if __name__ == "__main__":
+    main()
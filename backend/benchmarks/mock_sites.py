@@ -0,0 +1,211 @@
+"""
+로컬 모의 사이트 서버
+- 저장된 fixture HTML로 디시인사이드/아카라이브/제타/루나톡/베이비챗 페이지를 흉내냄 (실제 사이트 없이 크롤러 실행)
+- Host 헤더로 사이트를 구분 (HttpClientRegistry의 crawl_host_overrides로 요청을 이 서버로 보냄)
+  - 브라우저(BrowserPool)는 Host 헤더를 바꿀 수 없어 X-Forwarded-Host를 우선 사용
+- 베이비챗은 하이드레이션 JSON 페이지 또는 스크립트로만 그려지는 SPA 페이지(babechat_spa) 선택
+- 응답 지연, 500 에러, 403 차단, 429(Retry-After) 응답을 확률로 주입
+- 목록 페이지는 페이지 번호만큼 게시글 번호를 내려서 페이지마다 다른 게시글처럼 보이게 함
+- etags를 켜면 본문 해시로 ETag를 붙이고 If-None-Match가 같으면 304 응답 (조건부 요청 확인용)
+
+단독 실행: python benchmarks/mock_sites.py --port 8900 --latency-ms 50 --rate-limit-rate 0.02
+    그 다음 크롤러 실행 시 환경 변수로 재지정:
+    CRAWL_HOST_OVERRIDES='{"gall.dcinside.com": "http://127.0.0.1:8900", "m.dcinside.com": "http://127.0.0.1:8900",
+                           "arca.live": "http://127.0.0.1:8900",
+                           "zeta-ai.io": "http://127.0.0.1:8900", "lunatalk.chat": "http://127.0.0.1:8900",
+                           "babechat.ai": "http://127.0.0.1:8900"}'
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+# 페이지마다 게시글 번호를 내리는 간격 (fixture 한 페이지의 게시글 수보다 커야 함)
+PAGE_ID_STEP = 1000
+
+
+@dataclass
+class MockSiteConfig:
+    """응답 지연/에러 주입 설정"""
+    latency_ms: float = 50.0  # 평균 응답 지연
+    jitter_ms: float = 20.0  # 지연 표준편차
+    error_rate: float = 0.0  # 500 응답 확률
+    forbidden_rate: float = 0.0  # 403 응답 확률
+    rate_limit_rate: float = 0.0  # 429 응답 확률
+    retry_after: int = 1  # 429 응답의 Retry-After (초)
+    babechat_spa: bool = False  # 베이비챗 랭킹을 브라우저 렌더링이 필요한 SPA 페이지로 응답
+    etags: bool = False  # 페이지에 ETag를 붙이고 If-None-Match가 같으면 304 응답
+    seed: Optional[int] = None
+
+
+def _shift_ids(html: str, pattern: str, page: int) -> str:
+    """pattern에 걸리는 게시글 번호를 (page - 1) * PAGE_ID_STEP 만큼 내림 (공지 번호는 그대로)"""
+    if page <= 1:
+        return html
+    offset = (page - 1) * PAGE_ID_STEP
+    return re.sub(pattern, lambda m: str(int(m.group(0)) - offset), html)
+
+
+def _page_param(request: Request, name: str) -> int:
+    try:
+        return max(int(request.query_params.get(name, 1)), 1)
+    except ValueError:
+        return 1
+
+
+class MockSites:
+    """모의 사이트 (Host별 페이지 렌더링 + 응답 통계)"""
+    
+    HOSTS = ("gall.dcinside.com", "m.dcinside.com", "arca.live", "zeta-ai.io", "lunatalk.chat", "babechat.ai")
+    
+    def __init__(self, config: Optional[MockSiteConfig] = None):
+        self.config = config or MockSiteConfig()
+        self.random = random.Random(self.config.seed)
+        self.fixtures = {
+            name: (FIXTURES_DIR / f"{name}.html").read_text(encoding="utf-8")
+            for name in ("dcinside_list", "dcinside_mobile_list", "arcalive_list", "zeta_ranking", "lunatalk_ranking",
+                         "babechat_ranking", "babechat_spa")
+        }
+        # 호스트별 응답 코드 집계
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.routes: Dict[str, Callable[[Request], Optional[str]]] = {
+            "gall.dcinside.com": self._dcinside,
+            "m.dcinside.com": self._dcinside_mobile,
+            "arca.live": self._arcalive,
+            "zeta-ai.io": self._zeta,
+            "lunatalk.chat": self._lunatalk,
+            "babechat.ai": self._babechat,
+        }
+    
+    def _dcinside(self, request: Request) -> Optional[str]:
+        if not request.url.path.rstrip("/").endswith("/board/lists"):
+            return None
+        # 일반 게시글 번호만 (공지 9000xx는 매 페이지 동일)
+        return _shift_ids(self.fixtures["dcinside_list"], r"(?<!\d)1523\d\d(?!\d)", _page_param(request, "page"))
+    
+    def _dcinside_mobile(self, request: Request) -> Optional[str]:
+        if not re.fullmatch(r"/board/[^/]+/?", request.url.path):
+            return None
+        return _shift_ids(self.fixtures["dcinside_mobile_list"], r"(?<!\d)1523\d\d(?!\d)", _page_param(request, "page"))
+    
+    def _arcalive(self, request: Request) -> Optional[str]:
+        if not re.fullmatch(r"/b/[^/]+/?", request.url.path):
+            return None
+        return _shift_ids(self.fixtures["arcalive_list"], r"(?<!\d)1432500\d\d(?!\d)", _page_param(request, "p"))
+    
+    def _zeta(self, request: Request) -> Optional[str]:
+        return self.fixtures["zeta_ranking"] if request.url.path.rstrip("/") == "/ko" else None
+    
+    def _lunatalk(self, request: Request) -> Optional[str]:
+        return self.fixtures["lunatalk_ranking"] if request.url.path.rstrip("/") == "/character/rank" else None
+    
+    def _babechat(self, request: Request) -> Optional[str]:
+        if request.url.path.rstrip("/") != "/ranking":
+            return None
+        return self.fixtures["babechat_spa" if self.config.babechat_spa else "babechat_ranking"]
+    
+    def _injected_status(self) -> Optional[int]:
+        """확률에 따라 주입할 에러 응답 코드"""
+        roll = self.random.random()
+        for status, rate in ((429, self.config.rate_limit_rate), (403, self.config.forbidden_rate),
+                             (500, self.config.error_rate)):
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+    
+    async def handle(self, request: Request):
+        host = (request.headers.get("x-forwarded-host") or request.headers.get("host", "")).split(":")[0]
+        latency = max(self.random.gauss(self.config.latency_ms, self.config.jitter_ms), 0.0) / 1000
+        await asyncio.sleep(latency)
+        
+        status = self._injected_status()
+        if status == 429:
+            response = PlainTextResponse("Too Many Requests", status_code=429,
+                                         headers={"Retry-After": str(self.config.retry_after)})
+        elif status is not None:
+            response = PlainTextResponse("Error", status_code=status)
+        else:
+            route = self.routes.get(host)
+            html = route(request) if route else None
+            response = HTMLResponse(html) if html is not None else PlainTextResponse("Not Found", status_code=404)
+            if html is not None and self.config.etags:
+                etag = f'"{hashlib.md5(html.encode("utf-8")).hexdigest()}"'
+                if request.headers.get("if-none-match") == etag:
+                    response = Response(status_code=304, headers={"ETag": etag})
+                else:
+                    response.headers["ETag"] = etag
+        
+        self.statuses[host][response.status_code] += 1
+        return response
+    
+    def app(self) -> FastAPI:
+        app = FastAPI(title="Mock Sites", docs_url=None, redoc_url=None, openapi_url=None)
+        app.add_api_route("/{path:path}", self.handle, methods=["GET"])
+        return app
+    
+    def overrides(self, origin: str) -> Dict[str, str]:
+        """crawl_host_overrides 설정값 (모든 모의 호스트 -> 이 서버)"""
+        return {host: origin for host in self.HOSTS}
+
+
+def serve_in_thread(sites: MockSites):
+    """모의 사이트 서버를 별도 스레드(별도 이벤트 루프)에서 실행 (빈 포트 사용)
+    
+    Returns:
+        (uvicorn 서버, 스레드, origin) - 종료 시 server.should_exit = True 후 thread.join()
+    """
+    import uvicorn
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(sites.app(), log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="로컬 모의 사이트 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 확률")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="403 응답 확률")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--babechat-spa", action="store_true", help="베이비챗을 SPA 페이지(브라우저 필요)로 응답")
+    parser.add_argument("--etags", action="store_true", help="ETag를 붙이고 조건부 요청에 304 응답")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    
+    sites = MockSites(MockSiteConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        forbidden_rate=args.forbidden_rate, rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after, babechat_spa=args.babechat_spa, etags=args.etags, seed=args.seed,
+    ))
+    uvicorn.run(sites.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
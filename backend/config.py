@@ -3,7 +3,7 @@
 """
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -15,8 +15,87 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./monitoring.db"
     
     # Crawler Settings
-    crawl_delay_seconds: float = 1.5
+    crawl_delay_seconds: float = 1.5  # 처음 보는 호스트의 요청 간격 (이후 응답에 따라 자동 조정)
     max_pages_per_crawl: int = 3  # 테스트용으로 3페이지로 감소
+    max_pages_incremental: int = 20  # 증분 크롤링 시 새 글이 계속 나올 때의 최대 페이지 수
+    crawl_targets_concurrently: bool = True  # 갤러리별 동시 크롤링 (호스트별 딜레이는 유지)
+    list_parser_backend: str = "auto"  # 목록 페이지 파서: "auto", "lxml", "soup"
+    # 디시인사이드 목록 소스: "desktop" 또는 "mobile"(m.dcinside.com, 더 가벼운 페이지)
+    # target_galleries 항목의 "source"로 갤러리별 지정 가능
+    dcinside_list_source: str = "desktop"
+    parse_executor: str = "thread"  # 파싱 실행 위치: "thread", "process", "inline"(이벤트 루프)
+    parse_workers: int = 2
+    crawl_queue_max_pages: int = 8  # 크롤러 -> DB 저장 큐에 쌓아둘 최대 페이지 수 (가득 차면 크롤링 대기)
+    ingest_batch_size: int = 200  # 스트리밍 저장 시 커밋 단위 게시글 수
+    # 저장된 게시글 Bloom filter (처음 보는 게시글은 DB 조회 없이 저장, 있을 수도 있는 게시글만 DB에서 확인)
+    seen_filter_enabled: bool = True
+    seen_filter_capacity: int = 2_000_000  # 이 수를 넘으면 오탐이 늘어남 (크기를 바꾸면 DB에서 다시 채움)
+    seen_filter_error_rate: float = 0.001
+    fetch_post_bodies: bool = False  # 목록 크롤링 후 새 게시글 본문까지 수집
+    body_fetch_concurrency_per_host: int = 2  # 본문 수집 시 호스트별 동시 요청 수 (요청 간격은 속도 제한기 기준)
+    body_fetch_max_posts: int = 200  # 한 번에 본문을 수집할 최대 게시글 수
+    crawl_state_dir: str = "./crawl_state"  # 크롤러 상태 파일 저장 위치 (학습한 요청 속도 등)
+    
+    # Engagement Refresh (최근 페이지를 다시 크롤링해 조회수/추천수/댓글수 갱신 + 스냅샷)
+    engagement_refresh_pages: int = 3  # 갤러리별로 다시 볼 최근 페이지 수
+    engagement_refresh_interval_hours: int = 3
+    engagement_snapshot_retention_days: int = 30
+    
+    # Circuit Breaker (대상별 - 요청 실패/0행 페이지가 이어지면 요청 중단 후 시험 요청으로 복구 확인)
+    crawl_breaker_failure_threshold: int = 3  # 연속 요청 실패 페이지 수 (요청마다 재시도한 뒤의 실패)
+    crawl_breaker_empty_threshold: int = 2  # HTML은 받았는데 게시글이 0개인 연속 페이지 수 (마크업 변경 의심)
+    crawl_breaker_open_seconds: float = 1800.0  # 처음 열렸을 때 요청을 멈추는 시간 (연속으로 열릴 때마다 2배)
+    crawl_breaker_max_open_seconds: float = 86400.0
+    
+    # Crawl Work Queue (DB 작업 큐 + worker.py 프로세스)
+    crawl_use_work_queue: bool = False  # 스케줄러가 직접 크롤링하지 않고 작업 큐에 넣음
+    crawl_task_pages: int = 5  # 작업 하나가 맡는 페이지 수
+    crawl_task_lease_seconds: float = 300.0  # 이 시간 안에 갱신하지 않으면 다른 워커가 다시 가져감
+    crawl_task_max_attempts: int = 3
+    crawl_task_retry_delay_seconds: float = 60.0  # 실패 후 재시도까지 대기 (시도마다 2배)
+    crawl_worker_poll_seconds: float = 5.0  # 큐가 비었을 때 다시 확인하는 간격
+    
+    # Backfill (backfill.py - 과거 게시글 수집, 진행 위치는 DB에 저장)
+    backfill_max_pages: int = 5000  # 갤러리별로 내려갈 최대 페이지
+    backfill_delay_factor: float = 3.0  # 일반 크롤링보다 요청 간격을 몇 배로 (일반 크롤링에 속도를 양보)
+    backfill_task_priority: int = -10  # 작업 큐로 처리할 때의 우선순위 (일일 크롤링은 10)
+    
+    # Page Cache (URL별 ETag/Last-Modified/본문 해시 - 바뀌지 않은 페이지는 파싱/DB 저장 생략)
+    page_cache_enabled: bool = True
+    page_cache_max_age_hours: float = 24.0  # 마지막으로 파싱한 지 이 시간이 지나면 바뀌지 않았어도 다시 파싱
+    page_cache_max_entries: int = 20000  # 넘으면 오래 확인하지 않은 URL부터 지움
+    
+    # Raw HTML Archive (reparse.py로 재크롤링 없이 다시 파싱)
+    archive_enabled: bool = True
+    archive_dir: str = "./archive"
+    archive_compression: str = "auto"  # "auto" (zstd 설치 시 zstd), "zstd", "gzip"
+    
+    # Adaptive Rate Limit Settings (호스트별 token bucket + AIMD)
+    rate_limit_min_delay_seconds: float = 0.5  # 속도를 올려도 이보다 짧게 요청하지 않음
+    rate_limit_max_delay_seconds: float = 30.0  # 차단이 반복돼도 이보다 길게 기다리지는 않음
+    rate_limit_increase: float = 0.05  # 정상 응답마다 늘리는 초당 요청 수
+    rate_limit_decrease_factor: float = 0.5  # 403/429/5xx 응답 시 속도에 곱하는 값
+    rate_limit_burst: float = 1.0  # 연달아 보낼 수 있는 요청 수
+    
+    # HTTP Client Settings (호스트별 keep-alive 연결 풀)
+    http_timeout_seconds: float = 30.0
+    http_connect_timeout_seconds: float = 10.0
+    http_max_connections_per_host: int = 10
+    http_max_keepalive_per_host: int = 5
+    http_keepalive_expiry_seconds: float = 30.0
+    # 호스트별 요청 주소 재지정 (로컬 모의 사이트 등, 예: {"arca.live": "http://127.0.0.1:8900"})
+    # 속도 제한/통계/아카이브는 원래 호스트 기준, Host 헤더도 원래 호스트로 전송
+    crawl_host_overrides: Dict[str, str] = {}
+    
+    # Headless Browser Settings (JavaScript 렌더링이 필요한 서비스용, playwright 필요)
+    babechat_use_browser: bool = False  # 하이드레이션 JSON이 없을 때 브라우저로 렌더링
+    browser_pool_size: int = 2  # 재사용할 브라우저 컨텍스트(페이지) 수
+    browser_headless: bool = True
+    browser_render_timeout_seconds: float = 20.0
+    browser_blocked_resources: List[str] = ["image", "font", "media"]  # 받지 않을 리소스 종류
+    
+    # 캐릭터 서비스 크롤링
+    lunatalk_periods: List[str] = ["daily", "weekly", "monthly", "new", "overall"]  # 수집할 루나톡 랭킹 기간
     
     # API Settings
     api_host: str = "0.0.0.0"
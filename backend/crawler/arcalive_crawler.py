@@ -1,191 +1,210 @@
 """
 아카라이브 크롤러
 """
-import asyncio
+import functools
 import re
 from datetime import datetime
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Union
 import logging
 
-import httpx
-from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 
 from config import get_settings
+from crawler.circuit_breaker import TargetBreaker
+from crawler.http_client import HttpClientRegistry, shared_or_owned
+from crawler.page_cache import Unchanged
+from crawler.page_locator import PageLocation, locate_page
+from crawler.page_pipeline import iter_pages
+from crawler.parse_pool import run_parse
+from crawler.records import CrawledPost
+from crawler import list_parser
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class CrawledPost:
-    """크롤링된 게시글 데이터"""
-    post_id: str
-    gallery_id: str
-    title: str
-    author: Optional[str]
-    created_at: Optional[datetime]
-    view_count: int
-    recommend_count: int
-    comment_count: int
-    url: str
-
-
 class ArcaliveCrawler:
     """아카라이브 크롤러"""
     
     BASE_URL = "https://arca.live"
     
-    def __init__(self, board_id: str = "characterai"):
+    def __init__(self, board_id: str = "characterai",
+                 http: Optional[HttpClientRegistry] = None):
         self.settings = get_settings()
         self.board_id = board_id
+        self.http = http
         self.ua = UserAgent()
         self.delay = self.settings.crawl_delay_seconds
         self.max_retries = 3
-        
+    
     def _get_headers(self):
         return {
             "User-Agent": self.ua.random,
             "Accept": "text/html",
         }
     
-    async def _fetch_page(self, url: str, client: httpx.AsyncClient) -> Optional[str]:
-        """페이지 HTML 가져오기"""
-        for attempt in range(self.max_retries):
-            try:
-                response = await client.get(url, headers=self._get_headers(), timeout=30.0)
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                logger.warning(f"요청 에러 (시도 {attempt + 1}/{self.max_retries}): {e}")
-                await asyncio.sleep(self.delay * (attempt + 1))
-        return None
+    async def _fetch_page(self, url: str, http: HttpClientRegistry,
+                          conditional: bool = False) -> Union[str, Unchanged, None]:
+        """페이지 HTML 가져오기 (conditional이면 페이지 캐시로 조건부 요청 - 바뀌지 않았으면 UNCHANGED)"""
+        return await http.fetch_text(
+            url, max_retries=self.max_retries, headers=self._get_headers(),
+            archive_meta={"kind": "arcalive_list", "board_id": self.board_id}, conditional=conditional
+        )
+    
+    
+    def _list_url(self, page: int) -> str:
+        """목록 페이지 URL"""
+        return f"{self.BASE_URL}/b/{self.board_id}?p={page}"
     
     def _parse_post_list(self, html: str) -> List[CrawledPost]:
         """게시글 목록 파싱"""
-        posts = []
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # 게시글 찾기
-        vrows = soup.select("a.vrow")
-        logger.info(f"HTML에서 {len(vrows)}개 행 발견")
-        
-        for vrow in vrows:
-            try:
-                # 공지사항 제외
-                if 'notice' in vrow.get('class', []):
-                    continue
-                
-                # 게시글 ID
-                href = vrow.get('href', '')
-                match = re.search(r'/(\d+)\?', href)
-                if not match:
-                    continue
-                post_id = match.group(1)
-                
-                # 제목
-                title_elem = vrow.select_one(".title")
-                if not title_elem:
-                    continue
-                title = title_elem.get_text(strip=True)
-                
-                # URL
-                url = f"{self.BASE_URL}{href}" if href.startswith('/') else href
-                
-                # 작성자
-                author_elem = vrow.select_one(".user-info")
-                author = author_elem.get_text(strip=True) if author_elem else None
-                
-                # 작성일
-                time_elem = vrow.select_one("time")
-                created_at = None
-                if time_elem:
-                    time_str = time_elem.get_text(strip=True)
-                    created_at = self._parse_date(time_str)
-                
-                # 조회수
-                view_elem = vrow.select_one(".vcol-hits, .col-rate")
-                view_count = 0
-                if view_elem:
-                    view_text = view_elem.get_text(strip=True)
-                    view_match = re.search(r'\d+', view_text)
-                    if view_match:
-                        view_count = int(view_match.group())
-                
-                # 추천수
-                rate_elem = vrow.select_one(".vcol-rate")
-                recommend_count = 0
-                if rate_elem:
-                    rate_text = rate_elem.get_text(strip=True)
-                    rate_match = re.search(r'\d+', rate_text)
-                    if rate_match:
-                        recommend_count = int(rate_match.group())
-                
-                # 댓글수
-                comment_elem = vrow.select_one(".vcol-comment")
-                comment_count = 0
-                if comment_elem:
-                    comment_text = comment_elem.get_text(strip=True)
-                    comment_match = re.search(r'\d+', comment_text)
-                    if comment_match:
-                        comment_count = int(comment_match.group())
-                
-                posts.append(CrawledPost(
-                    post_id=post_id,
-                    gallery_id=self.board_id,
-                    title=title,
-                    author=author,
-                    created_at=created_at,
-                    view_count=view_count,
-                    recommend_count=recommend_count,
-                    comment_count=comment_count,
-                    url=url
-                ))
-                
-            except Exception as e:
-                logger.warning(f"게시글 파싱 에러: {e}")
-                continue
-        
-        return posts
+        return parse_post_list(html, self.board_id)
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """날짜 문자열 파싱"""
-        if not date_str:
-            return None
+        return parse_date(date_str)
+    
+    async def iter_board(self, pages: int = None,
+                         last_seen_id: Optional[int] = None, start_page: int = 1,
+                         breaker: Optional[TargetBreaker] = None) -> AsyncIterator[List[CrawledPost]]:
+        """
+        게시판 크롤링 (페이지마다 게시글 목록을 yield)
         
-        try:
-            # "2026.01.14" 형식
-            if re.match(r'\d{4}\.\d{2}\.\d{2}', date_str):
-                return datetime.strptime(date_str, "%Y.%m.%d")
-        except ValueError:
-            pass
+        Args:
+            pages: 크롤링할 페이지 수
+            last_seen_id: 이미 저장된 가장 큰 게시글 번호 (high-water mark)
+            start_page: 첫 페이지 번호 (pages는 마지막 페이지 번호)
+            breaker: 대상의 circuit breaker (페이지 결과를 기록하고, 열리면 중단)
         
-        return None
-    
-    async def crawl_board(self, pages: int = None) -> List[CrawledPost]:
-        """게시판 크롤링"""
+        breaker가 정상(healthy)일 때만 조건부 요청 - 이전 실행과 같은 페이지는 파싱하지 않고 빈 UnchangedPage
+        """
         pages = pages or self.settings.max_pages_per_crawl
-        all_posts = []
+        max_pages = max(pages, self.settings.max_pages_incremental)
         
-        logger.info(f"크롤링 시작: 게시판={self.board_id}, 페이지 수={pages}")
+        logger.info(f"크롤링 시작: 게시판={self.board_id}, 페이지 수={pages}, 마지막 게시글={last_seen_id}")
         
-        async with httpx.AsyncClient() as client:
-            for page in range(1, pages + 1):
-                url = f"{self.BASE_URL}/b/{self.board_id}?p={page}"
-                
+        async with shared_or_owned(self.http, self.delay) as http:
+            async def fetch(page: int) -> Union[str, Unchanged, None]:
                 logger.info(f"페이지 {page}/{pages} 크롤링 중...")
-                html = await self._fetch_page(url, client)
-                
-                if html:
-                    posts = self._parse_post_list(html)
-                    all_posts.extend(posts)
-                    logger.info(f"페이지 {page}에서 {len(posts)}개 게시글 수집")
-                else:
-                    logger.warning(f"페이지 {page} 크롤링 실패")
-                
-                if page < pages:
-                    await asyncio.sleep(self.delay)
+                conditional = breaker is None or breaker.healthy
+                return await self._fetch_page(self._list_url(page), http, conditional)
+            
+            total = 0
+            page = 0
+            parse = functools.partial(parse_post_list, board_id=self.board_id)
+            async for page, posts in iter_pages(fetch, parse, pages, max_pages, last_seen_id, start_page, breaker):
+                total += len(posts)
+                yield posts
+        
+        logger.info(f"크롤링 완료: {page}페이지, 총 {total}개 게시글 수집")
+    
+    async def locate_page(self, target_date: Optional[datetime] = None, target_post_id: Optional[int] = None,
+                          max_page: Optional[int] = None, hint: int = 1) -> PageLocation:
+        """
+        목표 날짜/게시글 번호가 있는 목록 페이지 찾기 (앞에서부터 넘기지 않고 O(log n)번 요청)
+        
+        Args:
+            target_date: 목표 작성 시각 (target_post_id와 둘 중 하나)
+            target_post_id: 목표 게시글 번호
+            max_page: 탐색할 최대 페이지 (None이면 backfill_max_pages)
+            hint: 탐색 시작 페이지
+        """
+        parse = functools.partial(parse_post_list, board_id=self.board_id)
+        async with shared_or_owned(self.http, self.delay) as http:
+            async def fetch_posts(page: int) -> List[CrawledPost]:
+                html = await self._fetch_page(self._list_url(page), http)
+                return await run_parse(parse, html) if html else []
+            
+            return await locate_page(fetch_posts, target_date, target_post_id,
+                                     max_page or self.settings.backfill_max_pages, hint)
+    
+    async def crawl_board(self, pages: int = None, last_seen_id: Optional[int] = None) -> List[CrawledPost]:
+        """
+        게시판 크롤링 (전체 결과를 모아서 반환)
         
-        logger.info(f"크롤링 완료: 총 {len(all_posts)}개 게시글 수집")
+        Args:
+            pages: 크롤링할 페이지 수
+            last_seen_id: 이미 저장된 가장 큰 게시글 번호 (high-water mark)
+        """
+        all_posts = []
+        async for posts in self.iter_board(pages, last_seen_id):
+            all_posts.extend(posts)
         return all_posts
+
+
+def _first_number(text: Optional[str]) -> int:
+    """문자열에서 첫 번째 숫자 추출 (없으면 0)"""
+    if not text:
+        return 0
+    match = re.search(r'\d+', text)
+    return int(match.group()) if match else 0
+
+
+def parse_date(date_str: str) -> Optional[datetime]:
+    """날짜 문자열 파싱"""
+    if not date_str:
+        return None
+    
+    try:
+        # "2026.01.14" 형식
+        if re.match(r'\d{4}\.\d{2}\.\d{2}', date_str):
+            return datetime.strptime(date_str, "%Y.%m.%d")
+    except ValueError:
+        pass
+    
+    return None
+
+
+def parse_post_list(html: str, board_id: str, backend: Optional[str] = None) -> List[CrawledPost]:
+    """
+    게시글 목록 파싱
+    
+    Args:
+        html: 목록 페이지 HTML
+        board_id: 게시판 ID
+        backend: 파서 백엔드 ("lxml", "soup", "auto" / None이면 설정값)
+    """
+    posts = []
+    
+    # 게시글 찾기
+    vrows = list_parser.arcalive_rows(html, backend)
+    logger.info(f"HTML에서 {len(vrows)}개 행 발견")
+    
+    for vrow in vrows:
+        try:
+            # 공지사항 제외
+            if vrow["notice"]:
+                continue
+            
+            # 게시글 ID
+            href = vrow["href"]
+            match = re.search(r'/(\d+)\?', href)
+            if not match:
+                continue
+            post_id = match.group(1)
+            
+            # 제목
+            title = vrow["title"]
+            if not title:
+                continue
+            
+            # URL
+            url = f"{ArcaliveCrawler.BASE_URL}{href}" if href.startswith('/') else href
+            
+            posts.append(CrawledPost(
+                post_id=post_id,
+                gallery_id=board_id,
+                title=title,
+                author=vrow["author"] or None,
+                created_at=parse_date(vrow["date"]),
+                view_count=_first_number(vrow["view"]),
+                recommend_count=_first_number(vrow["recommend"]),
+                comment_count=_first_number(vrow["comment"]),
+                url=url
+            ))
+        
+        except Exception as e:
+            logger.warning(f"게시글 파싱 에러: {e}")
+            continue
+    
+    return posts
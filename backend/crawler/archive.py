@@ -0,0 +1,183 @@
+"""
+크롤링 원본 HTML 아카이브
+- 받은 페이지 본문을 내용 해시(sha256) 기준으로 한 번만 압축 저장 (zstd 설치 시 zstd, 없으면 gzip)
+- 요청마다 URL/시각/응답 코드/해시/파서 종류를 날짜별 JSONL 인덱스에 기록
+- 선택자가 깨지거나 개선됐을 때 재크롤링 없이 reparse.py로 과거 데이터를 다시 만들 수 있음
+
+디렉토리 구조:
+    {archive_dir}/objects/ab/abcdef....zst   압축된 본문 (내용 주소)
+    {archive_dir}/index/2024-01-15.jsonl     요청 기록
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("zstd", "gzip")
+_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def _zstd_available() -> bool:
+    """zstd 압축 패키지(zstandard) 설치 여부"""
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_codec(name: str = "auto") -> str:
+    """설정값을 실제 사용할 압축 방식으로 변환"""
+    if name == "auto":
+        return "zstd" if _zstd_available() else "gzip"
+    if name not in CODECS:
+        raise ValueError(f"지원하지 않는 압축 방식: {name} (사용 가능: auto, {', '.join(CODECS)})")
+    if name == "zstd" and not _zstd_available():
+        logger.warning("zstandard가 설치되지 않았습니다. gzip으로 압축합니다.")
+        return "gzip"
+    return name
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+@dataclass
+class ArchiveEntry:
+    """아카이브 인덱스 한 줄 (요청 1회)"""
+    url: str
+    fetched_at: str  # UTC ISO 형식 (posts.crawled_at과 같은 기준)
+    status: int
+    sha256: str
+    size: int
+    codec: str
+    encoding: Optional[str] = None
+    kind: Optional[str] = None  # 다시 파싱할 때 사용할 파서 ("dcinside_list" 등)
+    meta: Dict[str, Any] = field(default_factory=dict)  # 파서에 필요한 값 (갤러리 ID 등)
+    
+    @property
+    def fetched_datetime(self) -> datetime:
+        return datetime.fromisoformat(self.fetched_at)
+
+
+class PageArchive:
+    """내용 주소 기반 압축 HTML 아카이브"""
+    
+    def __init__(self, root: Union[str, Path], codec: str = "auto"):
+        self.root = Path(root)
+        self.codec = resolve_codec(codec)
+        self._index_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> Optional["PageArchive"]:
+        """설정값 기반 아카이브 (archive_enabled=False면 None)"""
+        settings = get_settings()
+        if not settings.archive_enabled:
+            return None
+        return cls(settings.archive_dir, settings.archive_compression)
+    
+    def object_path(self, sha256: str, codec: str) -> Path:
+        return self.root / "objects" / sha256[:2] / f"{sha256}{_EXTENSIONS[codec]}"
+    
+    def _write(self, entry: ArchiveEntry, content: bytes) -> None:
+        path = self.object_path(entry.sha256, entry.codec)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(compress(content, entry.codec))
+            tmp_path.replace(path)
+        
+        index_path = self.root / "index" / f"{entry.fetched_at[:10]}.jsonl"
+        line = json.dumps(asdict(entry), ensure_ascii=False)
+        with self._index_lock:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with index_path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    
+    async def store(self, url: str, status: int, content: bytes, encoding: Optional[str] = None,
+                    kind: Optional[str] = None, **meta) -> ArchiveEntry:
+        """
+        응답 본문 저장 (압축/파일 쓰기는 스레드에서 실행)
+        
+        Args:
+            url: 요청 URL
+            status: 응답 코드
+            content: 응답 본문 (바이트)
+            encoding: 본문 문자 인코딩
+            kind: 파서 종류
+            **meta: 파서에 필요한 추가 값
+        """
+        entry = ArchiveEntry(
+            url=url,
+            fetched_at=datetime.utcnow().isoformat(),
+            status=status,
+            sha256=hashlib.sha256(content).hexdigest(),
+            size=len(content),
+            codec=self.codec,
+            encoding=encoding,
+            kind=kind,
+            meta=meta,
+        )
+        try:
+            await asyncio.to_thread(self._write, entry, content)
+        except OSError as e:
+            logger.warning(f"아카이브 저장 실패: {url} ({e})")
+        return entry
+    
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """저장된 본문 (압축 해제)"""
+        return decompress(self.object_path(entry.sha256, entry.codec).read_bytes(), entry.codec)
+    
+    def read_text(self, entry: ArchiveEntry) -> str:
+        return self.read(entry).decode(entry.encoding or "utf-8", errors="replace")
+    
+    def iter_entries(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[ArchiveEntry]:
+        """기간 내 인덱스 항목을 시간 순서대로 반환 (until은 미포함)"""
+        index_dir = self.root / "index"
+        if not index_dir.exists():
+            return
+        
+        for index_path in sorted(index_dir.glob("*.jsonl")):
+            day = index_path.stem
+            if since and day < since.date().isoformat():
+                continue
+            if until and day > until.date().isoformat():
+                continue
+            
+            entries = []
+            with index_path.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = ArchiveEntry(**json.loads(line))
+                    except (TypeError, ValueError):
+                        logger.warning(f"아카이브 인덱스 줄을 읽지 못했습니다: {index_path}")
+                        continue
+                    fetched = entry.fetched_datetime
+                    if (since and fetched < since) or (until and fetched >= until):
+                        continue
+                    entries.append(entry)
+            
+            entries.sort(key=lambda e: e.fetched_at)
+            yield from entries
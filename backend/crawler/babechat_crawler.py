@@ -1,45 +1,203 @@
 """
 베이비챗(BabeChat) AI 캐릭터 크롤러
 
-NOTE: 베이비챗은 JavaScript로 렌더링되는 SPA라서 
-일반 HTTP 요청으로는 캐릭터 데이터를 가져올 수 없습니다.
-Playwright 등 브라우저 자동화가 필요합니다.
-현재는 빈 결과를 반환합니다.
+NOTE: 베이비챗은 JavaScript로 렌더링되는 SPA라서
+HTML 본문(DOM)에는 캐릭터 카드가 없습니다.
+1. 페이지에 함께 내려오는 Next.js 하이드레이션 JSON(__NEXT_DATA__ 등)에서 캐릭터 데이터를 읽고
+2. JSON이 없으면 babechat_use_browser 설정 시 헤드리스 브라우저 풀(crawler/browser_pool.py)로 렌더링한 DOM에서 읽음
+둘 다 안 되면 빈 결과를 반환합니다.
 """
 import asyncio
+import re
 from typing import List, Optional
-from dataclasses import dataclass
 import logging
 
+from bs4 import BeautifulSoup
+from fake_useragent import UserAgent
+
+from config import get_settings
+from crawler.browser_pool import BrowserPool, shared_or_owned_pool
+from crawler.embedded_json import CharacterFields, extract_payloads, find_characters
+from crawler.http_client import HttpClientRegistry, shared_or_owned
+from crawler.parse_pool import run_parse
+from crawler.records import CharacterData
+
 logger = logging.getLogger(__name__)
 
+# 하이드레이션 JSON의 캐릭터 객체 필드 이름
+BABECHAT_FIELDS = CharacterFields(
+    id=("characterId",),
+    name=("name",),
+    views=("chatCount", "messageCount", "viewCount"),
+    description=("description", "intro"),
+    author=("creatorName", "creator.nickname"),
+    thumbnail=("profileImageUrl", "imageUrl", "thumbnailUrl"),
+    tags=("tags", "hashtags"),
+)
 
-@dataclass
-class CharacterData:
-    """캐릭터 데이터"""
-    character_id: str
-    rank: int
-    name: str
-    author: Optional[str]
-    views: int
-    tags: Optional[List[str]]
-    description: Optional[str]
-    thumbnail_url: Optional[str]
-    character_url: Optional[str]
+# 렌더링된 랭킹 페이지의 캐릭터 카드 (브라우저는 이 선택자가 나타날 때까지만 기다림)
+RANKING_SELECTOR = "li.character-card"
+CARD_SELECTORS = {
+    "link": "a[href*='/character/']",
+    "rank": ".character-rank",
+    "name": ".character-name",
+    "description": ".character-description",
+    "author": ".character-creator",
+    "views": ".character-chat-count",
+    "tags": ".character-tags .tag",
+    "thumbnail": "img",
+}
 
 
 class BabeChatCrawler:
-    """베이비챗 AI 크롤러 (현재 미지원)"""
+    """베이비챗 AI 크롤러 (하이드레이션 JSON, 없으면 헤드리스 브라우저)"""
     BASE_URL = "https://babechat.ai"
+    RANKING_URL = f"{BASE_URL}/ranking"
     
-    def __init__(self):
-        pass
+    def __init__(self, http: Optional[HttpClientRegistry] = None, browser: Optional[BrowserPool] = None):
+        self.http = http
+        self.browser = browser
+        # 브라우저 풀이 주어지면 설정과 관계없이 사용
+        self.use_browser = browser is not None or get_settings().babechat_use_browser
+        self.ua = UserAgent()
+        self.delay = 1.5
+        self.max_retries = 3
+    
+    async def _fetch_html(self, url: str, http: HttpClientRegistry) -> Optional[str]:
+        """HTML 가져오기"""
+        headers = {
+            "User-Agent": self.ua.random,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+        }
+        
+        return await http.fetch_text(url, max_retries=self.max_retries, headers=headers, follow_redirects=True,
+                                     archive_meta={"kind": "babechat_ranking"})
     
     async def crawl_rankings(self, limit: int = 30) -> List[CharacterData]:
-        """인기 캐릭터 순위 크롤링 (현재 미지원)"""
-        logger.warning("베이비챗은 JavaScript 렌더링이 필요하여 현재 지원되지 않습니다.")
-        logger.info("베이비챗 크롤링을 건너뜁니다.")
-        return []
+        """인기 캐릭터 순위 크롤링"""
+        logger.info(f"베이비챗 크롤링 시작 (상위 {limit}개)")
+        
+        async with shared_or_owned(self.http, self.delay) as http:
+            html = await self._fetch_html(self.RANKING_URL, http)
+            if not html:
+                logger.error("HTML을 가져오지 못했습니다.")
+            characters = await run_parse(parse_rankings, html, limit) if html else []
+            
+            if not characters and self.use_browser:
+                characters = await self._crawl_rendered(limit, http)
+        
+        if not characters:
+            logger.warning("베이비챗 페이지에서 캐릭터를 찾지 못했습니다 (하이드레이션 JSON 없음, 브라우저 렌더링 필요).")
+            return []
+        
+        logger.info(f"베이비챗 크롤링 완료: {len(characters)}개 수집")
+        return characters
+    
+    async def _crawl_rendered(self, limit: int, http: HttpClientRegistry) -> List[CharacterData]:
+        """헤드리스 브라우저로 랭킹 페이지를 렌더링해서 파싱"""
+        logger.info("하이드레이션 JSON이 없어 브라우저로 렌더링합니다.")
+        try:
+            async with shared_or_owned_pool(self.browser) as browser:
+                result = await browser.render(self.RANKING_URL, RANKING_SELECTOR)
+        except Exception as e:
+            logger.error(f"베이비챗 렌더링 실패: {e}")
+            return []
+        
+        logger.info(f"베이비챗 렌더링 완료: {result.render_ms:.0f}ms")
+        if http.archive:
+            await http.archive.store(self.RANKING_URL, result.status or 200, result.html.encode("utf-8"), "utf-8",
+                                     kind="babechat_ranking", rendered=True)
+        return await run_parse(parse_rankings, result.html, limit)
+
+
+def parse_views(view_text: str) -> int:
+    """채팅 수 파싱 (예: "1.2만" -> 12000, "3,456" -> 3456)"""
+    view_text = view_text.replace(",", "").strip()
+    multiplier = 1
+    if view_text.endswith("만"):
+        view_text, multiplier = view_text[:-1], 10000
+    elif view_text.endswith("천"):
+        view_text, multiplier = view_text[:-1], 1000
+    try:
+        return int(float(view_text) * multiplier)
+    except ValueError:
+        return 0
+
+
+def parse_rankings(html: str, limit: int = 30) -> List[CharacterData]:
+    """
+    랭킹 페이지 HTML에서 캐릭터 순위 파싱 (하이드레이션 JSON 우선, 없으면 렌더링된 카드)
+    
+    Args:
+        html: 베이비챗 랭킹 페이지 HTML (원본 또는 브라우저로 렌더링한 HTML)
+        limit: 수집할 캐릭터 수
+    """
+    characters = parse_rankings_json(html, limit)
+    if characters:
+        return characters
+    return parse_rendered_cards(html, limit)
+
+
+def parse_rankings_json(html: str, limit: int = 30) -> List[CharacterData]:
+    """랭킹 페이지에 포함된 하이드레이션 JSON에서 캐릭터 순위 파싱"""
+    found = find_characters(extract_payloads(html), BABECHAT_FIELDS, limit)
+    return [
+        CharacterData(
+            character_id=item["id"],
+            rank=rank,
+            name=item["name"],
+            author=item["author"],
+            views=item["views"],
+            tags=item["tags"],
+            description=item["description"],
+            thumbnail_url=item["thumbnail"],
+            character_url=f"{BabeChatCrawler.BASE_URL}/character/{item['id']}",
+        )
+        for rank, item in enumerate(found, start=1)
+    ]
+
+
+def parse_rendered_cards(html: str, limit: int = 30) -> List[CharacterData]:
+    """브라우저로 렌더링한 랭킹 페이지의 캐릭터 카드 파싱 (원본 HTML에는 카드가 없으므로 빈 목록)"""
+    soup = BeautifulSoup(html, "html.parser")
+    characters = []
+    
+    for idx, card in enumerate(soup.select(RANKING_SELECTOR)[:limit], start=1):
+        try:
+            link = card.select_one(CARD_SELECTORS["link"])
+            if not link:
+                continue
+            match = re.search(r'/character/([^/?#]+)', link["href"])
+            name_elem = card.select_one(CARD_SELECTORS["name"])
+            if not match or not name_elem:
+                continue
+            
+            def text_of(field: str) -> Optional[str]:
+                elem = card.select_one(CARD_SELECTORS[field])
+                return elem.get_text(strip=True) if elem else None
+            
+            rank_text = text_of("rank")
+            views_text = text_of("views")
+            img = card.select_one(CARD_SELECTORS["thumbnail"])
+            tags = [tag.get_text(strip=True).lstrip("#") for tag in card.select(CARD_SELECTORS["tags"])]
+            
+            characters.append(CharacterData(
+                character_id=match.group(1),
+                rank=int(rank_text) if rank_text and rank_text.isdigit() else idx,
+                name=name_elem.get_text(strip=True),
+                author=text_of("author"),
+                views=parse_views(views_text) if views_text else 0,
+                tags=tags or None,
+                description=text_of("description"),
+                thumbnail_url=img.get("src") if img else None,
+                character_url=f"{BabeChatCrawler.BASE_URL}/character/{match.group(1)}",
+            ))
+        except Exception as e:
+            logger.error(f"베이비챗 캐릭터 파싱 오류 (카드 {idx}): {e}")
+            continue
+    
+    return characters
 
 
 # 테스트용 코드
@@ -49,5 +207,7 @@ if __name__ == "__main__":
         crawler = BabeChatCrawler()
         results = await crawler.crawl_rankings(10)
         print(f"결과: {len(results)}개")
+        for char in results:
+            print(f"#{char.rank} {char.name} - {char.views:,}회 ({char.author})")
     
     asyncio.run(test())
@@ -0,0 +1,145 @@
+"""
+게시글 본문 수집
+- 게시글 상세 페이지를 받아 본문 텍스트/이미지 수/링크 수 추출
+- 호스트별 동시 요청 수 제한 + 목록 크롤링과 같은 호스트별 속도 제한기 사용
+- 본문 파싱(parser.parse_post_content)은 parse_pool에서 실행
+- DB 조회/저장은 models.ingestion.ingest_missing_bodies에서 처리
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+from fake_useragent import UserAgent
+
+from config import get_settings
+from crawler.http_client import GONE, HttpClientRegistry, shared_or_owned
+from crawler.parse_pool import run_parse
+from crawler.parser import parse_post_content
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 본문 영역 선택자 (여기 없는 사이트는 본문을 수집하지 않음)
+BODY_SELECTORS = {
+    "gall.dcinside.com": "div.write_div",
+    "arca.live": "div.article-content",
+}
+
+
+@dataclass
+class PostBody:
+    """수집된 게시글 본문"""
+    post_id: str
+    body_text: str
+    image_count: int
+    link_count: int
+    gallery_id: Optional[str] = None  # post_id는 갤러리 안에서만 고유
+    url: Optional[str] = None  # 상세 페이지 주소 (갤러리를 모르는 예전 아카이브 재파싱 시 게시글을 찾는 데 사용)
+
+
+def empty_body() -> PostBody:
+    """다시 받아도 본문이 없는 게시글 (빈 본문으로 저장해 다음 실행에서 다시 요청하지 않음)"""
+    return PostBody(post_id="", body_text="", image_count=0, link_count=0)
+
+
+def extract_post_body(html: str, url: str) -> Optional[PostBody]:
+    """
+    상세 페이지 HTML에서 본문 추출 (parse_pool에서 실행되므로 모듈 최상위 함수)
+    
+    Returns:
+        본문 (post_id는 호출 측에서 채움), 지원하지 않는 사이트면 None
+    """
+    selector = BODY_SELECTORS.get(urlparse(url).netloc)
+    if selector is None:
+        return None
+    
+    container = BeautifulSoup(html, "html.parser").select_one(selector)
+    if container is None:
+        # 삭제/비공개 게시글 등 - 빈 본문으로 저장해 다시 받지 않음
+        return empty_body()
+    
+    content = parse_post_content(str(container))
+    return PostBody(
+        post_id="",
+        body_text=content.text,
+        image_count=len(content.images),
+        link_count=len(content.links),
+    )
+
+
+class BodyFetcher:
+    """게시글 상세 페이지 수집기"""
+    
+    def __init__(self, http: Optional[HttpClientRegistry] = None,
+                 concurrency_per_host: Optional[int] = None):
+        self.settings = get_settings()
+        self.http = http
+        self.concurrency_per_host = max(concurrency_per_host or self.settings.body_fetch_concurrency_per_host, 1)
+        self.ua = UserAgent()
+        self.delay = self.settings.crawl_delay_seconds
+        self.max_retries = 3
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    def _get_headers(self, url: str) -> Dict[str, str]:
+        parsed = urlparse(url)
+        return {
+            "User-Agent": self.ua.random,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Referer": f"{parsed.scheme}://{parsed.netloc}",
+        }
+    
+    async def _fetch_one(self, gallery_id: str, post_id: str, url: str, http: HttpClientRegistry) -> Optional[PostBody]:
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency_per_host))
+        
+        # 호스트별 동시 요청 수 제한 (요청 간격은 레지스트리의 속도 제한기가 보장)
+        async with semaphore:
+            html = await http.fetch_text(
+                url, max_retries=self.max_retries, headers=self._get_headers(url),
+                archive_meta={"kind": "post_body", "gallery_id": gallery_id, "post_id": post_id}, report_gone=True
+            )
+        if html is GONE:
+            # 삭제된 게시글 (404/410)
+            body = empty_body()
+        elif not html:
+            # 일시적인 실패 - 다음 실행에서 다시 시도
+            return None
+        else:
+            body = await run_parse(extract_post_body, html, url) or empty_body()
+        body.post_id = post_id
+        body.gallery_id = gallery_id
+        body.url = url
+        return body
+    
+    async def fetch_bodies(self, targets: List[tuple]) -> List[PostBody]:
+        """
+        게시글 본문 수집
+        
+        Args:
+            targets: [(gallery_id, post_id, url), ...]
+        
+        Returns:
+            수집한 본문 목록 (삭제된 게시글은 빈 본문, 요청에 실패한 게시글은 빠지고 다음 실행에서 다시 시도)
+        """
+        async with shared_or_owned(self.http, self.delay) as http:
+            results = await asyncio.gather(
+                *[self._fetch_one(gallery_id, post_id, url, http) for gallery_id, post_id, url in targets],
+                return_exceptions=True
+            )
+        
+        bodies = []
+        for (_, post_id, url), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"본문 수집 실패 [{post_id}] {url}: {result}")
+            elif result is not None:
+                bodies.append(result)
+        return bodies
+
+
+def supports_url(url: Optional[str]) -> bool:
+    """본문 수집을 지원하는 사이트의 게시글인지"""
+    return bool(url) and urlparse(url).netloc in BODY_SELECTORS
+
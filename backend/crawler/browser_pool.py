@@ -0,0 +1,225 @@
+"""
+헤드리스 브라우저 풀 (JavaScript로 렌더링되는 페이지용)
+- 브라우저 프로세스는 하나만 띄워 계속 사용
+- 컨텍스트+페이지 몇 개를 미리 만들어 두고 요청마다 빌려 씀 (매번 새로 만들지 않음)
+- 이미지/폰트/미디어 요청은 막아서 렌더링에 필요한 것만 받음
+- 페이지 로드 완료를 기다리지 않고 지정한 선택자가 나타나면 바로 HTML 반환
+- 페이지별 렌더링 시간 기록 (HTTP 크롤러의 fetch 지연과 비교용)
+- 프로세스 전체에서 get_browser_pool()로 하나를 공유 (API 종료 시 shutdown_browser_pool)
+- playwright 패키지 + 브라우저 설치 필요 (pip install playwright && playwright install chromium)
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import get_settings
+from crawler.http_client import route_url
+from crawler.telemetry import record_render
+
+logger = logging.getLogger(__name__)
+
+
+def _playwright_available() -> bool:
+    """브라우저 자동화 패키지(playwright) 설치 여부"""
+    try:
+        import playwright  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+@dataclass
+class RenderResult:
+    """렌더링 결과"""
+    url: str
+    html: str
+    status: Optional[int]
+    render_ms: float
+
+
+class BrowserPool:
+    """브라우저 하나 + 재사용하는 컨텍스트/페이지 풀"""
+    
+    def __init__(self, size: Optional[int] = None, headless: Optional[bool] = None,
+                 blocked_resources: Optional[List[str]] = None, timeout: Optional[float] = None,
+                 host_overrides: Optional[Dict[str, str]] = None):
+        settings = get_settings()
+        self.size = max(size or settings.browser_pool_size, 1)
+        self.headless = settings.browser_headless if headless is None else headless
+        self.blocked_resources = set(
+            settings.browser_blocked_resources if blocked_resources is None else blocked_resources
+        )
+        self.timeout = timeout or settings.browser_render_timeout_seconds
+        self.host_overrides = settings.crawl_host_overrides if host_overrides is None else host_overrides
+        
+        self._playwright = None
+        self._browser = None
+        self._contexts: List[Any] = []
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._start_lock = asyncio.Lock()
+        self._render_times: List[float] = []
+        self.blocked_requests = 0
+        self.failures = 0
+    
+    @classmethod
+    def from_settings(cls) -> "BrowserPool":
+        return cls()
+    
+    async def start(self) -> None:
+        """브라우저와 컨텍스트/페이지 풀 준비 (처음 렌더링할 때 자동 호출)"""
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            if not _playwright_available():
+                raise RuntimeError("playwright가 설치되지 않았습니다 (pip install playwright && playwright install chromium)")
+            
+            from playwright.async_api import async_playwright
+            
+            started = time.perf_counter()
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                for _ in range(self.size):
+                    context = await self._browser.new_context(locale="ko-KR")
+                    await context.route("**/*", self._block_resources)
+                    self._contexts.append(context)
+                    await self._pages.put(await context.new_page())
+            except Exception:
+                # 브라우저 미설치 등 - 다음 호출에서 처음부터 다시 시도
+                await self.aclose()
+                raise
+            logger.info(f"[브라우저] 시작: 컨텍스트 {self.size}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+    
+    async def _block_resources(self, route) -> None:
+        """이미지/폰트/미디어 등 렌더링 결과(HTML)에 필요 없는 요청 차단"""
+        if route.request.resource_type in self.blocked_resources:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _replace_page(self, page):
+        """오류가 난 페이지를 같은 컨텍스트의 새 페이지로 교체"""
+        context = page.context
+        try:
+            await page.close()
+        except Exception:
+            pass
+        return await context.new_page()
+    
+    async def render(self, url: str, wait_selector: str, timeout: Optional[float] = None) -> RenderResult:
+        """
+        페이지를 렌더링하고 wait_selector가 나타나면 HTML 반환
+        
+        Args:
+            url: 페이지 주소
+            wait_selector: 데이터가 그려졌음을 나타내는 CSS 선택자 (예: 랭킹 카드)
+            timeout: 최대 대기 시간 (초)
+        """
+        await self.start()
+        timeout_ms = (timeout or self.timeout) * 1000
+        target, host = route_url(url, self.host_overrides)
+        
+        page = await self._pages.get()
+        started = time.perf_counter()
+        try:
+            # 재지정된 호스트면 원래 호스트를 알려줌 (브라우저는 Host 헤더를 바꿀 수 없음)
+            await page.set_extra_http_headers({"X-Forwarded-Host": host} if host else {})
+            response = await page.goto(target, wait_until="commit", timeout=timeout_ms)
+            await page.wait_for_selector(wait_selector, state="attached", timeout=timeout_ms)
+            html = await page.content()
+        except Exception:
+            self.failures += 1
+            page = await self._replace_page(page)
+            raise
+        finally:
+            self._pages.put_nowait(page)
+        
+        render_ms = (time.perf_counter() - started) * 1000
+        self._render_times.append(render_ms)
+        record_render(urlparse(url).netloc, render_ms / 1000)
+        return RenderResult(url=url, html=html, status=response.status if response else None, render_ms=render_ms)
+    
+    def stats(self) -> Dict[str, float]:
+        """렌더링 시간 통계"""
+        times = self._render_times
+        return {
+            "renders": len(times),
+            "failures": self.failures,
+            "blocked_requests": self.blocked_requests,
+            "p50_ms": round(_percentile(times, 50), 1),
+            "p99_ms": round(_percentile(times, 99), 1),
+            "max_ms": round(max(times), 1) if times else 0.0,
+        }
+    
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f"[브라우저] 렌더링 {stats['renders']}회 (실패 {stats['failures']}회), "
+            f"p50 {stats['p50_ms']}ms / p99 {stats['p99_ms']}ms, 차단한 요청 {stats['blocked_requests']}개"
+        )
+    
+    async def aclose(self) -> None:
+        """컨텍스트/브라우저 종료"""
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        self._pages = asyncio.Queue()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """공유 브라우저 풀 (최초 호출 시 생성, 브라우저는 처음 렌더링할 때 실행)"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool.from_settings()
+    return _pool
+
+
+async def shutdown_browser_pool() -> None:
+    """공유 브라우저 풀 종료"""
+    global _pool
+    if _pool is not None:
+        _pool.log_stats()
+        await _pool.aclose()
+        _pool = None
+
+
+@asynccontextmanager
+async def shared_or_owned_pool(pool: Optional[BrowserPool]) -> AsyncIterator[BrowserPool]:
+    """공유 풀이 주어지면 그대로 사용하고, 없으면 임시 풀을 만들어 사용 후 닫음"""
+    if pool is not None:
+        yield pool
+        return
+    
+    async with BrowserPool.from_settings() as owned:
+        yield owned
+        owned.log_stats()
@@ -1,64 +1,81 @@
 """
 캐릭터챗 서비스 통합 크롤러
+- 서비스와 루나톡 랭킹 기간을 동시에 크롤링 (같은 호스트 요청 간격은 공유 레지스트리의 속도 제한기가 조절)
+- 결과는 서비스 -> 기간 -> 캐릭터 목록 형태 (기간 구분이 없는 서비스는 "daily")
+- 제타/루나톡은 조건부 요청 - 이전 크롤링과 같은 랭킹 페이지는 파싱하지 않음 (빈 목록이라 저장된 순위 유지)
 """
 import asyncio
-from typing import Dict, List
+from typing import Awaitable, Dict, List, Optional, Tuple
 import logging
 
-from .zeta_crawler import ZetaCrawler, CharacterData as ZetaCharacterData
-from .babechat_crawler import BabeChatCrawler, CharacterData as BabeChatCharacterData
-from .lunatalk_crawler import LunaTalkCrawler, CharacterData as LunaTalkCharacterData
+from config import get_settings
+from .browser_pool import get_browser_pool
+from .http_client import HttpClientRegistry
+from .records import CharacterData
+from .zeta_crawler import ZetaCrawler
+from .babechat_crawler import BabeChatCrawler
+from .lunatalk_crawler import LunaTalkCrawler
 
 logger = logging.getLogger(__name__)
 
+# 기간별 랭킹이 없는 서비스의 기간
+DEFAULT_PERIOD = "daily"
 
-async def crawl_all_character_services(services: List[str] = None) -> Dict[str, List]:
+
+async def crawl_all_character_services(services: List[str] = None,
+                                       periods: Optional[List[str]] = None) -> Dict[str, Dict[str, List[CharacterData]]]:
     """
-    모든 캐릭터챗 서비스 크롤링
+    모든 캐릭터챗 서비스 크롤링 (서비스/기간별로 동시에)
     
     Args:
         services: 크롤링할 서비스 목록 ['zeta', 'babechat', 'lunatalk']
                  None이면 모든 서비스 크롤링
+        periods: 루나톡 랭킹 기간 목록 (None이면 설정의 lunatalk_periods)
     
     Returns:
-        {'zeta': [CharacterData, ...], 'babechat': [CharacterData, ...], 'lunatalk': [CharacterData, ...]}
+        {'zeta': {'daily': [CharacterData, ...]}, 'lunatalk': {'daily': [...], 'weekly': [...], ...}, ...}
+        실패했거나 이전 크롤링과 같아 파싱을 생략한 서비스/기간은 빈 목록
     """
     if services is None:
         services = ['zeta', 'lunatalk']  # 기본: 제타, 루나톡
+    settings = get_settings()
+    if periods is None:
+        periods = settings.lunatalk_periods
     
-    logger.info(f"캐릭터 서비스 크롤링 시작: {services}")
-    
-    results = {}
-    
-    # 제타 크롤링
-    if 'zeta' in services:
-        try:
-            crawler = ZetaCrawler()
-            zeta_results = await crawler.crawl_rankings(30)
-            results['zeta'] = zeta_results
-            logger.info(f"zeta 크롤링 완료: {len(zeta_results)}개")
-        except Exception as e:
-            logger.error(f"zeta 크롤링 실패: {e}")
-            results['zeta'] = []
+    logger.info(f"캐릭터 서비스 크롤링 시작: {services} (루나톡 기간: {periods})")
     
-    # 루나톡 크롤링
-    if 'lunatalk' in services:
-        try:
-            crawler = LunaTalkCrawler()
-            # 일간 랭킹 크롤링
-            lunatalk_results = await crawler.crawl_rankings(30, period="daily")
-            results['lunatalk'] = lunatalk_results
-            logger.info(f"lunatalk 크롤링 완료: {len(lunatalk_results)}개")
-        except Exception as e:
-            logger.error(f"lunatalk 크롤링 실패: {e}")
-            results['lunatalk'] = []
+    results: Dict[str, Dict[str, List[CharacterData]]] = {}
     
-    # 베이비챗은 현재 미지원 (JavaScript 렌더링 필요)
-    if 'babechat' in services:
-        logger.warning("babechat은 현재 지원되지 않습니다 (JavaScript 렌더링 필요)")
-        results['babechat'] = []
+    # 서비스 크롤러들이 호스트별 연결 풀/속도 제한을 공유
+    async with HttpClientRegistry.from_settings() as http:
+        jobs: List[Tuple[str, str, Awaitable[List[CharacterData]]]] = []
+        
+        if 'zeta' in services:
+            jobs.append(('zeta', DEFAULT_PERIOD, ZetaCrawler(http=http).crawl_rankings(30, conditional=True)))
+        
+        if 'lunatalk' in services:
+            crawler = LunaTalkCrawler(http=http)
+            for period in periods:
+                jobs.append(('lunatalk', period, crawler.crawl_rankings(30, period=period, conditional=True)))
+        
+        # 베이비챗: 하이드레이션 JSON, 없으면 공유 브라우저 풀로 렌더링
+        if 'babechat' in services:
+            browser = get_browser_pool() if settings.babechat_use_browser else None
+            jobs.append(('babechat', DEFAULT_PERIOD, BabeChatCrawler(http=http, browser=browser).crawl_rankings(30)))
+        
+        outcomes = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+        
+        for (service, period, _), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"{service} ({period}) 크롤링 실패: {outcome}")
+                outcome = []
+            else:
+                logger.info(f"{service} ({period}) 크롤링 완료: {len(outcome)}개")
+            results.setdefault(service, {})[period] = outcome
+        
+        http.log_stats()
     
-    total_count = sum(len(chars) for chars in results.values())
+    total_count = sum(len(chars) for by_period in results.values() for chars in by_period.values())
     logger.info(f"전체 크롤링 완료: {total_count}개 캐릭터 수집")
     
     return results
@@ -0,0 +1,150 @@
+"""
+대상(갤러리/게시판)별 circuit breaker + 파서 상태(selector health) 집계
+- 페이지마다 결과를 기록: 정상(게시글 있음) / 요청 실패(HTML 없음, 403 차단 등) / 0행(HTML은 받았는데 파싱된 게시글 없음)
+  - 0행이 이어지면 사이트 마크업이 바뀌어 선택자가 더 이상 맞지 않는 경우가 대부분
+- 요청 실패 또는 0행이 연속으로 임계값에 닿으면 열림(open): 대기 시간 동안 해당 대상은 요청하지 않음
+- 대기 시간이 지나면 반열림(half-open): 한 페이지만 시험 요청
+  - 성공하면 닫힘(closed)으로 돌아가 크롤링 계속
+  - 실패하면 다시 열림, 대기 시간은 연속으로 열릴 때마다 2배 (상한 있음)
+- 상태/연속 횟수는 실행 사이에도 유지해야 하므로 models.breakers로 DB에 저장
+  (이 모듈은 DB를 모르고, 크롤러는 페이지 결과만 알려줌)
+"""
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 열린 이유
+FETCH_FAILED = "fetch_failed"
+NO_ROWS = "no_rows"
+
+# 파서 상태 카운터 (이번 실행의 증가분, 저장 시 누적값에 더함)
+HEALTH_COUNTERS = ("pages_fetched", "pages_failed", "pages_empty", "pages_unchanged", "rows_parsed", "runs_skipped")
+
+
+@dataclass
+class TargetBreaker:
+    """대상 하나의 circuit breaker"""
+    target_id: str
+    state: str = CLOSED
+    consecutive_failures: int = 0  # 연속 요청 실패 페이지 수
+    consecutive_empty: int = 0  # 연속 0행 페이지 수
+    trips: int = 0  # 성공 없이 연속으로 열린 횟수 (대기 시간 = 기본 대기 * 2^(trips-1))
+    opened_at: Optional[datetime] = None
+    open_until: Optional[datetime] = None  # 이 시각 이후 반열림 시험 요청
+    last_reason: Optional[str] = None
+    last_error: Optional[str] = None
+    last_success_at: Optional[datetime] = None  # 게시글이 파싱된 마지막 페이지 시각
+    health: Counter = field(default_factory=Counter)
+    changed: bool = False  # 이번 실행에서 상태가 바뀌었는지 (바뀐 것만 저장해 다른 프로세스의 상태를 덮어쓰지 않음)
+    
+    def allow(self, now: Optional[datetime] = None) -> bool:
+        """
+        요청해도 되는지 (열려 있고 대기 시간이 지났으면 반열림으로 바꾸고 True)
+        """
+        if self.state != OPEN:
+            return True
+        now = now or datetime.utcnow()
+        if self.open_until is not None and now < self.open_until:
+            return False
+        self.state = HALF_OPEN
+        self.changed = True
+        logger.info(f"[breaker] {self.target_id}: 반열림 - 시험 요청 (연속 {self.trips}회 열림)")
+        return True
+    
+    def skip(self) -> None:
+        """열려 있어 크롤링을 건너뜀"""
+        self.health["runs_skipped"] += 1
+        logger.warning(f"[breaker] {self.target_id}: 열림 ({self.last_reason}) - {self.open_until} 까지 건너뜀")
+    
+    def record_page(self, fetched: bool, rows: int, error: Optional[str] = None,
+                    now: Optional[datetime] = None) -> None:
+        """
+        페이지 하나의 결과 기록
+        
+        Args:
+            fetched: HTML을 받았는지 (재시도 후에도 실패하면 False)
+            rows: 파싱된 게시글 수
+            error: 실패 내용 (로그/API 표시용)
+        """
+        now = now or datetime.utcnow()
+        settings = get_settings()
+        self.changed = True
+        
+        if not fetched:
+            self.health["pages_failed"] += 1
+            self.consecutive_failures += 1
+            self._failed(FETCH_FAILED, error or "요청 실패", self.consecutive_failures,
+                         settings.crawl_breaker_failure_threshold, now)
+            return
+        
+        self.health["pages_fetched"] += 1
+        self.health["rows_parsed"] += rows
+        self.consecutive_failures = 0
+        if rows == 0:
+            self.health["pages_empty"] += 1
+            self.consecutive_empty += 1
+            self._failed(NO_ROWS, error or "HTML은 받았지만 파싱된 게시글 없음 (마크업 변경 의심)",
+                         self.consecutive_empty, settings.crawl_breaker_empty_threshold, now)
+            return
+        
+        self.consecutive_empty = 0
+        self.last_success_at = now
+        if self.state != CLOSED:
+            logger.info(f"[breaker] {self.target_id}: 시험 요청 성공 - 닫힘")
+        self.state = CLOSED
+        self.trips = 0
+        self.opened_at = None
+        self.open_until = None
+    
+    def record_unchanged(self) -> None:
+        """
+        이전 실행과 같아 파싱을 생략한 페이지 (페이지 캐시)
+        
+        요청은 성공했으므로 연속 요청 실패만 초기화하고, 0행/닫힘 판단은 실제로 파싱한 페이지로만 함
+        """
+        self.health["pages_unchanged"] += 1
+        if self.consecutive_failures:
+            self.consecutive_failures = 0
+            self.changed = True
+    
+    @property
+    def healthy(self) -> bool:
+        """
+        닫혀 있고 연속 실패/0행 페이지가 없음
+        
+        이때만 조건부 요청을 보냄 - 0행이 나오기 시작했거나 시험 요청 중이면 캐시와 같은 페이지도 다시 파싱해
+        마크업 변경/파서 수정 결과를 바로 확인
+        """
+        return self.state == CLOSED and not self.consecutive_failures and not self.consecutive_empty
+    
+    def _failed(self, reason: str, error: str, consecutive: int, threshold: int, now: datetime) -> None:
+        self.last_reason = reason
+        self.last_error = error[:2000]
+        # 반열림 시험 요청은 한 번만 실패해도 다시 열림 (이미 열려 있으면 대기 시간을 늘리지 않음)
+        if self.state == HALF_OPEN or (self.state == CLOSED and consecutive >= max(threshold, 1)):
+            self._trip(now)
+    
+    def _trip(self, now: datetime) -> None:
+        settings = get_settings()
+        self.trips += 1
+        wait = min(settings.crawl_breaker_open_seconds * 2 ** (self.trips - 1), settings.crawl_breaker_max_open_seconds)
+        self.state = OPEN
+        self.opened_at = now
+        self.open_until = now + timedelta(seconds=wait)
+        logger.error(f"[breaker] {self.target_id}: 열림 ({self.last_reason}: {self.last_error}) - "
+                     f"{wait / 60:.0f}분 동안 요청 중단 (연속 {self.trips}회)")
+    
+    @property
+    def probing(self) -> bool:
+        """반열림 상태 (시험 요청 중이라 다음 페이지를 미리 요청하지 않음)"""
+        return self.state == HALF_OPEN
@@ -3,241 +3,349 @@
 - Rate limiting 적용
 - 에러 핸들링 및 재시도 로직
 - robots.txt 준수
+- 목록 소스: "desktop"(gall.dcinside.com) 또는 "mobile"(m.dcinside.com, 광고/스크립트가 적어 응답이 가볍고 파싱이 빠름)
+  - 두 소스 모두 같은 CrawledPost 필드를 만듦 (URL은 데스크톱 게시글 주소로 통일)
+  - 모바일 목록은 오늘 이전 게시글의 작성 시각이 날짜 단위("10.16")로만 표시됨
 """
 import asyncio
+import functools
 import re
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
 import logging
 
-import httpx
-from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 
 from config import get_settings
+from crawler.circuit_breaker import TargetBreaker
+from crawler.http_client import HttpClientRegistry, shared_or_owned
+from crawler.page_cache import Unchanged
+from crawler.page_locator import PageLocation, locate_page
+from crawler.page_pipeline import iter_pages
+from crawler.parse_pool import run_parse
+from crawler.records import CrawledPost
+from crawler import list_parser
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class CrawledPost:
-    """크롤링된 게시글 데이터"""
-    post_id: str
-    gallery_id: str
-    title: str
-    author: Optional[str]
-    created_at: Optional[datetime]
-    view_count: int
-    recommend_count: int
-    comment_count: int
-    url: str
-
-
 class DCInsideCrawler:
     """디시인사이드 갤러리 크롤러 (일반 + 마이너)"""
     
     BASE_URL = "https://gall.dcinside.com"
     GALLERY_LIST_URL = "{base}/board/lists?id={gallery_id}&page={page}"
     MINOR_GALLERY_LIST_URL = "{base}/mgallery/board/lists/?id={gallery_id}&page={page}"
+    MOBILE_BASE_URL = "https://m.dcinside.com"
+    MOBILE_LIST_URL = "{base}/board/{gallery_id}?page={page}"  # 일반/마이너 갤러리 공통
+    MOBILE_USER_AGENT = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 "
+                         "(KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1")
+    SOURCES = ("desktop", "mobile")
     
-    def __init__(self, gallery_id: str = None, is_minor: bool = False):
+    def __init__(self, gallery_id: str = None, is_minor: bool = False,
+                 http: Optional[HttpClientRegistry] = None, source: Optional[str] = None):
         self.settings = get_settings()
         self.gallery_id = gallery_id
         self.is_minor = is_minor
+        self.source = source or self.settings.dcinside_list_source
+        if self.source not in self.SOURCES:
+            raise ValueError(f"지원하지 않는 목록 소스: {self.source} (사용 가능: {', '.join(self.SOURCES)})")
+        self.http = http
         self.ua = UserAgent()
         self.delay = self.settings.crawl_delay_seconds
         self.max_retries = 3
-        
+    
+    @property
+    def is_mobile(self) -> bool:
+        return self.source == "mobile"
+    
     def _get_headers(self) -> Dict[str, str]:
-        """요청 헤더 생성"""
+        """요청 헤더 생성 (모바일 소스는 모바일 User-Agent로 요청해야 모바일 페이지를 받음)"""
         return {
-            "User-Agent": self.ua.random,
+            "User-Agent": self.MOBILE_USER_AGENT if self.is_mobile else self.ua.random,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
             "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
-            "Referer": self.BASE_URL,
+            "Referer": self.MOBILE_BASE_URL if self.is_mobile else self.BASE_URL,
         }
     
-    async def _fetch_page(self, url: str, client: httpx.AsyncClient) -> Optional[str]:
-        """페이지 HTML 가져오기 (재시도 로직 포함)"""
-        for attempt in range(self.max_retries):
-            try:
-                response = await client.get(url, headers=self._get_headers(), timeout=30.0)
-                response.raise_for_status()
-                return response.text
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"HTTP 에러 {e.response.status_code}: {url} (시도 {attempt + 1}/{self.max_retries})")
-                if e.response.status_code == 403:
-                    logger.error("접근이 차단되었습니다. 크롤링 속도를 줄이거나 잠시 후 다시 시도하세요.")
-                    return None
-                await asyncio.sleep(self.delay * (attempt + 1))
-            except httpx.RequestError as e:
-                logger.warning(f"요청 에러: {e} (시도 {attempt + 1}/{self.max_retries})")
-                await asyncio.sleep(self.delay * (attempt + 1))
-        return None
+    async def _fetch_page(self, url: str, http: HttpClientRegistry,
+                          conditional: bool = False) -> Union[str, Unchanged, None]:
+        """
+        페이지 HTML 가져오기 (재시도/차단 시 속도 조절은 레지스트리에서 처리)
+        
+        conditional이면 페이지 캐시로 조건부 요청 (바뀌지 않았으면 UNCHANGED)
+        """
+        if self.is_mobile:
+            archive_meta = {"kind": "dcinside_mobile_list", "gallery_id": self.gallery_id, "is_minor": self.is_minor}
+        else:
+            archive_meta = {"kind": "dcinside_list", "gallery_id": self.gallery_id}
+        return await http.fetch_text(
+            url, max_retries=self.max_retries, headers=self._get_headers(), archive_meta=archive_meta,
+            conditional=conditional
+        )
+    
+    
+    def _list_url(self, page: int) -> str:
+        """목록 페이지 URL (마이너갤러리와 일반 갤러리 URL 구분, 모바일은 공통)"""
+        if self.is_mobile:
+            return self.MOBILE_LIST_URL.format(base=self.MOBILE_BASE_URL, gallery_id=self.gallery_id, page=page)
+        url_template = self.MINOR_GALLERY_LIST_URL if self.is_minor else self.GALLERY_LIST_URL
+        return url_template.format(base=self.BASE_URL, gallery_id=self.gallery_id, page=page)
+    
+    def _list_parser(self):
+        """목록 소스에 맞는 파서 (run_parse로 프로세스 풀에 넘길 수 있도록 모듈 함수의 partial)"""
+        if self.is_mobile:
+            return functools.partial(parse_mobile_post_list, gallery_id=self.gallery_id, is_minor=self.is_minor)
+        return functools.partial(parse_post_list, gallery_id=self.gallery_id)
     
     def _parse_post_list(self, html: str) -> List[CrawledPost]:
         """게시글 목록 HTML 파싱"""
-        posts = []
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # 게시글 목록 찾기
-        post_rows = soup.select("tr.ub-content")
-        logger.debug(f"HTML에서 {len(post_rows)}개 행 발견")
-        
-        skipped = {"no_num": 0, "non_digit": 0, "no_title": 0, "success": 0, "error": 0}
-        
-        for idx, row in enumerate(post_rows, 1):
-            try:
-                # 주의: "us-post"는 일반 게시글입니다 (공지사항이 아님!)
-                
-                # 게시글 번호
-                post_num_elem = row.select_one("td.gall_num")
-                if not post_num_elem:
-                    skipped["no_num"] += 1
-                    continue
-                    
-                post_id = post_num_elem.get_text(strip=True)
-                
-                # 숫자가 아닌 경우 (공지, 설문 등) 스킵
-                if not post_id.isdigit():
-                    skipped["non_digit"] += 1
-                    continue
-                
-                # 제목
-                title_elem = row.select_one("td.gall_tit a")
-                if not title_elem:
-                    skipped["no_title"] += 1
-                    continue
-                title = title_elem.get_text(strip=True)
-                
-                # URL
-                href = title_elem.get("href", "")
-                url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
-                
-                # 작성자
-                author_elem = row.select_one("td.gall_writer")
-                author = None
-                if author_elem:
-                    nick_elem = author_elem.select_one("span.nickname, em")
-                    if nick_elem:
-                        author = nick_elem.get_text(strip=True)
-                
-                # 작성일
-                date_elem = row.select_one("td.gall_date")
-                created_at = None
-                if date_elem:
-                    date_str = date_elem.get("title", "") or date_elem.get_text(strip=True)
-                    created_at = self._parse_date(date_str)
-                
-                # 조회수
-                view_elem = row.select_one("td.gall_count")
-                view_count = 0
-                if view_elem:
-                    view_text = view_elem.get_text(strip=True)
-                    if view_text.isdigit():
-                        view_count = int(view_text)
-                
-                # 추천수
-                recommend_elem = row.select_one("td.gall_recommend")
-                recommend_count = 0
-                if recommend_elem:
-                    recommend_text = recommend_elem.get_text(strip=True)
-                    if recommend_text.isdigit():
-                        recommend_count = int(recommend_text)
-                
-                # 댓글 수
-                comment_count = 0
-                comment_elem = row.select_one("td.gall_tit span.reply_num")
-                if comment_elem:
-                    comment_text = comment_elem.get_text(strip=True)
-                    comment_match = re.search(r"\d+", comment_text)
-                    if comment_match:
-                        comment_count = int(comment_match.group())
-                
-                posts.append(CrawledPost(
-                    post_id=post_id,
-                    gallery_id=self.gallery_id,
-                    title=title,
-                    author=author,
-                    created_at=created_at,
-                    view_count=view_count,
-                    recommend_count=recommend_count,
-                    comment_count=comment_count,
-                    url=url
-                ))
-                skipped["success"] += 1
-                
-            except Exception as e:
-                skipped["error"] += 1
-                logger.warning(f"게시글 파싱 에러: {e}")
-                continue
-        
-        logger.debug(f"파싱 결과 - 성공: {skipped['success']}, 스킵: {skipped['non_digit'] + skipped['no_title']}")
-        return posts
+        return self._list_parser()(html)
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """날짜 문자열 파싱"""
-        if not date_str:
-            return None
+        return parse_date(date_str)
+    
+    async def iter_gallery(self, pages: int = None,
+                           last_seen_id: Optional[int] = None, start_page: int = 1,
+                           breaker: Optional[TargetBreaker] = None) -> AsyncIterator[List[CrawledPost]]:
+        """
+        갤러리 크롤링 (페이지마다 게시글 목록을 yield)
         
-        try:
-            # "2024-01-15 12:30:45" 형식
-            if "-" in date_str and ":" in date_str:
-                return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            # "01-15" 또는 "01.15" 형식 (올해로 가정)
-            elif re.match(r"\d{2}[.-]\d{2}", date_str):
-                month_day = date_str.replace(".", "-")
-                return datetime.strptime(f"{datetime.now().year}-{month_day}", "%Y-%m-%d")
-            # "12:30" 형식 (오늘로 가정)
-            elif re.match(r"\d{2}:\d{2}", date_str):
-                today = datetime.now().strftime("%Y-%m-%d")
-                return datetime.strptime(f"{today} {date_str}", "%Y-%m-%d %H:%M")
-        except ValueError:
-            pass
+        Args:
+            pages: 크롤링할 페이지 수
+            last_seen_id: 이미 저장된 가장 큰 게시글 번호 (high-water mark)
+                          주어지면 이미 본 게시글만 나오는 페이지에서 중단하고,
+                          새 글만 계속 나오면 pages를 넘어 max_pages_incremental까지 탐색
+            start_page: 첫 페이지 번호 (pages는 마지막 페이지 번호)
+            breaker: 대상의 circuit breaker (페이지 결과를 기록하고, 열리면 중단)
         
-        return None
-    
-    async def crawl_gallery(self, pages: int = None) -> List[CrawledPost]:
-        """갤러리 크롤링"""
+        breaker가 정상(healthy)일 때만 조건부 요청 - 이전 실행과 같은 페이지는 파싱하지 않고 빈 UnchangedPage
+        """
         pages = pages or self.settings.max_pages_per_crawl
-        all_posts = []
+        max_pages = max(pages, self.settings.max_pages_incremental)
         
         gallery_type = "마이너갤" if self.is_minor else "일반갤"
-        logger.info(f"크롤링 시작: 갤러리={self.gallery_id} ({gallery_type}), 페이지 수={pages}")
+        logger.info(f"크롤링 시작: 갤러리={self.gallery_id} ({gallery_type}, {self.source}), 페이지 수={pages}, 마지막 게시글={last_seen_id}")
         
-        async with httpx.AsyncClient() as client:
-            for page in range(1, pages + 1):
-                # 마이너갤러리와 일반 갤러리 URL 구분
-                url_template = self.MINOR_GALLERY_LIST_URL if self.is_minor else self.GALLERY_LIST_URL
-                url = url_template.format(
-                    base=self.BASE_URL,
-                    gallery_id=self.gallery_id,
-                    page=page
-                )
-                
+        async with shared_or_owned(self.http, self.delay) as http:
+            async def fetch(page: int) -> Union[str, Unchanged, None]:
                 logger.info(f"페이지 {page}/{pages} 크롤링 중...")
-                html = await self._fetch_page(url, client)
-                
-                if html:
-                    posts = self._parse_post_list(html)
-                    all_posts.extend(posts)
-                    logger.info(f"페이지 {page}에서 {len(posts)}개 게시글 수집")
-                else:
-                    logger.warning(f"페이지 {page} 크롤링 실패")
-                
-                # Rate limiting
-                if page < pages:
-                    await asyncio.sleep(self.delay)
+                conditional = breaker is None or breaker.healthy
+                return await self._fetch_page(self._list_url(page), http, conditional)
+            
+            total = 0
+            page = 0
+            parse = self._list_parser()
+            async for page, posts in iter_pages(fetch, parse, pages, max_pages, last_seen_id, start_page, breaker):
+                total += len(posts)
+                yield posts
         
-        logger.info(f"크롤링 완료: 총 {len(all_posts)}개 게시글 수집")
+        logger.info(f"크롤링 완료: {page}페이지, 총 {total}개 게시글 수집")
+    
+    async def locate_page(self, target_date: Optional[datetime] = None, target_post_id: Optional[int] = None,
+                          max_page: Optional[int] = None, hint: int = 1) -> PageLocation:
+        """
+        목표 날짜/게시글 번호가 있는 목록 페이지 찾기 (앞에서부터 넘기지 않고 O(log n)번 요청)
+        
+        Args:
+            target_date: 목표 작성 시각 (target_post_id와 둘 중 하나)
+            target_post_id: 목표 게시글 번호
+            max_page: 탐색할 최대 페이지 (None이면 backfill_max_pages)
+            hint: 탐색 시작 페이지
+        """
+        parse = self._list_parser()
+        async with shared_or_owned(self.http, self.delay) as http:
+            async def fetch_posts(page: int) -> List[CrawledPost]:
+                html = await self._fetch_page(self._list_url(page), http)
+                return await run_parse(parse, html) if html else []
+            
+            return await locate_page(fetch_posts, target_date, target_post_id,
+                                     max_page or self.settings.backfill_max_pages, hint)
+    
+    async def crawl_gallery(self, pages: int = None, last_seen_id: Optional[int] = None) -> List[CrawledPost]:
+        """
+        갤러리 크롤링 (전체 결과를 모아서 반환)
+        
+        Args:
+            pages: 크롤링할 페이지 수
+            last_seen_id: 이미 저장된 가장 큰 게시글 번호 (high-water mark)
+        """
+        all_posts = []
+        async for posts in self.iter_gallery(pages, last_seen_id):
+            all_posts.extend(posts)
         return all_posts
 
 
+def parse_date(date_str: str) -> Optional[datetime]:
+    """날짜 문자열 파싱"""
+    if not date_str:
+        return None
+    
+    try:
+        # "2024-01-15 12:30:45" 형식
+        if "-" in date_str and ":" in date_str:
+            return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+        # "01-15" 또는 "01.15" 형식 (올해로 가정)
+        elif re.match(r"\d{2}[.-]\d{2}", date_str):
+            month_day = date_str.replace(".", "-")
+            return datetime.strptime(f"{datetime.now().year}-{month_day}", "%Y-%m-%d")
+        # "12:30" 형식 (오늘로 가정)
+        elif re.match(r"\d{2}:\d{2}", date_str):
+            today = datetime.now().strftime("%Y-%m-%d")
+            return datetime.strptime(f"{today} {date_str}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        pass
+    
+    return None
+
+
+def parse_post_list(html: str, gallery_id: str, backend: Optional[str] = None) -> List[CrawledPost]:
+    """
+    게시글 목록 HTML 파싱
+    
+    Args:
+        html: 목록 페이지 HTML
+        gallery_id: 갤러리 ID
+        backend: 파서 백엔드 ("lxml", "soup", "auto" / None이면 설정값)
+    """
+    posts = []
+    
+    # 게시글 목록 찾기
+    post_rows = list_parser.dcinside_rows(html, backend)
+    logger.debug(f"HTML에서 {len(post_rows)}개 행 발견")
+    
+    skipped = {"no_num": 0, "non_digit": 0, "no_title": 0, "success": 0, "error": 0}
+    
+    for row in post_rows:
+        try:
+            # 주의: "us-post"는 일반 게시글입니다 (공지사항이 아님!)
+            
+            # 게시글 번호
+            post_id = row["num"]
+            if post_id is None:
+                skipped["no_num"] += 1
+                continue
+            
+            # 숫자가 아닌 경우 (공지, 설문 등) 스킵
+            if not post_id.isdigit():
+                skipped["non_digit"] += 1
+                continue
+            
+            # 제목
+            title = row["title"]
+            if not title:
+                skipped["no_title"] += 1
+                continue
+            
+            # URL
+            href = row["href"]
+            url = f"{DCInsideCrawler.BASE_URL}{href}" if href.startswith("/") else href
+            
+            # 조회수
+            view_text = row["view"] or ""
+            view_count = int(view_text) if view_text.isdigit() else 0
+            
+            # 추천수
+            recommend_text = row["recommend"] or ""
+            recommend_count = int(recommend_text) if recommend_text.isdigit() else 0
+            
+            # 댓글 수
+            comment_count = 0
+            if row["comment"]:
+                comment_match = re.search(r"\d+", row["comment"])
+                if comment_match:
+                    comment_count = int(comment_match.group())
+            
+            posts.append(CrawledPost(
+                post_id=post_id,
+                gallery_id=gallery_id,
+                title=title,
+                author=row["author"] or None,
+                created_at=parse_date(row["date"]),
+                view_count=view_count,
+                recommend_count=recommend_count,
+                comment_count=comment_count,
+                url=url
+            ))
+            skipped["success"] += 1
+        
+        except Exception as e:
+            skipped["error"] += 1
+            logger.warning(f"게시글 파싱 에러: {e}")
+            continue
+    
+    logger.debug(f"파싱 결과 - 성공: {skipped['success']}, 스킵: {skipped['non_digit'] + skipped['no_title']}")
+    return posts
+
+
+def _count(text: Optional[str]) -> int:
+    """"조회 1507", "추천2", "[12]" 같은 문자열의 숫자 (없으면 0)"""
+    match = re.search(r"\d+", text or "")
+    return int(match.group()) if match else 0
+
+
+def parse_mobile_date(date_str: str) -> Optional[datetime]:
+    """모바일 목록 날짜 파싱 ("25.03.02"는 연.월.일, 나머지는 parse_date와 같음)"""
+    if date_str and re.fullmatch(r"\d{2}\.\d{2}\.\d{2}", date_str):
+        try:
+            return datetime.strptime(date_str, "%y.%m.%d")
+        except ValueError:
+            return None
+    return parse_date(date_str)
+
+
+def parse_mobile_post_list(html: str, gallery_id: str, backend: Optional[str] = None,
+                           is_minor: bool = True) -> List[CrawledPost]:
+    """
+    모바일 게시글 목록 HTML(m.dcinside.com) 파싱 (parse_post_list와 같은 필드)
+    
+    Args:
+        html: 모바일 목록 페이지 HTML
+        gallery_id: 갤러리 ID
+        backend: 파서 백엔드 ("lxml", "soup", "auto" / None이면 설정값)
+        is_minor: 마이너갤러리 여부 (데스크톱 게시글 URL을 만들 때 사용)
+    """
+    posts = []
+    view_path = "/mgallery/board/view/" if is_minor else "/board/view/"
+    
+    for row in list_parser.dcinside_mobile_rows(html, backend):
+        try:
+            if row["notice"] or not row["href"] or not row["title"]:
+                continue
+            
+            # 게시글 번호: https://m.dcinside.com/board/{갤러리}/{번호}?page=1
+            match = re.search(r"/board/[^/?#]+/(\d+)", row["href"])
+            if not match:
+                continue
+            post_id = match.group(1)
+            page_match = re.search(r"[?&]page=(\d+)", row["href"])
+            page_param = f"&page={page_match.group(1)}" if page_match else ""
+            
+            # 유동 닉네임은 "닉네임(1.2)"로 표시됨 -> 데스크톱 목록처럼 닉네임만
+            author = re.sub(r"\(\d{1,3}\.\d{1,3}\)$", "", row["author"] or "").strip()
+            
+            posts.append(CrawledPost(
+                post_id=post_id,
+                gallery_id=gallery_id,
+                title=row["title"],
+                author=author or None,
+                created_at=parse_mobile_date(row["date"]),
+                view_count=_count(row["view"]),
+                recommend_count=_count(row["recommend"]),
+                comment_count=_count(row["comment"]),
+                url=f"{DCInsideCrawler.BASE_URL}{view_path}?id={gallery_id}&no={post_id}{page_param}",
+            ))
+        except Exception as e:
+            logger.warning(f"모바일 게시글 파싱 에러: {e}")
+            continue
+    
+    return posts
+
+
 async def run_crawler(gallery_id: str = None, pages: int = None) -> List[CrawledPost]:
     """크롤러 실행 헬퍼 함수"""
     crawler = DCInsideCrawler(gallery_id)
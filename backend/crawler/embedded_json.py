@@ -0,0 +1,174 @@
+"""
+페이지에 포함된 하이드레이션 JSON 추출
+- SPA 형태 서비스는 화면에 그릴 데이터를 HTML 안의 스크립트(JSON)로 함께 내려줌
+  - Next.js Pages Router: <script id="__NEXT_DATA__" type="application/json">
+  - Next.js App Router: self.__next_f.push([1, "..."]) (RSC flight 데이터)
+- DOM을 만들지 않고 정규식 + json.loads만 사용하므로 DOM 탐색보다 훨씬 가벼움
+- 서비스별 필드 이름 후보(CharacterFields)로 캐릭터 객체를 찾아 공통 형식으로 변환
+"""
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+)
+NEXT_FLIGHT_RE = re.compile(r'self\.__next_f\.push\(\[1,\s*("(?:[^"\\]|\\.)*")\]\)')
+# flight 데이터 한 줄: "{16진수 ID}:{JSON}"
+FLIGHT_LINE_RE = re.compile(r'^[0-9a-f]+:(?=[\[{])')
+
+
+def extract_next_data(html: str) -> Optional[Any]:
+    """__NEXT_DATA__ 스크립트의 JSON (없거나 깨졌으면 None)"""
+    match = NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError as e:
+        logger.warning(f"__NEXT_DATA__ JSON 파싱 실패: {e}")
+        return None
+
+
+def extract_flight_payloads(html: str) -> List[Any]:
+    """App Router flight 데이터에 들어 있는 JSON 값들 (문서 순서)"""
+    chunks = []
+    for match in NEXT_FLIGHT_RE.finditer(html):
+        try:
+            chunks.append(json.loads(match.group(1)))
+        except ValueError:
+            continue
+    if not chunks:
+        return []
+    
+    payloads = []
+    for line in "".join(chunks).splitlines():
+        prefix = FLIGHT_LINE_RE.match(line)
+        if not prefix:
+            continue
+        try:
+            payloads.append(json.loads(line[prefix.end():]))
+        except ValueError:
+            continue
+    return payloads
+
+
+def extract_payloads(html: str) -> List[Any]:
+    """페이지의 하이드레이션 JSON 전부 (__NEXT_DATA__ 먼저, 그 다음 flight 데이터)"""
+    payloads = []
+    next_data = extract_next_data(html)
+    if next_data is not None:
+        payloads.append(next_data)
+    payloads.extend(extract_flight_payloads(html))
+    return payloads
+
+
+def iter_objects(value: Any) -> Iterator[Dict[str, Any]]:
+    """중첩된 JSON 안의 모든 객체(dict)를 문서 순서대로 (깊이 우선)"""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def _get_path(obj: Dict[str, Any], path: str) -> Any:
+    """점으로 구분된 경로 값 ("creator.nickname")"""
+    value: Any = obj
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _first(obj: Dict[str, Any], paths: Tuple[str, ...]) -> Any:
+    for path in paths:
+        value = _get_path(obj, path)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value.replace(",", "")))
+        except ValueError:
+            return None
+    return None
+
+
+def _to_tags(value: Any) -> Optional[List[str]]:
+    """태그 목록 (문자열 또는 {"name": ...} 객체 목록, 앞의 '#' 제거)"""
+    if not isinstance(value, list):
+        return None
+    tags = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("tag")
+        if isinstance(item, str) and item.strip().lstrip("#"):
+            tags.append(item.strip().lstrip("#"))
+    return tags or None
+
+
+@dataclass(frozen=True)
+class CharacterFields:
+    """서비스별 캐릭터 객체의 필드 이름 후보 (앞에서부터 시도, "a.b" 형식의 경로 가능)"""
+    id: Tuple[str, ...]
+    name: Tuple[str, ...]
+    views: Tuple[str, ...]
+    description: Tuple[str, ...] = ()
+    author: Tuple[str, ...] = ()
+    thumbnail: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+
+
+def find_characters(payloads: List[Any], fields: CharacterFields, limit: int) -> List[Dict[str, Any]]:
+    """
+    JSON에서 캐릭터 객체를 찾아 공통 형식으로 변환
+    
+    ID/이름/조회수가 모두 있는 객체만 캐릭터로 보고, 문서 순서대로 ID 기준 중복 제거
+    (화면의 카드 순서 = JSON 배열 순서)
+    
+    Returns:
+        [{"id", "name", "views", "description", "author", "thumbnail", "tags"}, ...]
+    """
+    characters = []
+    seen_ids = set()
+    for payload in payloads:
+        for obj in iter_objects(payload):
+            if len(characters) >= limit:
+                return characters
+            
+            char_id = _first(obj, fields.id)
+            name = _first(obj, fields.name)
+            views = _to_int(_first(obj, fields.views))
+            if char_id is None or not isinstance(name, str) or views is None:
+                continue
+            char_id = str(char_id)
+            if char_id in seen_ids:
+                continue
+            seen_ids.add(char_id)
+            
+            characters.append({
+                "id": char_id,
+                "name": name.strip(),
+                "views": views,
+                "description": _first(obj, fields.description),
+                "author": _first(obj, fields.author),
+                "thumbnail": _first(obj, fields.thumbnail),
+                "tags": _to_tags(_first(obj, fields.tags)),
+            })
+    return characters
@@ -0,0 +1,278 @@
+"""
+크롤러 공용 HTTP 클라이언트 레지스트리
+- 호스트별 keep-alive 연결 풀 (요청마다 TCP/TLS 핸드셰이크를 반복하지 않음)
+- 서버가 지원하면 HTTP/2 사용 (h2 패키지 필요)
+- 공통 타임아웃/연결 한도 및 호스트별 적응형 요청 속도 제한 (응답 결과를 제한기에 반영)
+- 연결 재사용 통계 수집
+- 받은 페이지를 원본 HTML 아카이브에 저장 (archive_enabled)
+- 호스트별 요청 주소 재지정 (crawl_host_overrides - 로컬 모의 사이트로 벤치마크할 때 사용)
+- 요청마다 지연 시간/응답 코드/바이트, 재시도 횟수를 계측 모듈(crawler/telemetry.py)에 기록
+- 조건부 요청 (page_cache - ETag/Last-Modified/본문 해시로 바뀌지 않은 페이지를 알려줌)
+"""
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Any, AsyncIterator, Tuple, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from config import get_settings
+from crawler.archive import PageArchive
+from crawler.page_cache import UNCHANGED, PageCache, PageText, Unchanged
+from crawler.rate_limiter import HostRateLimiter, is_backoff_status
+from crawler.telemetry import record_request, record_retry
+
+logger = logging.getLogger(__name__)
+
+# 페이지가 없어졌다는 응답 (삭제된 게시글 등 - 다시 요청해도 소용없음)
+GONE_STATUSES = (404, 410)
+
+
+class Gone:
+    """fetch_text(report_gone=True) 결과: 페이지가 삭제됨 (False로 평가되어 실패와 같이 처리해도 됨)"""
+    
+    def __bool__(self) -> bool:
+        return False
+    
+    def __repr__(self) -> str:
+        return "GONE"
+
+
+GONE = Gone()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 지원 패키지(h2) 설치 여부"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class ConnectionStats:
+    """호스트별 연결 통계"""
+    requests: int = 0
+    new_connections: int = 0
+    tls_handshakes: int = 0
+    http2_requests: int = 0
+    
+    @property
+    def reused_connections(self) -> int:
+        """새 연결 없이 기존 연결로 처리된 요청 수"""
+        return max(self.requests - self.new_connections, 0)
+    
+    def to_dict(self) -> Dict[str, int]:
+        data = asdict(self)
+        data["reused_connections"] = self.reused_connections
+        return data
+
+
+def route_url(url: str, overrides: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    """
+    crawl_host_overrides 적용
+    
+    Returns:
+        (실제 요청할 주소, 원래 호스트 - 재지정되지 않았으면 None)
+    """
+    parsed = urlparse(url)
+    origin = overrides.get(parsed.netloc)
+    if not origin:
+        return url, None
+    
+    target = origin.rstrip("/") + (parsed.path or "/")
+    if parsed.query:
+        target += f"?{parsed.query}"
+    return target, parsed.netloc
+
+
+class HttpClientRegistry:
+    """호스트별 httpx.AsyncClient를 재사용하는 레지스트리"""
+    
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None, archive: Optional[PageArchive] = None,
+                 host_overrides: Optional[Dict[str, str]] = None, page_cache: Optional[PageCache] = None):
+        self.settings = get_settings()
+        self.rate_limiter = rate_limiter
+        self.archive = archive
+        self.page_cache = page_cache
+        self.host_overrides = host_overrides if host_overrides is not None else self.settings.crawl_host_overrides
+        self.http2 = _http2_available()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, ConnectionStats] = {}
+        
+        self.timeout = httpx.Timeout(
+            self.settings.http_timeout_seconds,
+            connect=self.settings.http_connect_timeout_seconds,
+        )
+        self.limits = httpx.Limits(
+            max_connections=self.settings.http_max_connections_per_host,
+            max_keepalive_connections=self.settings.http_max_keepalive_per_host,
+            keepalive_expiry=self.settings.http_keepalive_expiry_seconds,
+        )
+    
+    @classmethod
+    def from_settings(cls, delay: Optional[float] = None) -> "HttpClientRegistry":
+        """설정값 기반 레지스트리 (적응형 속도 제한기 + 원본 HTML 아카이브 + 페이지 캐시)"""
+        return cls(rate_limiter=HostRateLimiter.from_settings(delay), archive=PageArchive.from_settings(),
+                   page_cache=PageCache.from_settings())
+    
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """URL의 호스트(origin)에 해당하는 클라이언트 반환 (없으면 생성)"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=self.limits,
+            )
+            self._clients[origin] = client
+        return client
+    
+    def _make_trace(self, stats: ConnectionStats):
+        """httpcore trace 콜백: 새 TCP 연결/TLS 핸드셰이크 횟수 집계"""
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+        return trace
+    
+    def _route(self, url: str, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """재지정된 호스트면 요청 주소를 바꾸고 Host 헤더에 원래 호스트를 넣음"""
+        target, host = route_url(url, self.host_overrides)
+        if host is None:
+            return url, kwargs
+        headers = dict(kwargs.get("headers") or {})
+        headers["Host"] = host
+        return target, {**kwargs, "headers": headers}
+    
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """호스트별 요청 속도를 지켜 GET 요청 (응답 코드/Retry-After는 속도 제한기에 반영)"""
+        host = urlparse(url).netloc
+        stats = self._stats.setdefault(host, ConnectionStats())
+        
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(url)
+        
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = self._make_trace(stats)
+        request_url, kwargs = self._route(url, kwargs)
+        
+        started = time.perf_counter()
+        try:
+            response = await self.client_for(url).get(request_url, extensions=extensions, **kwargs)
+        except httpx.RequestError:
+            record_request(host, None, time.perf_counter() - started, 0)
+            if self.rate_limiter:
+                self.rate_limiter.record(url, None)
+            raise
+        
+        record_request(host, response.status_code, time.perf_counter() - started, len(response.content))
+        if self.rate_limiter:
+            self.rate_limiter.record(url, response.status_code, response.headers.get("Retry-After"))
+        stats.requests += 1
+        if response.http_version == "HTTP/2":
+            stats.http2_requests += 1
+        return response
+    
+    async def fetch_text(self, url: str, max_retries: int = 3,
+                         archive_meta: Optional[Dict[str, Any]] = None, conditional: bool = False,
+                         report_gone: bool = False, **kwargs) -> Union[str, Unchanged, Gone, None]:
+        """
+        GET 요청 후 본문 반환 (재시도 포함, 실패 시 None)
+        
+        재시도 간 대기는 속도 제한기가 담당 (403/429/5xx/연결 오류 시 속도를 줄이고 Retry-After 준수)
+        404 등 재시도해도 소용없는 응답은 바로 포기
+        
+        Args:
+            archive_meta: 아카이브에 함께 기록할 값 ({"kind": 파서 종류, ...} - reparse에서 사용)
+            conditional: 페이지 캐시로 조건부 요청 (304 응답이거나 본문이 이전과 같으면 UNCHANGED 반환,
+                         호출 측은 UNCHANGED를 먼저 확인해야 함, 바뀐 페이지는 PageText로 반환하며
+                         저장을 마친 뒤 확정해야 캐시에 반영 - page_cache.confirm_pages)
+            report_gone: 404/410 응답이면 None 대신 GONE 반환 (일시적인 실패와 구분해야 할 때)
+        """
+        cache = self.page_cache if conditional else None
+        entry = cache.lookup(url) if cache else None
+        if entry:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **cache.conditional_headers(entry)}
+        
+        for attempt in range(max_retries):
+            if attempt:
+                record_retry(urlparse(url).netloc)
+            try:
+                response = await self.get(url, **kwargs)
+                if self.archive:
+                    await self.archive.store(url, response.status_code, response.content,
+                                             response.encoding, **(archive_meta or {}))
+                if response.status_code == 304 and entry:
+                    cache.touch(url)
+                    return UNCHANGED
+                response.raise_for_status()
+                if cache is None:
+                    return response.text
+                if cache.update(url, response.content, response.headers.get("ETag"),
+                                response.headers.get("Last-Modified")):
+                    return UNCHANGED
+                return PageText(response.text, cache, url)
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                logger.warning(f"HTTP 에러 {status_code}: {url} (시도 {attempt + 1}/{max_retries})")
+                if not is_backoff_status(status_code):
+                    return GONE if report_gone and status_code in GONE_STATUSES else None
+                if status_code == 403:
+                    logger.warning("접근이 차단되었습니다. 요청 속도를 줄여 다시 시도합니다.")
+            except httpx.RequestError as e:
+                logger.warning(f"요청 에러: {e} (시도 {attempt + 1}/{max_retries})")
+        return None
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 연결 재사용 통계"""
+        return {host: stats.to_dict() for host, stats in self._stats.items()}
+    
+    def log_stats(self) -> None:
+        """연결 재사용 통계 로그 출력"""
+        for host, stats in self._stats.items():
+            logger.info(
+                f"[HTTP] {host}: 요청 {stats.requests}회, 새 연결 {stats.new_connections}회, "
+                f"재사용 {stats.reused_connections}회, TLS 핸드셰이크 {stats.tls_handshakes}회, "
+                f"HTTP/2 {stats.http2_requests}회"
+            )
+        if self.rate_limiter:
+            for host, delay in self.rate_limiter.current_delays().items():
+                logger.info(f"[속도 제한] {host}: 현재 요청 간격 {delay:.2f}초")
+    
+    async def aclose(self) -> None:
+        """모든 클라이언트 연결 종료 (학습한 요청 속도, 페이지 캐시 저장)"""
+        if self.rate_limiter:
+            self.rate_limiter.save()
+        if self.page_cache:
+            self.page_cache.save()
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+    
+    async def __aenter__(self) -> "HttpClientRegistry":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+@asynccontextmanager
+async def shared_or_owned(http: Optional[HttpClientRegistry], delay: float) -> AsyncIterator[HttpClientRegistry]:
+    """
+    공유 레지스트리가 주어지면 그대로 사용하고,
+    없으면 (크롤러 단독 실행 시) 임시 레지스트리를 만들어 사용 후 닫음
+    """
+    if http is not None:
+        yield http
+        return
+    
+    async with HttpClientRegistry.from_settings(delay) as owned:
+        yield owned
+        owned.log_stats()
@@ -0,0 +1,48 @@
+"""
+증분 크롤링 (high-water mark) 헬퍼
+- high-water mark: 해당 갤러리에서 이미 저장된 가장 큰 게시글 번호
+- 페이지의 모든 게시글이 high-water mark 이하이면 더 볼 필요가 없음
+- 페이지 전체가 새 글이면 설정된 페이지 수를 넘어서도 계속 탐색 (상한 있음)
+"""
+from typing import List, Optional
+
+
+def count_new_posts(posts: List, last_seen_id: Optional[int]) -> int:
+    """high-water mark보다 큰 번호의 게시글 수"""
+    if last_seen_id is None:
+        return len(posts)
+    return sum(1 for post in posts if post.post_id.isdigit() and int(post.post_id) > last_seen_id)
+
+
+def should_fetch_next_page(page: int, pages: int, max_pages: int,
+                           posts: List, last_seen_id: Optional[int], fetched: bool = True) -> bool:
+    """
+    다음 페이지를 가져올지 결정
+    
+    Args:
+        page: 방금 크롤링한 페이지 번호
+        pages: 기본 크롤링 페이지 수
+        max_pages: 증분 크롤링 시 최대 페이지 수 (안전 상한)
+        posts: 방금 페이지에서 파싱된 게시글
+        last_seen_id: high-water mark (None이면 최초 크롤링)
+        fetched: 페이지를 받아 파싱했는지 (요청 실패로 비어 있으면 False)
+    """
+    # 최초 크롤링: 기존처럼 설정된 페이지 수만큼
+    if last_seen_id is None:
+        return page < pages
+    
+    if page >= max_pages:
+        return False
+    
+    # 요청 실패로 비어 있는 페이지는 이미 본 게시글만 있는지 알 수 없음 -> 기본 페이지 수까지는 계속
+    if not fetched:
+        return page < pages
+    
+    new_count = count_new_posts(posts, last_seen_id)
+    
+    # 이미 본 게시글만 있는 페이지 -> 중단
+    if new_count == 0:
+        return False
+    
+    # 기본 페이지 수 이내이거나, 페이지 전체가 새 글이면 계속
+    return page < pages or new_count == len(posts)
@@ -0,0 +1,303 @@
+"""
+게시글 목록 페이지 파서 백엔드
+- "lxml": lxml XPath 기반 고속 파서 (lxml 설치 시)
+- "soup": BeautifulSoup + SoupStrainer로 게시글 행 영역만 파싱
+- "auto": lxml이 있으면 lxml, 없으면 soup
+
+백엔드는 행마다 가공 전 문자열(raw row)만 뽑고,
+CrawledPost 변환은 각 크롤러의 공통 로직에서 처리하므로 백엔드 간 결과가 동일합니다.
+"""
+import logging
+import re
+from typing import Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("lxml", "soup")
+
+RawRow = Dict[str, Optional[str]]
+
+
+def _lxml_available() -> bool:
+    """lxml 설치 여부"""
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """설정/인자로 받은 백엔드 이름을 실제 사용할 백엔드로 변환"""
+    name = name or get_settings().list_parser_backend
+    if name == "auto":
+        return "lxml" if _lxml_available() else "soup"
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 파서 백엔드: {name} (사용 가능: auto, {', '.join(BACKENDS)})")
+    if name == "lxml" and not _lxml_available():
+        logger.warning("lxml이 설치되지 않았습니다. soup 백엔드를 사용합니다.")
+        return "soup"
+    return name
+
+
+# 모바일 목록(m.dcinside.com)의 ul.ginfo 항목: [말머리, 글쓴이, 작성일, "조회 N", "추천 N"] (말머리/추천은 없을 수 있음)
+_MOBILE_DATE = re.compile(r"^\d{2}[.:]\d{2}(\.\d{2})?$")
+
+
+def _mobile_info(items: List[str]) -> RawRow:
+    """모바일 목록 ginfo 항목을 필드별로 분류 (글쓴이는 작성일 바로 앞 항목)"""
+    info: RawRow = {"author": None, "date": None, "view": None, "recommend": None}
+    for index, text in enumerate(items):
+        if text.startswith("조회"):
+            info["view"] = text
+        elif text.startswith("추천"):
+            info["recommend"] = text
+        elif info["date"] is None and _MOBILE_DATE.match(text):
+            info["date"] = text
+            if index > 0:
+                info["author"] = items[index - 1]
+    return info
+
+
+# ========== BeautifulSoup (SoupStrainer) ==========
+
+def _class_filter(name: str):
+    """
+    SoupStrainer용 클래스 필터
+    파싱 시점에는 class 속성이 "ub-content us-post" 같은 원문 문자열이라 class_="ub-content"로는 매칭되지 않음
+    """
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return name in classes
+    return match
+
+
+def _soup_text(elem) -> Optional[str]:
+    return elem.get_text(strip=True) if elem is not None else None
+
+
+def _dcinside_rows_soup(html: str) -> Iterator[RawRow]:
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("tr", class_=_class_filter("ub-content")))
+    for row in soup.select("tr.ub-content"):
+        title_elem = row.select_one("td.gall_tit a")
+        author_elem = row.select_one("td.gall_writer")
+        nick_elem = author_elem.select_one("span.nickname, em") if author_elem is not None else None
+        date_elem = row.select_one("td.gall_date")
+        yield {
+            "num": _soup_text(row.select_one("td.gall_num")),
+            "title": _soup_text(title_elem),
+            "href": title_elem.get("href", "") if title_elem is not None else None,
+            "author": _soup_text(nick_elem),
+            "date": (date_elem.get("title", "") or date_elem.get_text(strip=True)) if date_elem is not None else None,
+            "view": _soup_text(row.select_one("td.gall_count")),
+            "recommend": _soup_text(row.select_one("td.gall_recommend")),
+            "comment": _soup_text(row.select_one("td.gall_tit span.reply_num")),
+        }
+
+
+def _dcinside_mobile_rows_soup(html: str) -> Iterator[RawRow]:
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("ul", class_=_class_filter("gall-detail-lst")))
+    for item in soup.select("ul.gall-detail-lst > li"):
+        link_elem = item.select_one("a.lt")
+        notice = "notice" in item.get("class", []) or item.select_one("span.sp-lst-notice") is not None
+        yield {
+            "notice": "notice" if notice else None,
+            "href": link_elem.get("href", "") if link_elem is not None else None,
+            "title": _soup_text(item.select_one("span.subjectin")),
+            "comment": _soup_text(item.select_one("a.rt span.ct")),
+            **_mobile_info([li.get_text(strip=True) for li in item.select("ul.ginfo > li")]),
+        }
+
+
+def _arcalive_rows_soup(html: str) -> Iterator[RawRow]:
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a", class_=_class_filter("vrow")))
+    for vrow in soup.select("a.vrow"):
+        time_elem = vrow.select_one("time")
+        yield {
+            "notice": "notice" if "notice" in vrow.get("class", []) else None,
+            "href": vrow.get("href", ""),
+            "title": _soup_text(vrow.select_one(".title")),
+            "author": _soup_text(vrow.select_one(".user-info")),
+            "date": time_elem.get_text(strip=True) if time_elem is not None else None,
+            "view": _soup_text(vrow.select_one(".vcol-hits, .col-rate")),
+            "recommend": _soup_text(vrow.select_one(".vcol-rate")),
+            "comment": _soup_text(vrow.select_one(".vcol-comment")),
+        }
+
+
+# ========== lxml (XPath) ==========
+
+def _has_class(name: str) -> str:
+    """CSS 클래스 선택자에 해당하는 XPath 조건"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# BeautifulSoup get_text()와 동일하게 script/style/주석 텍스트는 제외
+_TEXT_NODES = ".//text()[not(parent::script) and not(parent::style)]"
+_compiled = {}
+
+
+def _xpath(expr: str):
+    """XPath를 한 번만 컴파일해서 재사용"""
+    compiled = _compiled.get(expr)
+    if compiled is None:
+        from lxml import etree
+        compiled = _compiled[expr] = etree.XPath(expr)
+    return compiled
+
+
+def _lxml_text(elem) -> Optional[str]:
+    if elem is None:
+        return None
+    return "".join(text.strip() for text in _xpath(_TEXT_NODES)(elem))
+
+
+def _classes(elem) -> List[str]:
+    return (elem.get("class") or "").split()
+
+
+def _first_by_class(root, fields: Dict[str, str]) -> Dict[str, object]:
+    """
+    하위 요소를 문서 순서대로 한 번만 순회하며 필드별 첫 요소를 찾음
+    (행마다 선택자를 각각 실행하던 것을 한 번의 순회로 대체)
+    
+    Args:
+        fields: {클래스명: 필드명} - 여러 클래스가 같은 필드를 가리키면 먼저 나오는 요소 사용
+    """
+    found = {}
+    for elem in root.iterdescendants():
+        if not isinstance(elem.tag, str):
+            continue  # 주석 등
+        for cls in _classes(elem):
+            field = fields.get(cls)
+            if field and field not in found:
+                found[field] = elem
+    return found
+
+
+def _lxml_document(html: str):
+    import lxml.html
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # XML 인코딩 선언이 있는 문자열은 바이트로 넘겨야 함
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+
+
+_DC_CELLS = {"gall_num", "gall_tit", "gall_writer", "gall_date", "gall_count", "gall_recommend"}
+
+
+def _dcinside_rows_lxml(html: str) -> Iterator[RawRow]:
+    doc = _lxml_document(html)
+    for row in _xpath(f"//tr[{_has_class('ub-content')}]")(doc):
+        cells = {}
+        for td in row.iter("td"):
+            for cls in _classes(td):
+                if cls in _DC_CELLS and cls not in cells:
+                    cells[cls] = td
+        
+        title_cell = cells.get("gall_tit")
+        title_elem = next(title_cell.iter("a"), None) if title_cell is not None else None
+        comment_elem = None
+        if title_cell is not None:
+            comment_elem = next((span for span in title_cell.iter("span") if "reply_num" in _classes(span)), None)
+        
+        writer_cell = cells.get("gall_writer")
+        nick_elem = None
+        if writer_cell is not None:
+            nick_elem = next((elem for elem in writer_cell.iter("span", "em")
+                              if elem.tag == "em" or "nickname" in _classes(elem)), None)
+        
+        date_elem = cells.get("gall_date")
+        yield {
+            "num": _lxml_text(cells.get("gall_num")),
+            "title": _lxml_text(title_elem),
+            "href": title_elem.get("href", "") if title_elem is not None else None,
+            "author": _lxml_text(nick_elem),
+            "date": (date_elem.get("title", "") or _lxml_text(date_elem)) if date_elem is not None else None,
+            "view": _lxml_text(cells.get("gall_count")),
+            "recommend": _lxml_text(cells.get("gall_recommend")),
+            "comment": _lxml_text(comment_elem),
+        }
+
+
+_DC_MOBILE_FIELDS = {
+    "lt": "link",
+    "subjectin": "title",
+    "ginfo": "info",
+    "ct": "comment",  # a.rt 안의 댓글 수
+    "sp-lst-notice": "notice",
+}
+
+
+def _dcinside_mobile_rows_lxml(html: str) -> Iterator[RawRow]:
+    doc = _lxml_document(html)
+    for item in _xpath(f"//ul[{_has_class('gall-detail-lst')}]/li")(doc):
+        found = _first_by_class(item, _DC_MOBILE_FIELDS)
+        link_elem = found.get("link")
+        info_elem = found.get("info")
+        items = [_lxml_text(li) for li in info_elem.iterchildren("li")] if info_elem is not None else []
+        notice = "notice" in _classes(item) or "notice" in found
+        yield {
+            "notice": "notice" if notice else None,
+            "href": link_elem.get("href", "") if link_elem is not None else None,
+            "title": _lxml_text(found.get("title")),
+            "comment": _lxml_text(found.get("comment")),
+            **_mobile_info(items),
+        }
+
+
+_ARCA_FIELDS = {
+    "title": "title",
+    "user-info": "author",
+    "vcol-hits": "view",  # ".vcol-hits, .col-rate"
+    "col-rate": "view",
+    "vcol-rate": "recommend",
+    "vcol-comment": "comment",
+}
+
+
+def _arcalive_rows_lxml(html: str) -> Iterator[RawRow]:
+    doc = _lxml_document(html)
+    for vrow in _xpath(f"//a[{_has_class('vrow')}]")(doc):
+        found = _first_by_class(vrow, _ARCA_FIELDS)
+        time_elem = next(vrow.iterdescendants("time"), None)
+        yield {
+            "notice": "notice" if "notice" in _classes(vrow) else None,
+            "href": vrow.get("href", ""),
+            "title": _lxml_text(found.get("title")),
+            "author": _lxml_text(found.get("author")),
+            "date": _lxml_text(time_elem),
+            "view": _lxml_text(found.get("view")),
+            "recommend": _lxml_text(found.get("recommend")),
+            "comment": _lxml_text(found.get("comment")),
+        }
+
+
+# ========== 공개 API ==========
+
+def dcinside_rows(html: str, backend: Optional[str] = None) -> List[RawRow]:
+    """디시인사이드 목록 페이지의 게시글 행 (가공 전 문자열)"""
+    if resolve_backend(backend) == "lxml":
+        return list(_dcinside_rows_lxml(html))
+    return list(_dcinside_rows_soup(html))
+
+
+def dcinside_mobile_rows(html: str, backend: Optional[str] = None) -> List[RawRow]:
+    """디시인사이드 모바일 목록 페이지(m.dcinside.com)의 게시글 행 (가공 전 문자열)"""
+    if resolve_backend(backend) == "lxml":
+        return list(_dcinside_mobile_rows_lxml(html))
+    return list(_dcinside_mobile_rows_soup(html))
+
+
+def arcalive_rows(html: str, backend: Optional[str] = None) -> List[RawRow]:
+    """아카라이브 목록 페이지의 게시글 행 (가공 전 문자열)"""
+    if resolve_backend(backend) == "lxml":
+        return list(_arcalive_rows_lxml(html))
+    return list(_arcalive_rows_soup(html))
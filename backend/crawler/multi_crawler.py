@@ -1,77 +1,223 @@
 """
 여러 갤러리/게시판을 통합 크롤링하는 모듈
+- stream_all_targets: 페이지 단위로 수집되는 대로 yield (DB 저장과 동시 진행)
+- crawl_all_targets: 전체 결과를 모아서 반환
+- locate_target_page: 목표 날짜/게시글 번호가 있는 페이지 찾기 (백필/누락 구간 복구)
+- 대상별 circuit breaker가 주어지면 열린 대상은 건너뛰고 페이지 결과를 기록 (상태 저장은 models.breakers)
 """
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Dict
 import logging
 
 from config import get_settings
-from crawler.dcinside_crawler import DCInsideCrawler, CrawledPost as DCPost
-from crawler.arcalive_crawler import ArcaliveCrawler, CrawledPost as ArcaPost
+from crawler.circuit_breaker import TargetBreaker
+from crawler.dcinside_crawler import DCInsideCrawler
+from crawler.arcalive_crawler import ArcaliveCrawler
+from crawler.http_client import HttpClientRegistry
+from crawler.page_locator import PageLocation
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def crawl_all_targets(pages: int = None) -> List:
-    """모든 설정된 갤러리/게시판 크롤링"""
+def _target_crawler(gallery_config: dict, http: HttpClientRegistry):
+    """갤러리/게시판 타입에 맞는 크롤러 (지원하지 않는 타입/목록 소스면 None)"""
+    gallery_id = gallery_config['id']
+    gallery_type = gallery_config['type']
+    
+    if gallery_type in ('dcinside_minor', 'dcinside'):
+        source = gallery_config.get('source') or get_settings().dcinside_list_source
+        if source not in DCInsideCrawler.SOURCES:
+            logger.error(f"⚠️  [{gallery_config['name']}] 지원하지 않는 목록 소스: {source} "
+                         f"(사용 가능: {', '.join(DCInsideCrawler.SOURCES)})")
+            return None
+        # 디시인사이드 마이너갤러리 / 일반갤러리
+        return DCInsideCrawler(gallery_id=gallery_id, is_minor=gallery_type == 'dcinside_minor', http=http,
+                               source=source)
+    
+    if gallery_type == 'arcalive':
+        # 아카라이브
+        return ArcaliveCrawler(board_id=gallery_id, http=http)
+    
+    return None
+
+
+def iter_target_pages(gallery_config: dict, pages: int, http: HttpClientRegistry,
+                      last_seen_id: Optional[int] = None, start_page: int = 1,
+                      breaker: Optional[TargetBreaker] = None) -> Optional[AsyncIterator[List]]:
+    """
+    갤러리/게시판 타입에 맞는 크롤러의 페이지 단위 async generator (지원하지 않는 타입이면 None)
+    
+    start_page~pages 페이지를 크롤링 (작업 큐 워커는 페이지 구간 단위로 호출)
+    breaker가 주어지면 페이지 결과를 기록하고 열리면 중단 (열려 있는지는 호출 측에서 먼저 확인)
+    """
+    crawler = _target_crawler(gallery_config, http)
+    if isinstance(crawler, DCInsideCrawler):
+        return crawler.iter_gallery(pages=pages, last_seen_id=last_seen_id, start_page=start_page, breaker=breaker)
+    if isinstance(crawler, ArcaliveCrawler):
+        return crawler.iter_board(pages=pages, last_seen_id=last_seen_id, start_page=start_page, breaker=breaker)
+    return None
+
+
+async def locate_target_page(gallery_config: dict, http: HttpClientRegistry, target_date: Optional[datetime] = None,
+                             target_post_id: Optional[int] = None, hint: int = 1) -> Optional[PageLocation]:
+    """갤러리/게시판에서 목표 날짜/게시글 번호가 있는 페이지 찾기 (지원하지 않는 타입이면 None)"""
+    crawler = _target_crawler(gallery_config, http)
+    if crawler is None:
+        return None
+    return await crawler.locate_page(target_date=target_date, target_post_id=target_post_id, hint=hint)
+
+
+async def _stream_target(gallery_config: dict, pages: int, http: HttpClientRegistry,
+                         queue: asyncio.Queue, last_seen_id: Optional[int] = None,
+                         breaker: Optional[TargetBreaker] = None) -> None:
+    """갤러리/게시판 하나를 크롤링하며 페이지마다 큐에 넣음 (큐가 가득 차면 대기)"""
+    gallery_name = gallery_config['name']
+    
+    if breaker is not None and not breaker.allow():
+        # 연속 요청 실패/0행으로 열린 대상 - 대기 시간이 지날 때까지 요청하지 않음
+        breaker.skip()
+        return
+    
+    logger.info(f"\n[{gallery_name}] 크롤링 시작...")
+    
+    count = 0
+    try:
+        target_pages = iter_target_pages(gallery_config, pages, http, last_seen_id, breaker=breaker)
+        if target_pages is None:
+            logger.warning(f"⚠️  [{gallery_name}] 지원하지 않는 타입/목록 소스: {gallery_config['type']}")
+            return
+        
+        async for posts in target_pages:
+            if posts:
+                await queue.put(posts)
+                count += len(posts)
+        logger.info(f"✅ [{gallery_name}] {count}개 수집 완료")
+    except Exception as e:
+        # 이미 큐에 넣은 페이지는 그대로 저장됨
+        logger.error(f"❌ [{gallery_name}] 크롤링 실패 ({count}개 수집 후): {e}")
+
+
+async def stream_all_targets(pages: int = None, concurrent: Optional[bool] = None,
+                             high_water_marks: Optional[Dict[str, int]] = None,
+                             breakers: Optional[Dict[str, TargetBreaker]] = None) -> AsyncIterator[List]:
+    """
+    모든 설정된 갤러리/게시판 크롤링 (페이지 단위 게시글 목록을 수집되는 대로 yield)
+    
+    크롤러들은 크기가 제한된 큐(crawl_queue_max_pages)에 페이지를 넣고,
+    받는 쪽(DB 저장 등)이 느리면 큐가 비워질 때까지 크롤링이 멈춤 (backpressure)
+    
+    Args:
+        pages: 갤러리별 크롤링할 페이지 수
+        concurrent: 갤러리별 동시 크롤링 여부 (None이면 설정값 사용)
+        high_water_marks: 갤러리별 이미 저장된 가장 큰 게시글 번호 (증분 크롤링)
+        breakers: 갤러리별 circuit breaker (models.breakers.tracked_breakers로 불러오고 저장)
+    """
     settings = get_settings()
     pages = pages or settings.max_pages_per_crawl
-    
-    all_posts = []
+    if concurrent is None:
+        concurrent = settings.crawl_targets_concurrently
+    high_water_marks = high_water_marks or {}
+    breakers = breakers or {}
     
     logger.info("="*70)
     logger.info("통합 크롤링 시작")
-    logger.info(f"대상: {len(settings.target_galleries)}개 갤러리")
+    logger.info(f"대상: {len(settings.target_galleries)}개 갤러리 ({'동시' if concurrent else '순차'} 실행)")
     logger.info("="*70)
     
-    for gallery_config in settings.target_galleries:
-        gallery_id = gallery_config['id']
-        gallery_name = gallery_config['name']
-        gallery_type = gallery_config['type']
-        
-        logger.info(f"\n[{gallery_name}] 크롤링 시작...")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(settings.crawl_queue_max_pages, 1))
+    done = object()
+    
+    # 모든 크롤러가 호스트별 연결 풀을 공유하고,
+    # 호스트별로 요청 속도를 제한 (갤러리 수와 무관하게 사이트별 요청 속도 동일)
+    async with HttpClientRegistry.from_settings() as http:
+        async def produce() -> None:
+            cancelled = False
+            try:
+                if concurrent:
+                    tasks = [
+                        asyncio.create_task(_stream_target(
+                            gallery_config, pages, http, queue, high_water_marks.get(gallery_config['id']),
+                            breakers.get(gallery_config['id'])
+                        ))
+                        for gallery_config in settings.target_galleries
+                    ]
+                    try:
+                        await asyncio.gather(*tasks)
+                    finally:
+                        # 한 대상이 예외로 끝나면 나머지 대상도 멈춤
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                else:
+                    for gallery_config in settings.target_galleries:
+                        await _stream_target(
+                            gallery_config, pages, http, queue, high_water_marks.get(gallery_config['id']),
+                            breakers.get(gallery_config['id'])
+                        )
+            except asyncio.CancelledError:
+                # 받는 쪽이 멈춰 취소됨 (끝 표시를 기다리는 쪽이 없고 큐가 가득 차 있을 수 있음)
+                cancelled = True
+                raise
+            finally:
+                # 예외로 끝나도 받는 쪽이 끝을 알 수 있도록 (예외는 받는 쪽의 await producer에서 다시 발생)
+                if not cancelled:
+                    await queue.put(done)
         
+        producer = asyncio.create_task(produce())
+        total = 0
         try:
-            if gallery_type == 'dcinside_minor':
-                # 디시인사이드 마이너갤러리
-                crawler = DCInsideCrawler(gallery_id=gallery_id, is_minor=True)
-                posts = await crawler.crawl_gallery(pages=pages)
-                all_posts.extend(posts)
-                logger.info(f"✅ [{gallery_name}] {len(posts)}개 수집 완료")
-                
-            elif gallery_type == 'dcinside':
-                # 디시인사이드 일반갤러리
-                crawler = DCInsideCrawler(gallery_id=gallery_id, is_minor=False)
-                posts = await crawler.crawl_gallery(pages=pages)
-                all_posts.extend(posts)
-                logger.info(f"✅ [{gallery_name}] {len(posts)}개 수집 완료")
-                
-            elif gallery_type == 'arcalive':
-                # 아카라이브
-                crawler = ArcaliveCrawler(board_id=gallery_id)
-                posts = await crawler.crawl_board(pages=pages)
-                all_posts.extend(posts)
-                logger.info(f"✅ [{gallery_name}] {len(posts)}개 수집 완료")
-                
-            else:
-                logger.warning(f"⚠️  [{gallery_name}] 지원하지 않는 타입: {gallery_type}")
-            
-            # Rate limiting between galleries
-            await asyncio.sleep(2)
-            
-        except Exception as e:
-            logger.error(f"❌ [{gallery_name}] 크롤링 실패: {e}")
-            continue
+            while True:
+                posts = await queue.get()
+                if posts is done:
+                    break
+                total += len(posts)
+                yield posts
+            await producer
+        finally:
+            # 받는 쪽이 중간에 멈추면 남은 크롤링 취소
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+        
+        http.log_stats()
     
     logger.info("="*70)
-    logger.info(f"통합 크롤링 완료: 총 {len(all_posts)}개 게시글 수집")
+    logger.info(f"통합 크롤링 완료: 총 {total}개 게시글 수집")
     logger.info("="*70)
+
+
+async def crawl_all_targets(pages: int = None, concurrent: Optional[bool] = None,
+                            high_water_marks: Optional[Dict[str, int]] = None,
+                            breakers: Optional[Dict[str, TargetBreaker]] = None) -> List:
+    """
+    모든 설정된 갤러리/게시판 크롤링 (전체 결과를 모아서 반환)
+    
+    Args:
+        pages: 갤러리별 크롤링할 페이지 수
+        concurrent: 갤러리별 동시 크롤링 여부 (None이면 설정값 사용)
+        high_water_marks: 갤러리별 이미 저장된 가장 큰 게시글 번호 (증분 크롤링)
+        breakers: 갤러리별 circuit breaker
+    
+    Returns:
+        수집된 게시글 리스트 (설정된 갤러리 순서 유지)
+        페이지 캐시에는 확정하지 않으므로 다음 실행에서도 다시 파싱 (DB에 저장하려면 stream_all_targets + ingest_stream)
+    """
+    all_posts = []
+    async for posts in stream_all_targets(pages, concurrent, high_water_marks, breakers):
+        all_posts.extend(posts)
     
+    # 동시 크롤링 시 페이지가 섞여 들어오므로 설정된 갤러리 순서로 정렬 (갤러리 내 순서는 유지)
+    order = {gallery_config['id']: i for i, gallery_config in enumerate(get_settings().target_galleries)}
+    all_posts.sort(key=lambda post: order.get(post.gallery_id, len(order)))
     return all_posts
 
 
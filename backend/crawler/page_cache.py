@@ -0,0 +1,192 @@
+"""
+URL별 페이지 캐시 (조건부 요청 + 본문 해시)
+- 받은 페이지의 ETag/Last-Modified와 본문 해시를 URL별로 기억
+- 다음 요청에 If-None-Match/If-Modified-Since를 붙여 보내고
+  304 응답이거나 200이어도 본문 해시가 같으면 "바뀌지 않음"으로 알려 파싱/DB 저장을 생략
+  (깊은 목록 페이지, 루나톡 전체 랭킹, 제타 홈처럼 실행 사이에 그대로인 페이지가 많음)
+- 마지막으로 파싱한 지 page_cache_max_age_hours가 지나면 조건 없이 받아 다시 파싱
+  (DB 초기화나 파서 수정 후에도 바뀌지 않은 페이지가 영원히 건너뛰어지지 않도록)
+- 바뀐 페이지의 새 해시는 받는 쪽이 저장(커밋)을 마치고 확정(confirm_pages)해야 캐시에 반영
+  (파싱 실패/롤백/중간 취소된 페이지가 다음 실행에서 UNCHANGED로 건너뛰어지지 않도록)
+- 상태는 crawl_state_dir의 JSON 파일로 저장해 다음 실행에서 이어서 사용 (레지스트리를 닫을 때 저장)
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE_NAME = "page_cache.json"
+
+
+class Unchanged:
+    """조건부 요청 결과: 이전에 파싱한 뒤로 페이지가 바뀌지 않음"""
+    
+    def __repr__(self) -> str:
+        return "UNCHANGED"
+
+
+UNCHANGED = Unchanged()
+
+
+class PageText(str):
+    """조건부 요청으로 받은 바뀐 페이지 본문 (캐시 항목은 확정 전 상태)"""
+    
+    def __new__(cls, text: str, cache: "PageCache", url: str) -> "PageText":
+        page = super().__new__(cls, text)
+        page.cache = cache
+        page.url = url
+        return page
+
+
+class PendingPage(list):
+    """PageText를 파싱한 결과 (저장을 마친 뒤 confirm_pages로 캐시 항목 확정)"""
+    
+    def __init__(self, items: Iterable, text: PageText):
+        super().__init__(items)
+        self.cache = text.cache
+        self.url = text.url  # 본문은 들고 있지 않음
+
+
+def confirm_pages(pages: Iterable) -> Set["PageCache"]:
+    """
+    저장(커밋)을 마친 페이지들의 캐시 항목 확정
+    
+    PendingPage가 아니거나 비어 있는 페이지(마크업이 바뀌어 0행일 수 있음)는 확정하지 않음
+    
+    Returns:
+        항목이 바뀌어 저장(save)이 필요한 캐시
+    """
+    caches = set()
+    for page in pages:
+        if isinstance(page, PendingPage) and page:
+            page.cache.confirm(page.url)
+            caches.add(page.cache)
+    return caches
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class PageCache:
+    """URL별 ETag/Last-Modified/본문 해시"""
+    
+    def __init__(self, max_age_hours: float = 24.0, max_entries: int = 20000,
+                 state_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            max_age_hours: 마지막으로 파싱한 뒤 이 시간이 지나면 캐시를 쓰지 않음
+            max_entries: 저장할 최대 URL 수
+            state_path: 캐시를 저장할 JSON 파일 (None이면 저장하지 않음)
+        """
+        self.max_age_seconds = max_age_hours * 3600
+        self.max_entries = max_entries
+        self.state_path = Path(state_path) if state_path else None
+        self._entries: Dict[str, Dict] = self._load()
+        self._pending: Dict[str, Dict] = {}  # 받았지만 아직 저장이 확정되지 않은 페이지
+        self._dirty = False
+    
+    @classmethod
+    def from_settings(cls) -> Optional["PageCache"]:
+        """설정값 기반 캐시 (page_cache_enabled가 꺼져 있으면 None)"""
+        settings = get_settings()
+        if not settings.page_cache_enabled:
+            return None
+        return cls(
+            max_age_hours=settings.page_cache_max_age_hours,
+            max_entries=settings.page_cache_max_entries,
+            state_path=Path(settings.crawl_state_dir) / STATE_FILE_NAME,
+        )
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """아직 쓸 수 있는 캐시 항목 (없거나 오래됐으면 None)"""
+        entry = self._entries.get(url)
+        if entry is None or time.time() - entry.get("parsed_at", 0) > self.max_age_seconds:
+            return None
+        return entry
+    
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """조건부 요청 헤더"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def touch(self, url: str) -> None:
+        """304 응답 (확인 시각만 갱신)"""
+        self._entries[url]["checked_at"] = time.time()
+        self._dirty = True
+    
+    def update(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        """
+        200 응답 반영 (바뀐 페이지는 confirm까지 대기)
+        
+        Returns:
+            본문이 캐시와 같은지 (True면 파싱을 생략해도 됨)
+        """
+        digest = content_hash(content)
+        entry = self.lookup(url)
+        now = time.time()
+        if entry is not None and entry.get("hash") == digest:
+            entry.update(etag=etag, last_modified=last_modified, checked_at=now)
+            self._dirty = True
+            return True
+        
+        self._pending[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "hash": digest,
+            "parsed_at": now,
+            "checked_at": now,
+        }
+        return False
+    
+    def confirm(self, url: str) -> None:
+        """받는 쪽이 페이지 저장을 마침 (대기 중인 항목을 캐시에 반영)"""
+        entry = self._pending.pop(url, None)
+        if entry is not None:
+            self._entries[url] = entry
+            self._dirty = True
+    
+    def _load(self) -> Dict[str, Dict]:
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {url: entry for url, entry in data.get("pages", {}).items() if isinstance(entry, dict)}
+        except (OSError, ValueError) as e:
+            logger.warning(f"페이지 캐시 파일을 읽지 못했습니다: {self.state_path} ({e})")
+            return {}
+    
+    def save(self) -> None:
+        """캐시를 파일로 저장 (max_entries를 넘으면 오래 확인하지 않은 URL부터 제외)"""
+        if not self.state_path or not self._dirty:
+            return
+        
+        pages = self._entries
+        if len(pages) > self.max_entries:
+            recent = sorted(pages, key=lambda url: pages[url].get("checked_at", 0), reverse=True)
+            pages = {url: pages[url] for url in recent[:self.max_entries]}
+            self._entries = pages
+        
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {"updated_at": datetime.now().isoformat(), "pages": pages}
+            # 여러 프로세스(워커)가 같은 파일을 저장하므로 임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)
+            temp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp_path, self.state_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"페이지 캐시를 저장하지 못했습니다: {self.state_path} ({e})")
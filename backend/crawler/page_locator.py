@@ -0,0 +1,109 @@
+"""
+목록 페이지 위치 찾기 (galloping search)
+- 게시판 목록은 최신 글부터 정렬되어 있으므로 "페이지의 게시글이 목표보다 최신인가"는 페이지 번호에 대해 단조
+  (앞쪽 페이지는 True, 어느 지점부터 False)
+- 시작 페이지(hint)에서 1, 2, 4, 8... 페이지씩 건너뛰며 경계를 넘는 구간을 찾고 그 안에서 이분 탐색
+  -> 목표 날짜/게시글 번호가 있는 페이지를 O(log n)번의 요청으로 찾음 (hint가 가까우면 O(log 거리))
+- 페이지 비교는 게시글 키의 중앙값 기준 (고정 공지 등 한두 개의 튀는 값에 영향받지 않음)
+- 게시글이 없는 페이지(게시판 끝, 요청 실패)는 "목표보다 최신이 아님"으로 취급
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from crawler.records import CrawledPost
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageLocation:
+    """찾은 페이지"""
+    page: int  # 목표보다 최신인 게시글이 있는 마지막 페이지 (여기서부터 크롤링하면 목표 이하의 게시글을 빠뜨리지 않음)
+    fetches: int  # 탐색에 사용한 요청 수
+
+
+def _post_id_key(post: CrawledPost) -> Optional[int]:
+    return int(post.post_id) if post.post_id.isdigit() else None
+
+
+def _created_at_key(post: CrawledPost) -> Optional[datetime]:
+    return post.created_at
+
+
+def median_key(posts: List[CrawledPost], key: Callable[[CrawledPost], Any]) -> Optional[Any]:
+    """페이지 게시글 키의 중앙값 (키가 없는 게시글은 제외)"""
+    values = sorted(value for value in map(key, posts) if value is not None)
+    return values[len(values) // 2] if values else None
+
+
+async def locate_page(
+    fetch_posts: Callable[[int], Awaitable[List[CrawledPost]]],
+    target_date: Optional[datetime] = None,
+    target_post_id: Optional[int] = None,
+    max_page: int = 10000,
+    hint: int = 1,
+) -> PageLocation:
+    """
+    목표 날짜 또는 게시글 번호가 있는 페이지 찾기
+    
+    Args:
+        fetch_posts: 페이지 번호를 받아 파싱된 게시글 목록을 반환하는 코루틴 함수 (실패 시 빈 목록)
+        target_date: 목표 작성 시각 (target_post_id와 둘 중 하나)
+        target_post_id: 목표 게시글 번호
+        max_page: 탐색할 최대 페이지
+        hint: 탐색 시작 페이지 (이전 체크포인트 등 목표에 가까운 페이지를 알면 요청 수가 줄어듦)
+    
+    Returns:
+        목표보다 최신인 게시글이 있는 마지막 페이지 (1페이지부터 목표보다 오래됐으면 1)
+    """
+    if (target_date is None) == (target_post_id is None):
+        raise ValueError("target_date와 target_post_id 중 하나만 지정해야 합니다")
+    key, target = (_created_at_key, target_date) if target_date is not None else (_post_id_key, target_post_id)
+    
+    probed: Dict[int, bool] = {}
+    
+    async def newer(page: int) -> bool:
+        """페이지 게시글이 목표보다 최신인지"""
+        if page not in probed:
+            median = median_key(await fetch_posts(page), key)
+            probed[page] = median is not None and median > target
+        return probed[page]
+    
+    max_page = max(max_page, 1)
+    hint = min(max(hint, 1), max_page)
+    
+    # newer(lo) = True, newer(hi) = False 인 구간 찾기 (lo = 0: 1페이지부터 목표 이하)
+    lo, hi = 0, max_page + 1
+    step = 1
+    if await newer(hint):
+        lo = hint
+        while lo < max_page:
+            page = min(lo + step, max_page)
+            if not await newer(page):
+                hi = page
+                break
+            lo = page
+            step *= 2
+    else:
+        hi = hint
+        while hi > 1:
+            page = max(hi - step, 1)
+            if await newer(page):
+                lo = page
+                break
+            hi = page
+            step *= 2
+    
+    # 구간 안에서 이분 탐색
+    while hi - lo > 1:
+        middle = (lo + hi) // 2
+        if await newer(middle):
+            lo = middle
+        else:
+            hi = middle
+    
+    location = PageLocation(page=max(lo, 1), fetches=len(probed))
+    logger.info(f"목표 {target} 위치: {location.page}페이지 (요청 {location.fetches}회)")
+    return location
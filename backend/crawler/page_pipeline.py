@@ -0,0 +1,124 @@
+"""
+목록 페이지 수집 파이프라인
+- 현재 페이지를 파싱하는 동안 다음 페이지를 미리 요청 (fetch/parse 겹치기)
+- 파싱은 parse_pool에서 실행되어 이벤트 루프를 막지 않음
+- 다음 페이지 여부는 기존과 같이 should_fetch_next_page로 결정
+- 페이지 단위로 yield 하므로 깊은 크롤링도 메모리 사용량이 일정하고, 받는 쪽에서 바로 저장 가능
+- circuit breaker가 주어지면 페이지 결과(요청 실패/0행/정상)를 기록하고, 열리면 남은 페이지를 요청하지 않음
+- fetch_page가 UNCHANGED(페이지 캐시 - 이전과 같은 페이지)를 돌려주면 파싱하지 않고 빈 UnchangedPage를 yield
+- 바뀐 페이지(PageText)는 PendingPage로 yield (받는 쪽이 저장 후 page_cache.confirm_pages로 확정)
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+from crawler.circuit_breaker import TargetBreaker
+from crawler.incremental import count_new_posts, should_fetch_next_page
+from crawler.page_cache import UNCHANGED, PageText, PendingPage, Unchanged
+from crawler.parse_pool import parser_name, run_parse
+from crawler.telemetry import record_parse_skipped
+
+logger = logging.getLogger(__name__)
+
+
+class UnchangedPage(list):
+    """
+    이전 실행과 같아 파싱을 생략한 페이지 (항상 비어 있음)
+    
+    게시글은 이미 저장되어 있으므로 받는 쪽은 저장할 것이 없고,
+    요청 실패로 비어 있는 페이지와 구분해야 하면 isinstance로 확인
+    """
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable[Union[str, Unchanged, None]]],
+    parse: Callable[[str], List],
+    pages: int,
+    max_pages: int,
+    last_seen_id: Optional[int] = None,
+    start_page: int = 1,
+    breaker: Optional[TargetBreaker] = None,
+) -> AsyncIterator[Tuple[int, List]]:
+    """
+    start_page부터 순서대로 가져와 파싱하고 페이지마다 (페이지 번호, 게시글 목록)을 yield
+    
+    Args:
+        fetch_page: 페이지 번호를 받아 HTML을 반환하는 코루틴 함수 (실패 시 None, 바뀌지 않았으면 UNCHANGED)
+        parse: HTML을 받아 게시글 목록을 반환하는 함수 (풀에서 실행)
+        pages: 기본 크롤링 페이지 수 (마지막 페이지 번호)
+        max_pages: 증분 크롤링 시 최대 페이지 수
+        last_seen_id: high-water mark
+        start_page: 첫 페이지 번호 (작업 큐에서 페이지 구간을 나눠 크롤링할 때)
+        breaker: 대상의 circuit breaker (반열림 상태면 시험 페이지 결과를 보기 전에는 다음 페이지를 요청하지 않음)
+    """
+    page = start_page
+    pending: Optional[asyncio.Task] = asyncio.create_task(fetch_page(page))
+    
+    try:
+        while True:
+            html = await pending
+            pending = None
+            
+            # 기본 페이지 수 이내라면 파싱 결과를 기다리지 않고 다음 페이지를 미리 요청
+            # (증분 크롤링에서 중단되면 취소 - 보통 호스트 딜레이 대기 중이라 실제 요청은 나가지 않음)
+            if page < pages and (breaker is None or not breaker.probing):
+                pending = asyncio.create_task(fetch_page(page + 1))
+            
+            posts = []
+            if html is UNCHANGED:
+                posts = UnchangedPage()
+                record_parse_skipped(parser_name(parse))
+                logger.info(f"페이지 {page} 변경 없음 - 파싱 생략")
+                if breaker is not None:
+                    breaker.record_unchanged()
+            elif html:
+                try:
+                    posts = await run_parse(parse, str(html))
+                except Exception as e:
+                    if breaker is not None:
+                        breaker.record_page(True, 0, f"페이지 {page} 파싱 에러: {type(e).__name__}: {e}")
+                    raise
+                if isinstance(html, PageText):
+                    posts = PendingPage(posts, html)
+                logger.info(f"페이지 {page}에서 {len(posts)}개 게시글 수집 (신규 {count_new_posts(posts, last_seen_id)}개)")
+            else:
+                logger.warning(f"페이지 {page} 크롤링 실패")
+            if breaker is not None and html is not UNCHANGED:
+                breaker.record_page(bool(html), len(posts), None if html else f"페이지 {page} 요청 실패")
+            
+            yield page, posts
+            
+            if breaker is not None and not breaker.allow():
+                break
+            if not should_fetch_next_page(page, pages, max_pages, posts, last_seen_id, fetched=bool(html)):
+                break
+            page += 1
+            if pending is None:
+                pending = asyncio.create_task(fetch_page(page))
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+async def crawl_pages(
+    fetch_page: Callable[[int], Awaitable[Optional[str]]],
+    parse: Callable[[str], List],
+    pages: int,
+    max_pages: int,
+    last_seen_id: Optional[int] = None,
+) -> Tuple[List, int]:
+    """
+    iter_pages 결과를 모두 모아서 반환
+    
+    Returns:
+        (수집한 게시글 목록, 마지막으로 처리한 페이지 번호)
+    """
+    all_posts = []
+    page = 0
+    async for page, posts in iter_pages(fetch_page, parse, pages, max_pages, last_seen_id):
+        all_posts.extend(posts)
+    return all_posts, page
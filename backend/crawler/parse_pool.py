@@ -0,0 +1,95 @@
+"""
+HTML 파싱 작업 풀
+- 목록 페이지 파싱(CPU 작업)을 이벤트 루프 밖의 스레드/프로세스 풀에서 실행
+- API 서버에서 크롤링을 돌려도 다른 요청이 파싱 때문에 멈추지 않도록 함
+- parse_executor 설정: "thread" (기본), "process" (GIL 영향 없음), "inline" (루프에서 직접 실행)
+- 파싱 시간(풀 대기 제외)과 결과 행 수를 파서별로 계측 (crawler/telemetry.py)
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from config import get_settings
+from crawler.telemetry import record_parse
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("thread", "process", "inline")
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+_executor_kind: Optional[str] = None
+
+
+def get_executor() -> Optional[Executor]:
+    """설정에 맞는 파싱 풀 반환 (inline이면 None, 최초 호출 시 생성)"""
+    global _executor, _executor_kind
+    
+    settings = get_settings()
+    kind = settings.parse_executor
+    if kind not in EXECUTORS:
+        raise ValueError(f"지원하지 않는 파싱 실행 방식: {kind} (사용 가능: {', '.join(EXECUTORS)})")
+    if kind == "inline":
+        return None
+    
+    if _executor is None or _executor_kind != kind:
+        shutdown_parse_pool()
+        workers = max(settings.parse_workers, 1)
+        if kind == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+        _executor_kind = kind
+        logger.info(f"파싱 풀 생성: {kind}, 워커 {workers}개")
+    return _executor
+
+
+def parser_name(func: Callable) -> str:
+    """계측용 파서 이름 (예: "dcinside_crawler.parse_post_list")"""
+    while isinstance(func, functools.partial):
+        func = func.func
+    module = getattr(func, "__module__", None) or ""
+    return f"{module.rsplit('.', 1)[-1]}.{getattr(func, '__qualname__', repr(func))}"
+
+
+def _timed_call(func: Callable[..., T], *args) -> Tuple[T, float]:
+    """풀 안에서 실행되는 부분 (대기 시간을 빼고 파싱 시간만 측정)"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def _row_count(result: Any) -> int:
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return int(result is not None)
+
+
+async def run_parse(func: Callable[..., T], *args) -> T:
+    """
+    파싱 함수를 풀에서 실행하고 결과 반환
+    
+    process 풀은 인자/결과를 pickle로 주고받으므로
+    func는 모듈 최상위 함수(또는 그 functools.partial)여야 함
+    """
+    executor = get_executor()
+    if executor is None:
+        result, seconds = _timed_call(func, *args)
+    else:
+        loop = asyncio.get_running_loop()
+        result, seconds = await loop.run_in_executor(executor, _timed_call, func, *args)
+    record_parse(parser_name(func), seconds, _row_count(result))
+    return result
+
+
+def shutdown_parse_pool() -> None:
+    """파싱 풀 종료 (애플리케이션 종료 시)"""
+    global _executor, _executor_kind
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _executor_kind = None
@@ -0,0 +1,218 @@
+"""
+호스트별 적응형 요청 속도 제한 (token bucket + AIMD)
+- 호스트마다 토큰 버킷으로 요청 속도(초당 요청 수)를 제한
+- 정상 응답이 이어지면 속도를 조금씩 올리고 (additive increase)
+- 403/429/5xx 응답이나 연결 오류가 나면 속도를 크게 줄임 (multiplicative decrease)
+- Retry-After 헤더가 있으면 그 시각까지 해당 호스트 요청을 멈춤
+- 학습한 속도는 JSON 파일로 저장해 다음 실행에서 이어서 사용
+- 서로 다른 호스트는 서로 기다리지 않고 독립적으로 진행
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 속도를 줄여야 하는 응답 코드 (차단/과다 요청/서버 오류)
+BACKOFF_STATUSES = {403, 429}
+# Retry-After 최대 대기 시간 (비정상적으로 큰 값 방지)
+MAX_RETRY_AFTER_SECONDS = 600.0
+
+STATE_FILE_NAME = "rate_limits.json"
+
+
+def is_backoff_status(status_code: int) -> bool:
+    """속도를 줄이고 재시도해야 하는 응답 코드인지"""
+    return status_code in BACKOFF_STATUSES or status_code >= 500
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 초로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+@dataclass
+class HostRate:
+    """호스트별 토큰 버킷 상태"""
+    rate: float  # 초당 허용 요청 수
+    tokens: float
+    updated: float  # 토큰을 마지막으로 채운 시각 (monotonic)
+    blocked_until: float = 0.0  # Retry-After로 요청을 멈출 시각 (monotonic)
+    
+    @property
+    def delay(self) -> float:
+        """요청 간 평균 간격 (초)"""
+        return 1.0 / self.rate
+
+
+class HostRateLimiter:
+    """호스트 단위 적응형 요청 속도 제한기"""
+    
+    def __init__(self, delay: float, min_delay: Optional[float] = None, max_delay: Optional[float] = None,
+                 burst: Optional[float] = None, state_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            delay: 처음 보는 호스트의 요청 간격 (초)
+            min_delay: 속도를 올릴 때의 최소 간격 (초)
+            max_delay: 속도를 줄일 때의 최대 간격 (초)
+            burst: 한 번에 연달아 보낼 수 있는 요청 수 (버킷 크기)
+            state_path: 학습한 속도를 저장할 JSON 파일 (None이면 저장하지 않음)
+        """
+        settings = get_settings()
+        self.delay = delay
+        self.min_delay = min(min_delay if min_delay is not None else settings.rate_limit_min_delay_seconds, delay)
+        self.max_delay = max(max_delay if max_delay is not None else settings.rate_limit_max_delay_seconds, delay)
+        self.burst = max(burst if burst is not None else settings.rate_limit_burst, 1.0)
+        self.increase = settings.rate_limit_increase
+        self.decrease_factor = settings.rate_limit_decrease_factor
+        self.state_path = Path(state_path) if state_path else None
+        
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._hosts: Dict[str, HostRate] = {}
+        # 저장된 상태: {host: {"delay": 초, "blocked_until": epoch 초}}
+        self._saved: Dict[str, Dict[str, float]] = self._load()
+    
+    @classmethod
+    def from_settings(cls, delay: Optional[float] = None) -> "HostRateLimiter":
+        """설정값 기반 제한기 (crawl_state_dir에 학습한 속도를 저장/복원)"""
+        settings = get_settings()
+        return cls(
+            delay if delay is not None else settings.crawl_delay_seconds,
+            state_path=Path(settings.crawl_state_dir) / STATE_FILE_NAME,
+        )
+    
+    @classmethod
+    def scaled(cls, factor: float) -> "HostRateLimiter":
+        """
+        설정값의 요청 간격을 factor배로 늘린 제한기
+        
+        여러 워커가 호스트별 속도를 나눠 갖거나(factor=워커 수), 백필처럼 일반 크롤링보다 천천히 요청할 때 사용
+        (줄어든 속도를 상태 파일에 저장하면 일반 크롤러까지 느려지므로 저장하지 않음)
+        """
+        settings = get_settings()
+        factor = max(factor, 1.0)
+        return cls(
+            settings.crawl_delay_seconds * factor,
+            min_delay=settings.rate_limit_min_delay_seconds * factor,
+            max_delay=settings.rate_limit_max_delay_seconds * factor,
+        )
+    
+    def _clamp_rate(self, rate: float) -> float:
+        return min(max(rate, 1.0 / self.max_delay), 1.0 / self.min_delay)
+    
+    def _host_rate(self, host: str) -> HostRate:
+        state = self._hosts.get(host)
+        if state is None:
+            now = time.monotonic()
+            saved = self._saved.get(host, {})
+            rate = self._clamp_rate(1.0 / saved.get("delay", self.delay))
+            blocked_until = 0.0
+            remaining = saved.get("blocked_until", 0.0) - time.time()
+            if remaining > 0:
+                blocked_until = now + min(remaining, MAX_RETRY_AFTER_SECONDS)
+            state = self._hosts[host] = HostRate(rate=rate, tokens=self.burst, updated=now,
+                                                 blocked_until=blocked_until)
+        return state
+    
+    async def acquire(self, url: str) -> None:
+        """해당 URL의 호스트에 요청해도 될 때까지 대기 (토큰 1개 사용)"""
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        
+        # 같은 호스트 요청은 락으로 직렬화하여 토큰을 계산
+        async with lock:
+            while True:
+                state = self._host_rate(host)
+                now = time.monotonic()
+                if state.blocked_until > now:
+                    await asyncio.sleep(state.blocked_until - now)
+                    continue
+                
+                state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if state.tokens >= 1.0:
+                    state.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - state.tokens) / state.rate)
+    
+    def record(self, url: str, status_code: Optional[int], retry_after: Optional[str] = None) -> None:
+        """
+        응답 결과를 반영해 속도 조정
+        
+        Args:
+            url: 요청 URL
+            status_code: 응답 코드 (연결 오류 등으로 응답이 없으면 None)
+            retry_after: Retry-After 헤더 값
+        """
+        host = urlparse(url).netloc
+        state = self._host_rate(host)
+        
+        if status_code is None or is_backoff_status(status_code):
+            state.rate = self._clamp_rate(state.rate * self.decrease_factor)
+            state.tokens = min(state.tokens, 0.0)
+            wait = parse_retry_after(retry_after)
+            if wait:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + wait)
+            logger.warning(
+                f"[속도 제한] {host}: 응답 {status_code or '없음'} -> 요청 간격 {state.delay:.2f}초"
+                + (f", Retry-After {wait:.0f}초 대기" if wait else "")
+            )
+        elif status_code < 400:
+            state.rate = self._clamp_rate(state.rate + self.increase)
+    
+    def current_delays(self) -> Dict[str, float]:
+        """호스트별 현재 요청 간격 (초)"""
+        return {host: round(state.delay, 3) for host, state in self._hosts.items()}
+    
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {host: value for host, value in data.get("hosts", {}).items() if isinstance(value, dict)}
+        except (OSError, ValueError) as e:
+            logger.warning(f"속도 제한 상태 파일을 읽지 못했습니다: {self.state_path} ({e})")
+            return {}
+    
+    def save(self) -> None:
+        """학습한 호스트별 속도를 파일로 저장"""
+        if not self.state_path or not self._hosts:
+            return
+        
+        hosts = dict(self._saved)
+        now_monotonic = time.monotonic()
+        now_epoch = time.time()
+        for host, state in self._hosts.items():
+            hosts[host] = {
+                "delay": round(state.delay, 4),
+                "blocked_until": round(now_epoch + max(state.blocked_until - now_monotonic, 0.0), 1),
+            }
+        
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {"updated_at": datetime.now().isoformat(), "hosts": hosts}
+            self.state_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"속도 제한 상태를 저장하지 못했습니다: {self.state_path} ({e})")
@@ -0,0 +1,99 @@
+"""
+크롤링 결과 레코드 (모든 크롤러 공통)
+- CrawledPost: 게시판 목록의 게시글 (디시인사이드, 아카라이브)
+- CharacterData: 캐릭터챗 서비스 순위 (제타, 루나톡, 베이비챗)
+- slots: 인스턴스에 __dict__가 없어 대량 크롤링/재파싱 시 메모리 절약
+- frozen: 파싱 후 값이 바뀌지 않음 (스레드/프로세스 간에 그대로 전달)
+- to_row(): DB insert 행, to_dict(): JSON 직렬화용 dict
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class CrawledPost:
+    """크롤링된 게시글 데이터"""
+    post_id: str
+    gallery_id: str
+    title: str
+    author: Optional[str]
+    created_at: Optional[datetime]
+    view_count: int
+    recommend_count: int
+    comment_count: int
+    url: str
+    
+    def to_row(self, crawled_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """posts 테이블 insert 행"""
+        return {
+            "crawled_at": crawled_at or datetime.utcnow(),
+            "post_id": self.post_id,
+            "gallery_id": self.gallery_id,
+            "title": self.title,
+            "author": self.author,
+            "created_at": self.created_at,
+            "view_count": self.view_count,
+            "recommend_count": self.recommend_count,
+            "comment_count": self.comment_count,
+            "url": self.url,
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화용 dict (작성 시각은 ISO 문자열)"""
+        return {
+            "post_id": self.post_id,
+            "gallery_id": self.gallery_id,
+            "title": self.title,
+            "author": self.author,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "view_count": self.view_count,
+            "recommend_count": self.recommend_count,
+            "comment_count": self.comment_count,
+            "url": self.url,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class CharacterData:
+    """캐릭터 데이터"""
+    character_id: str
+    rank: int
+    name: str
+    author: Optional[str]
+    views: int
+    tags: Optional[List[str]]
+    description: Optional[str]
+    thumbnail_url: Optional[str]
+    character_url: Optional[str]
+    
+    def to_row(self, service: str, period: str = "daily", crawled_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """chat_service_characters 테이블 insert 행"""
+        return {
+            "service": service,
+            "period": period,
+            "character_id": self.character_id,
+            "rank": self.rank,
+            "name": self.name,
+            "author": self.author,
+            "views": self.views,
+            "tags": self.tags,
+            "description": self.description,
+            "thumbnail_url": self.thumbnail_url,
+            "character_url": self.character_url,
+            "crawled_at": crawled_at or datetime.utcnow(),
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화용 dict"""
+        return {
+            "character_id": self.character_id,
+            "rank": self.rank,
+            "name": self.name,
+            "author": self.author,
+            "views": self.views,
+            "tags": self.tags,
+            "description": self.description,
+            "thumbnail_url": self.thumbnail_url,
+            "character_url": self.character_url,
+        }
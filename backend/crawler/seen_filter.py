@@ -0,0 +1,176 @@
+"""
+저장된 게시글 키 (갤러리 id, 게시글 번호)의 Bloom filter
+- "없음"은 확실하고 "있음"은 오탐(false positive)이 있을 수 있음
+  - 없음: 처음 보는 게시글이므로 DB 조회 없이 바로 저장
+  - 있음: DB에서 정확히 확인 (저장은 커밋 전에 필터에 반영되므로 롤백되거나 DB를 초기화해도 게시글을 잃지 않음)
+- 필터가 실제 DB보다 뒤처져도(다른 프로세스가 저장한 게시글) 조회가 한 번 늘 뿐 결과는 같음
+- crawl_state_dir의 파일로 저장해 다음 실행에서 이어서 사용
+  - 크기/해시 수가 같은 필터는 비트 OR로 합칠 수 있으므로 저장할 때 파일의 필터와 합침 (여러 프로세스가 같은 파일 사용)
+- 크기는 seen_filter_capacity개를 seen_filter_error_rate 오탐률로 담을 수 있게 정함 (기본 200만 개, 약 3.6MB)
+"""
+import hashlib
+import logging
+import math
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE_NAME = "seen_posts.bloom"
+# 저장 간격 (필터 전체를 다시 쓰므로 배치마다 저장하지 않음)
+SAVE_INTERVAL_SECONDS = 60.0
+# 파일 헤더: 식별자, 비트 수, 해시 수, 추가한 키 수
+_MAGIC = b"SEENBF01"
+_HEADER = struct.Struct("<8sQIQ")
+
+PostKey = Tuple[str, str]
+
+
+def _key_bytes(key: PostKey) -> bytes:
+    gallery_id, post_id = key
+    return f"{gallery_id}\x00{post_id}".encode("utf-8")
+
+
+class BloomFilter:
+    """비트 배열 + double hashing (blake2b 128비트를 64비트 두 개로 나눠 k개의 위치 계산)"""
+    
+    def __init__(self, bits: int, hashes: int, count: int = 0, data: Optional[bytearray] = None):
+        self.bits = bits
+        self.hashes = hashes
+        self.count = count  # 추가한 키 수 (이미 있던 키는 세지 않음 - 용량 경고용)
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+    
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """capacity개를 넣었을 때 오탐률이 error_rate가 되는 크기"""
+        capacity = max(capacity, 1)
+        bits = max(int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)), 8)
+        hashes = max(int(round(bits / capacity * math.log(2))), 1)
+        return cls(bits, hashes)
+    
+    def _positions(self, value: bytes) -> Iterable[int]:
+        digest = hashlib.blake2b(value, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+    
+    def add(self, value: bytes) -> bool:
+        """키 추가 (새로 켠 비트가 있으면 True)"""
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self.data[position >> 3] & mask:
+                self.data[position >> 3] |= mask
+                added = True
+        self.count += added
+        return added
+    
+    def __contains__(self, value: bytes) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+    
+    def merge(self, other: "BloomFilter") -> None:
+        """다른 필터의 키를 모두 포함하도록 합침 (크기/해시 수가 같아야 함)"""
+        if (other.bits, other.hashes) != (self.bits, self.hashes):
+            raise ValueError("크기가 다른 Bloom filter는 합칠 수 없습니다")
+        merged = int.from_bytes(self.data, "little") | int.from_bytes(other.data, "little")
+        self.data = bytearray(merged.to_bytes(len(self.data), "little"))
+        self.count = max(self.count, other.count)
+    
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_MAGIC, self.bits, self.hashes, self.count) + bytes(self.data)
+    
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "BloomFilter":
+        magic, bits, hashes, count = _HEADER.unpack_from(raw)
+        data = bytearray(raw[_HEADER.size:])
+        if magic != _MAGIC or len(data) != (bits + 7) // 8:
+            raise ValueError("Bloom filter 파일 형식이 아닙니다")
+        return cls(bits, hashes, count, data)
+
+
+class SeenPosts:
+    """저장된 게시글 키 필터 (파일 저장/복원)"""
+    
+    def __init__(self, capacity: int = 2_000_000, error_rate: float = 0.001,
+                 state_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            capacity: 오탐률을 지킬 수 있는 최대 게시글 수
+            error_rate: 오탐률 (있다고 답했지만 실제로는 없는 비율 - 그만큼 DB 조회가 늘어남)
+            state_path: 필터를 저장할 파일 (None이면 저장하지 않음)
+        """
+        self.capacity = capacity
+        self.state_path = Path(state_path) if state_path else None
+        self.filter = BloomFilter.for_capacity(capacity, error_rate)
+        self.loaded = self._load()  # 저장된 필터를 불러왔는지 (아니면 DB에서 채워야 함)
+        self._dirty = False
+        self._warned = False
+        self._saved_at = time.monotonic()
+    
+    @classmethod
+    def from_settings(cls) -> "SeenPosts":
+        settings = get_settings()
+        return cls(
+            capacity=settings.seen_filter_capacity,
+            error_rate=settings.seen_filter_error_rate,
+            state_path=Path(settings.crawl_state_dir) / STATE_FILE_NAME,
+        )
+    
+    def add_many(self, keys: Iterable[PostKey]) -> None:
+        for key in keys:
+            self._dirty |= self.filter.add(_key_bytes(key))
+        if self.filter.count > self.capacity and not self._warned:
+            self._warned = True
+            logger.warning(f"저장된 게시글 필터가 용량({self.capacity:,}개)을 넘었습니다 - "
+                           f"오탐이 늘어 DB 조회가 많아집니다 (seen_filter_capacity를 늘리세요)")
+    
+    def might_contain(self, key: PostKey) -> bool:
+        """False면 확실히 처음 보는 게시글"""
+        return _key_bytes(key) in self.filter
+    
+    def _read(self) -> Optional[BloomFilter]:
+        if not self.state_path or not self.state_path.exists():
+            return None
+        try:
+            stored = BloomFilter.from_bytes(self.state_path.read_bytes())
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"저장된 게시글 필터 파일을 읽지 못했습니다: {self.state_path} ({e})")
+            return None
+        if (stored.bits, stored.hashes) != (self.filter.bits, self.filter.hashes):
+            logger.info("저장된 게시글 필터 크기가 설정과 달라 새로 만듭니다")
+            return None
+        return stored
+    
+    def _load(self) -> bool:
+        stored = self._read()
+        if stored is None:
+            return False
+        self.filter = stored
+        return True
+    
+    def save(self, min_interval: float = 0.0) -> None:
+        """
+        필터를 파일로 저장 (그 사이 다른 프로세스가 저장한 필터와 합침)
+        
+        Args:
+            min_interval: 마지막 저장 후 이 시간(초)이 지나지 않았으면 저장하지 않음
+        """
+        if not self.state_path or not self._dirty or time.monotonic() - self._saved_at < min_interval:
+            return
+        self._saved_at = time.monotonic()
+        stored = self._read()
+        if stored is not None:
+            self.filter.merge(stored)
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(self.filter.to_bytes())
+            os.replace(temp_path, self.state_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"저장된 게시글 필터를 저장하지 못했습니다: {self.state_path} ({e})")
@@ -0,0 +1,278 @@
+"""
+크롤링 계측 (요청/파싱 지표)
+- 요청: 호스트별 지연 시간 히스토그램, 응답 코드별 횟수, 받은 바이트, 재시도 횟수
+- 파싱: 파서별 파싱 시간 히스토그램, 페이지당 행 수, 페이지 캐시로 파싱을 생략한 페이지 수
+- 브라우저 렌더링: 호스트별 렌더링 시간 히스토그램
+- 프로세스 전체 누적값은 metrics (API /metrics 에서 Prometheus 텍스트 형식으로 노출)
+- crawl_run(): 크롤링 한 번의 지표만 따로 모아 끝날 때 JSON 요약 파일로 저장 (crawl_state_dir/runs)
+  (contextvars 기반이라 동시에 도는 다른 크롤링의 지표와 섞이지 않음)
+- 외부 패키지 없이 동작 (prometheus_client 불필요)
+"""
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 구간 상한 (Prometheus le 값)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+ROWS_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250)
+
+RUNS_DIR_NAME = "runs"
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 구조)"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> float:
+        """구간 안 선형 보간으로 추정한 분위수 (Prometheus histogram_quantile과 같은 방식)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class CrawlMetrics:
+    """크롤링 지표 모음"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.utcnow()
+        self.request_latency: Dict[str, Histogram] = {}
+        self.request_statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.response_bytes: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.parse_time: Dict[str, Histogram] = {}
+        self.parse_rows: Dict[str, Histogram] = {}
+        self.parse_skipped: Dict[str, int] = defaultdict(int)
+        self.render_time: Dict[str, Histogram] = {}
+    
+    def observe_request(self, host: str, status: Optional[int], seconds: float, size: int) -> None:
+        """요청 한 번 (status가 None이면 연결 오류)"""
+        with self._lock:
+            self.request_latency.setdefault(host, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.request_statuses[host][str(status) if status is not None else "error"] += 1
+            self.response_bytes[host] += size
+    
+    def observe_retry(self, host: str) -> None:
+        with self._lock:
+            self.retries[host] += 1
+    
+    def observe_parse(self, parser: str, seconds: float, rows: int) -> None:
+        """페이지 하나 파싱"""
+        with self._lock:
+            self.parse_time.setdefault(parser, Histogram(PARSE_BUCKETS)).observe(seconds)
+            self.parse_rows.setdefault(parser, Histogram(ROWS_BUCKETS)).observe(rows)
+    
+    def observe_parse_skipped(self, parser: str) -> None:
+        """바뀌지 않은 페이지라 파싱 생략"""
+        with self._lock:
+            self.parse_skipped[parser] += 1
+    
+    def observe_render(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self.render_time.setdefault(host, Histogram(LATENCY_BUCKETS)).observe(seconds)
+    
+    def summary(self) -> Dict[str, Any]:
+        """호스트/파서별 요약 (JSON 직렬화용, 시간은 밀리초)"""
+        with self._lock:
+            hosts = {}
+            for host, latency in self.request_latency.items():
+                hosts[host] = {
+                    "requests": latency.count,
+                    "statuses": dict(self.request_statuses[host]),
+                    "bytes": self.response_bytes[host],
+                    "retries": self.retries.get(host, 0),
+                    "latency_ms": _latency_summary(latency),
+                }
+                if host in self.render_time:
+                    hosts[host]["render_ms"] = _latency_summary(self.render_time[host])
+            for host, render in self.render_time.items():
+                hosts.setdefault(host, {"render_ms": _latency_summary(render)})
+            
+            parsers = {}
+            for parser, parse_time in self.parse_time.items():
+                rows = self.parse_rows[parser]
+                parsers[parser] = {
+                    "pages": parse_time.count,
+                    "rows": int(rows.sum),
+                    "rows_per_page": round(rows.sum / rows.count, 1) if rows.count else 0.0,
+                    "skipped": self.parse_skipped.get(parser, 0),
+                    "parse_ms": _latency_summary(parse_time),
+                }
+            for parser, skipped in self.parse_skipped.items():
+                parsers.setdefault(parser, {"pages": 0, "rows": 0, "skipped": skipped})
+        return {"hosts": hosts, "parsers": parsers}
+    
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            _histogram_lines(lines, "crawl_request_duration_seconds", "요청 지연 시간 (속도 제한 대기 제외)",
+                             "host", self.request_latency)
+            lines.append("# HELP crawl_requests_total 응답 코드별 요청 수 (error: 연결 오류)")
+            lines.append("# TYPE crawl_requests_total counter")
+            for host, statuses in self.request_statuses.items():
+                for status, count in statuses.items():
+                    lines.append(f'crawl_requests_total{{host="{_escape(host)}",status="{status}"}} {count}')
+            _counter_lines(lines, "crawl_response_bytes_total", "받은 본문 바이트", "host", self.response_bytes)
+            _counter_lines(lines, "crawl_retries_total", "재시도 횟수", "host", self.retries)
+            _histogram_lines(lines, "crawl_parse_duration_seconds", "페이지 파싱 시간", "parser", self.parse_time)
+            _histogram_lines(lines, "crawl_parse_rows", "페이지당 파싱된 행 수", "parser", self.parse_rows)
+            _counter_lines(lines, "crawl_parse_skipped_total", "바뀌지 않아 파싱을 생략한 페이지 수", "parser",
+                           self.parse_skipped)
+            _histogram_lines(lines, "crawl_render_duration_seconds", "브라우저 렌더링 시간", "host", self.render_time)
+        return "\n".join(lines) + "\n"
+
+
+def _latency_summary(histogram: Histogram) -> Dict[str, float]:
+    return {
+        "count": histogram.count,
+        "mean": round(histogram.sum / histogram.count * 1000, 1) if histogram.count else 0.0,
+        "p50": round(histogram.quantile(0.50) * 1000, 1),
+        "p99": round(histogram.quantile(0.99) * 1000, 1),
+        "total": round(histogram.sum * 1000, 1),
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_le(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() and bound >= 1 else repr(float(bound))
+
+
+def _histogram_lines(lines: List[str], name: str, help_text: str, label: str,
+                     histograms: Dict[str, Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in histograms.items():
+        label_value = _escape(key)
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{label_value}",le="{_format_le(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label}="{label_value}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{{label}="{label_value}"}} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{{{label}="{label_value}"}} {histogram.count}')
+
+
+def _counter_lines(lines: List[str], name: str, help_text: str, label: str, values: Dict[str, int]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for key, value in values.items():
+        lines.append(f'{name}{{{label}="{_escape(key)}"}} {value}')
+
+
+# 프로세스 전체 누적 지표 (API /metrics)
+metrics = CrawlMetrics()
+# 현재 크롤링 실행의 지표 (crawl_run 안에서 만든 태스크에 전달됨)
+_current_run: ContextVar[Optional[CrawlMetrics]] = ContextVar("crawl_run_metrics", default=None)
+
+
+def _sinks() -> Tuple[CrawlMetrics, ...]:
+    run = _current_run.get()
+    return (metrics, run) if run is not None else (metrics,)
+
+
+def record_request(host: str, status: Optional[int], seconds: float, size: int) -> None:
+    for sink in _sinks():
+        sink.observe_request(host, status, seconds, size)
+
+
+def record_retry(host: str) -> None:
+    for sink in _sinks():
+        sink.observe_retry(host)
+
+
+def record_parse(parser: str, seconds: float, rows: int) -> None:
+    for sink in _sinks():
+        sink.observe_parse(parser, seconds, rows)
+
+
+def record_parse_skipped(parser: str) -> None:
+    for sink in _sinks():
+        sink.observe_parse_skipped(parser)
+
+
+def record_render(host: str, seconds: float) -> None:
+    for sink in _sinks():
+        sink.observe_render(host, seconds)
+
+
+def write_run_summary(name: str, run: CrawlMetrics, finished_at: datetime, elapsed: float,
+                      runs_dir: Optional[Path] = None) -> Path:
+    """실행 요약 JSON 저장 (crawl_state_dir/runs/{이름}-{시각}.json)"""
+    runs_dir = runs_dir or Path(get_settings().crawl_state_dir) / RUNS_DIR_NAME
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    summary = {
+        "run": name,
+        "started_at": run.started_at.isoformat(),
+        "finished_at": finished_at.isoformat(),
+        "elapsed_seconds": round(elapsed, 3),
+        **run.summary(),
+    }
+    path = runs_dir / f"{name}-{finished_at.strftime('%Y%m%dT%H%M%S')}.json"
+    path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+@contextmanager
+def crawl_run(name: str) -> Iterator[CrawlMetrics]:
+    """
+    크롤링 한 번의 지표를 따로 모으고 끝나면 JSON 요약 저장
+    
+    with 블록 안(과 그 안에서 만든 태스크)의 요청/파싱만 집계됨
+    """
+    run = CrawlMetrics()
+    token = _current_run.set(run)
+    started = time.perf_counter()
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        elapsed = time.perf_counter() - started
+        try:
+            path = write_run_summary(name, run, datetime.utcnow(), elapsed)
+            logger.info(f"[계측] {name} 실행 요약 저장: {path}")
+        except OSError as e:
+            logger.warning(f"[계측] 실행 요약 저장 실패: {e}")
+        summary = run.summary()
+        for host, data in summary["hosts"].items():
+            if "requests" in data:
+                logger.info(f"[계측] {host}: 요청 {data['requests']}회, p50 {data['latency_ms']['p50']}ms / "
+                            f"p99 {data['latency_ms']['p99']}ms, {data['bytes']:,}바이트, 재시도 {data['retries']}회")
+        skipped = sum(data["skipped"] for data in summary["parsers"].values())
+        if skipped:
+            logger.info(f"[계측] {name}: 바뀌지 않은 페이지 {skipped}개 파싱 생략")
@@ -1,32 +1,25 @@
 """
 제타(Zeta) AI 캐릭터 크롤러
+- 페이지에 포함된 Next.js 하이드레이션 JSON이 있으면 그걸 사용 (작성자/썸네일/정확한 조회수 포함)
+- 없으면 링크 텍스트 패턴으로 DOM에서 파싱
 """
 import asyncio
 import re
 from datetime import datetime
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
 
-import httpx
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 
-logger = logging.getLogger(__name__)
-
+from crawler.embedded_json import CharacterFields, extract_payloads, find_characters
+from crawler.http_client import HttpClientRegistry, shared_or_owned
+from crawler.page_cache import UNCHANGED, PageText, PendingPage, Unchanged
+from crawler.parse_pool import parser_name, run_parse
+from crawler.records import CharacterData
+from crawler.telemetry import record_parse_skipped
 
-@dataclass
-class CharacterData:
-    """캐릭터 데이터"""
-    character_id: str
-    rank: int
-    name: str
-    author: Optional[str]
-    views: int
-    tags: Optional[List[str]]
-    description: Optional[str]
-    thumbnail_url: Optional[str]
-    character_url: Optional[str]
+logger = logging.getLogger(__name__)
 
 
 class ZetaCrawler:
@@ -34,164 +27,241 @@ class ZetaCrawler:
     BASE_URL = "https://zeta-ai.io"
     RANKING_URL = f"{BASE_URL}/ko"
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClientRegistry] = None):
+        self.http = http
         self.ua = UserAgent()
         self.delay = 1.5
         self.max_retries = 3
     
-    async def _fetch_html(self, url: str) -> Optional[str]:
-        """HTML 가져오기"""
+    async def _fetch_html(self, url: str, http: HttpClientRegistry,
+                          conditional: bool = False) -> Union[str, Unchanged, None]:
+        """HTML 가져오기 (conditional이면 페이지 캐시로 조건부 요청 - 바뀌지 않았으면 UNCHANGED)"""
         headers = {
             "User-Agent": self.ua.random,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
         }
         
-        for attempt in range(self.max_retries):
-            try:
-                async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-                    response = await client.get(url, headers=headers)
-                    response.raise_for_status()
-                    await asyncio.sleep(self.delay)
-                    return response.text
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP 오류 {url}: {e.response.status_code}")
-            except httpx.RequestError as e:
-                logger.error(f"요청 오류 {url}: {e}")
-            except Exception as e:
-                logger.error(f"예상치 못한 오류 {url}: {e}")
-            
-            if attempt < self.max_retries - 1:
-                logger.warning(f"재시도 중... ({attempt + 1}/{self.max_retries})")
-                await asyncio.sleep(self.delay * (attempt + 1))
-        
-        return None
+        return await http.fetch_text(url, max_retries=self.max_retries, headers=headers, follow_redirects=True,
+                                     archive_meta={"kind": "zeta_ranking"}, conditional=conditional)
     
     def _parse_views(self, view_text: str) -> int:
         """조회수 파싱 (예: "3,884만" -> 38840000, "24.2만" -> 242000)"""
-        try:
-            view_text = view_text.replace(",", "").strip()
-            
-            if "만" in view_text:
-                number = float(view_text.replace("만", ""))
-                return int(number * 10000)
-            
-            if "천" in view_text:
-                number = float(view_text.replace("천", ""))
-                return int(number * 1000)
-            
-            return int(view_text)
-        except ValueError:
-            logger.warning(f"조회수 파싱 실패: {view_text}")
-            return 0
+        return parse_views(view_text)
     
     def _extract_character_id(self, url: str) -> str:
         """URL에서 캐릭터 ID 추출"""
-        match = re.search(r'/plots/([^/]+)/profile', url)
-        if match:
-            return match.group(1)
-        return url
+        return extract_character_id(url)
     
-    async def crawl_rankings(self, limit: int = 30) -> List[CharacterData]:
-        """인기 캐릭터 순위 크롤링"""
+    async def crawl_rankings(self, limit: int = 30, conditional: bool = False) -> List[CharacterData]:
+        """
+        인기 캐릭터 순위 크롤링
+        
+        conditional이면 이전 크롤링과 같은 페이지는 파싱하지 않고 빈 목록 반환 (저장된 순위 유지)
+        """
         logger.info(f"제타 크롤링 시작 (상위 {limit}개)")
         
-        html = await self._fetch_html(self.RANKING_URL)
+        async with shared_or_owned(self.http, self.delay) as http:
+            html = await self._fetch_html(self.RANKING_URL, http, conditional)
+        if html is UNCHANGED:
+            record_parse_skipped(parser_name(parse_rankings))
+            logger.info("제타 랭킹 변경 없음 - 파싱 생략")
+            return []
         if not html:
             logger.error("HTML을 가져오지 못했습니다.")
             return []
         
-        soup = BeautifulSoup(html, "html.parser")
-        characters = []
+        characters = await run_parse(parse_rankings, str(html), limit)
+        logger.info(f"제타 크롤링 완료: {len(characters)}개 수집")
+        if isinstance(html, PageText):
+            # 저장을 마친 뒤 page_cache.confirm_pages로 확정
+            return PendingPage(characters, html)
+        return characters
+
+
+def parse_views(view_text: str) -> int:
+    """조회수 파싱 (예: "3,884만" -> 38840000, "24.2만" -> 242000)"""
+    try:
+        view_text = view_text.replace(",", "").strip()
+        
+        if "만" in view_text:
+            number = float(view_text.replace("만", ""))
+            return int(number * 10000)
+        
+        if "천" in view_text:
+            number = float(view_text.replace("천", ""))
+            return int(number * 1000)
+        
+        return int(view_text)
+    except ValueError:
+        logger.warning(f"조회수 파싱 실패: {view_text}")
+        return 0
+
+
+def extract_character_id(url: str) -> str:
+    """URL에서 캐릭터 ID 추출"""
+    match = re.search(r'/plots/([^/]+)/profile', url)
+    if match:
+        return match.group(1)
+    return url
+
+
+# 하이드레이션 JSON의 캐릭터(plot) 객체 필드 이름
+ZETA_FIELDS = CharacterFields(
+    id=("plotId",),
+    name=("name", "title"),
+    views=("interactionCountWithRegen", "interactionCount", "chatCount"),
+    description=("shortDescription", "description"),
+    author=("creator.nickname", "creatorNickname"),
+    thumbnail=("imageUrl", "thumbnailUrl", "profileImageUrl"),
+    tags=("hashtags", "tags"),
+)
+
+PLOT_HREF_RE = re.compile(r'/ko/plots/[^/]+/profile')
+VIEWS_TEXT_RE = re.compile(r'^[\d,\.]+[만천]?$')
+
+
+def _parse_tags(name_link) -> Optional[List[str]]:
+    """이름 링크의 부모에서 '#'로 시작하는 태그 텍스트 찾기"""
+    parent = name_link.parent
+    if not parent:
+        return None
+    for div in parent.find_all('div'):
+        div_text = div.get_text(strip=True)
+        if div_text and div_text.startswith('#'):
+            # '#'로 구분하여 태그 리스트 생성
+            return [t.strip() for t in div_text.split('#') if t.strip()]
+    return None
+
+
+def parse_rankings(html: str, limit: int = 30) -> List[CharacterData]:
+    """
+    랭킹 페이지 HTML에서 캐릭터 순위 파싱 (하이드레이션 JSON 우선, 없으면 DOM)
+    
+    Args:
+        html: 제타 메인(랭킹) 페이지 HTML
+        limit: 수집할 캐릭터 수
+    """
+    characters = parse_rankings_json(html, limit)
+    if characters is not None:
+        return characters
+    logger.info("하이드레이션 JSON에서 캐릭터를 찾지 못해 DOM에서 파싱합니다.")
+    return parse_rankings_dom(html, limit)
+
+
+def parse_rankings_json(html: str, limit: int = 30) -> Optional[List[CharacterData]]:
+    """
+    페이지에 포함된 하이드레이션 JSON(__NEXT_DATA__ 등)에서 캐릭터 순위 파싱
+    
+    Returns:
+        캐릭터 목록 (JSON이 없거나 캐릭터를 찾지 못하면 None)
+    """
+    found = find_characters(extract_payloads(html), ZETA_FIELDS, limit)
+    if not found:
+        return None
+    
+    logger.info(f"하이드레이션 JSON에서 캐릭터 {len(found)}개 발견")
+    return [
+        CharacterData(
+            character_id=item["id"],
+            rank=rank,
+            name=item["name"],
+            author=item["author"],
+            views=item["views"],
+            tags=item["tags"],
+            description=item["description"],
+            thumbnail_url=item["thumbnail"],
+            character_url=f"{ZetaCrawler.BASE_URL}/ko/plots/{item['id']}/profile",
+        )
+        for rank, item in enumerate(found, start=1)
+    ]
+
+
+def parse_rankings_dom(html: str, limit: int = 30) -> List[CharacterData]:
+    """
+    랭킹 페이지 HTML의 DOM에서 캐릭터 순위 파싱
+    
+    캐릭터마다 조회수 링크와 이름 링크가 같은 href로 따로 있어서,
+    문서를 한 번 훑으며 링크를 href별로 모아둔 뒤 조회수 링크 순서대로 짝을 맞춤
+    (조회수 링크마다 문서 전체를 다시 검색하지 않으므로 카드 수에 비례하는 시간)
+    
+    Args:
+        html: 제타 메인(랭킹) 페이지 HTML
+        limit: 수집할 캐릭터 수
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    characters = []
+    
+    # 모든 링크를 한 번만 훑어서 href별로 (링크, 텍스트) 목록을 만듦 (문서 순서 유지)
+    links_by_href: Dict[str, List[Tuple[Any, str]]] = {}
+    plot_links = []
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        entry = (link, link.get_text(strip=True))
+        links_by_href.setdefault(href, []).append(entry)
+        # /ko/plots/{UUID}/profile 형식의 링크
+        if PLOT_HREF_RE.search(href):
+            plot_links.append((href, entry))
+    logger.info(f"발견된 캐릭터 링크: {len(plot_links)}개")
+    
+    # 중복 제거를 위해 이미 처리한 캐릭터 ID 추적
+    seen_ids = set()
+    rank = 1
+    
+    for href, (link, text) in plot_links:
+        if rank > limit:
+            break
         
-        # /ko/plots/{UUID}/profile 형식의 링크 찾기
-        plot_links = soup.find_all('a', href=re.compile(r'/ko/plots/[^/]+/profile'))
-        logger.info(f"발견된 캐릭터 링크: {len(plot_links)}개")
+        char_id = extract_character_id(href)
         
-        # 중복 제거를 위해 이미 처리한 캐릭터 ID 추적
-        seen_ids = set()
-        rank = 1
+        # 중복 체크
+        if char_id in seen_ids:
+            continue
         
-        for link in plot_links:
-            if rank > limit:
-                break
+        try:
+            # 조회수 링크인지 확인 (숫자만 있는 텍스트)
+            if not VIEWS_TEXT_RE.match(text):
+                continue
             
-            href = link.get('href', '')
-            char_id = self._extract_character_id(href)
+            views = parse_views(text)
             
-            # 중복 체크
-            if char_id in seen_ids:
+            # 같은 href를 가진 다른 링크에서 이름 링크 찾기 (조회수가 아닌 링크)
+            name_link = next((l for l, l_text in links_by_href[href] if l_text != text), None)
+            if not name_link:
                 continue
             
-            try:
-                text = link.get_text(strip=True)
-                
-                # 조회수 링크인지 확인 (숫자만 있는 텍스트)
-                if not re.match(r'^[\d,\.]+[만천]?$', text):
-                    continue
-                
-                views = self._parse_views(text)
-                
-                # 같은 href를 가진 다른 링크에서 이름 링크 찾기
-                all_same_href = soup.find_all('a', href=href)
-                name_link = None
-                for l in all_same_href:
-                    l_text = l.get_text(strip=True)
-                    if l_text != text:  # 조회수가 아닌 링크
-                        name_link = l
-                        break
-                
-                if not name_link:
-                    continue
-                
-                # 이름 링크에서 span 요소들 추출
-                spans = name_link.find_all('span')
-                if len(spans) < 2:
-                    continue
-                
-                name = spans[0].get_text(strip=True)
-                description = spans[1].get_text(strip=True) if len(spans) > 1 else None
-                
-                if not name:
-                    continue
-                
-                # 태그 추출 (부모에서 찾기)
-                tags = None
-                parent = name_link.parent
-                if parent:
-                    # 부모 내의 모든 div를 검색하여 '#'로 시작하는 텍스트 찾기
-                    all_divs = parent.find_all('div')
-                    for div in all_divs:
-                        div_text = div.get_text(strip=True)
-                        if div_text and div_text.startswith('#'):
-                            # '#'로 구분하여 태그 리스트 생성
-                            tags = [t.strip() for t in div_text.split('#') if t.strip()]
-                            break
-                
-                character_url = f"{self.BASE_URL}{href}"
-                
-                characters.append(CharacterData(
-                    character_id=char_id,
-                    rank=rank,
-                    name=name,
-                    author=None,
-                    views=views,
-                    tags=tags,
-                    description=description,
-                    thumbnail_url=None,
-                    character_url=character_url
-                ))
-                
-                seen_ids.add(char_id)
-                rank += 1
-                logger.debug(f"#{rank-1} {name} - {views:,}회")
+            # 이름 링크에서 span 요소들 추출
+            spans = name_link.find_all('span')
+            if len(spans) < 2:
+                continue
             
-            except Exception as e:
-                logger.warning(f"캐릭터 파싱 중 오류: {e}")
+            name = spans[0].get_text(strip=True)
+            description = spans[1].get_text(strip=True) if len(spans) > 1 else None
+            
+            if not name:
                 continue
+            
+            characters.append(CharacterData(
+                character_id=char_id,
+                rank=rank,
+                name=name,
+                author=None,
+                views=views,
+                tags=_parse_tags(name_link),
+                description=description,
+                thumbnail_url=None,
+                character_url=f"{ZetaCrawler.BASE_URL}{href}"
+            ))
+            
+            seen_ids.add(char_id)
+            rank += 1
+            logger.debug(f"#{rank-1} {name} - {views:,}회")
         
-        logger.info(f"제타 크롤링 완료: {len(characters)}개 수집")
-        return characters
+        except Exception as e:
+            logger.warning(f"캐릭터 파싱 중 오류: {e}")
+            continue
+    
+    return characters
 
 
 # 테스트용 코드
@@ -16,7 +16,7 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.database import (
     Post, PostKeyword, DailyReport, CharacterMention, 
-    ChatServiceCharacter, AsyncSessionLocal, init_db
+    ChatServiceCharacter, AsyncSessionLocal, init_db, latest_characters_condition
 )
 
 
@@ -117,23 +117,15 @@ async def export_chat_characters(session: AsyncSession, output_dir: Path):
     """챗봇 캐릭터 랭킹 export"""
     print("🤖 챗봇 캐릭터 export 중...")
     
-    # 최근 크롤링 데이터 시간 확인
-    recent_crawl_query = select(func.max(ChatServiceCharacter.crawled_at))
-    result = await session.execute(recent_crawl_query)
-    recent_crawl_time = result.scalar()
+    # 서비스별 최근 크롤링 데이터 (API와 같은 기준)
+    latest = await latest_characters_condition(session, "daily")
     
-    if not recent_crawl_time:
+    if latest is None:
         data = []
     else:
-        # 최근 5분 이내의 데이터 조회
-        time_threshold = recent_crawl_time - timedelta(minutes=5)
-        
         query = (
             select(ChatServiceCharacter)
-            .where(
-                ChatServiceCharacter.crawled_at >= time_threshold,
-                ChatServiceCharacter.crawled_at <= recent_crawl_time
-            )
+            .where(ChatServiceCharacter.period == "daily", latest)
             .order_by(ChatServiceCharacter.service, ChatServiceCharacter.rank)
             .limit(100)
         )
@@ -145,6 +137,7 @@ async def export_chat_characters(session: AsyncSession, output_dir: Path):
             data.append({
                 "id": char.id,
                 "service": char.service,
+                "period": char.period,
                 "character_id": char.character_id,
                 "rank": char.rank,
                 "name": char.name,
@@ -167,19 +160,15 @@ async def export_popular_tags(session: AsyncSession, output_dir: Path):
     """인기 해시태그 export"""
     print("🏷️  인기 해시태그 export 중...")
     
-    # 최근 크롤링 데이터 시간 확인
-    recent_crawl_query = select(func.max(ChatServiceCharacter.crawled_at))
-    result = await session.execute(recent_crawl_query)
-    recent_crawl_time = result.scalar()
+    # 서비스별 최근 크롤링 데이터 (API와 같은 기준)
+    latest = await latest_characters_condition(session, "daily")
     
-    if not recent_crawl_time:
+    if latest is None:
         data = []
     else:
-        time_threshold = recent_crawl_time - timedelta(minutes=5)
-        
         query = select(ChatServiceCharacter.tags).where(
-            ChatServiceCharacter.crawled_at >= time_threshold,
-            ChatServiceCharacter.crawled_at <= recent_crawl_time,
+            ChatServiceCharacter.period == "daily",
+            latest,
             ChatServiceCharacter.tags.isnot(None)
         )
         result = await session.execute(query)
@@ -352,7 +341,7 @@ async def main():
             print("=" * 60)
             print("✅ 모든 데이터 Export 완료!")
             print("=" * 60)
-            
+        
         except Exception as e:
             print(f"❌ Export 실패: {e}")
             import traceback
@@ -0,0 +1,112 @@
+"""
+대상별 circuit breaker 상태 저장 (crawler/circuit_breaker.py)
+- 크롤링 전에 DB에서 불러오고 끝나면 저장 -> 상태/연속 실패 횟수가 실행과 프로세스(API, 스케줄러, 워커) 사이에 유지됨
+- 상태 필드는 이번 실행에서 바뀐 breaker만 덮어쓰고, 파서 상태 카운터는 이번 실행의 증가분을 더함
+  (여러 워커가 같은 대상을 동시에 처리해도 카운터가 빠지지 않음)
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from crawler.circuit_breaker import CLOSED, HEALTH_COUNTERS, TargetBreaker
+from models.database import CrawlBreaker, get_db_session
+from models.ingestion import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+STATE_FIELDS = ("state", "consecutive_failures", "consecutive_empty", "trips", "opened_at", "open_until",
+                "last_reason", "last_error", "last_success_at")
+
+
+def _target_ids(target_ids: Optional[Iterable[str]]) -> List[str]:
+    if target_ids is not None:
+        return list(target_ids)
+    return [gallery_config["id"] for gallery_config in get_settings().target_galleries]
+
+
+async def load_breakers(session: AsyncSession, target_ids: Optional[Iterable[str]] = None) -> Dict[str, TargetBreaker]:
+    """대상별 breaker (저장된 상태가 없으면 닫힘, target_ids가 없으면 설정된 모든 갤러리)"""
+    target_ids = _target_ids(target_ids)
+    result = await session.execute(select(CrawlBreaker).where(CrawlBreaker.target_id.in_(target_ids)))
+    rows = {row.target_id: row for row in result.scalars().all()}
+    
+    breakers = {}
+    for target_id in target_ids:
+        row = rows.get(target_id)
+        breaker = TargetBreaker(target_id)
+        if row is not None:
+            for name in STATE_FIELDS:
+                setattr(breaker, name, getattr(row, name))
+        breakers[target_id] = breaker
+    return breakers
+
+
+async def save_breakers(session: AsyncSession, breakers: Dict[str, TargetBreaker]) -> None:
+    """breaker 상태 저장 + 카운터 증가분 반영 (커밋은 호출 측에서)"""
+    if not breakers:
+        return
+    now = datetime.utcnow()
+    insert = dialect_insert(session)
+    await session.execute(
+        insert(CrawlBreaker)
+        .values([{"target_id": target_id, "updated_at": now} for target_id in breakers])
+        .on_conflict_do_nothing(index_elements=[CrawlBreaker.target_id])
+    )
+    for target_id, breaker in breakers.items():
+        if not breaker.changed and not breaker.health:
+            continue
+        values = {name: getattr(breaker, name) for name in STATE_FIELDS} if breaker.changed else {}
+        values.update({name: getattr(CrawlBreaker, name) + breaker.health[name] for name in HEALTH_COUNTERS})
+        await session.execute(
+            update(CrawlBreaker).where(CrawlBreaker.target_id == target_id).values(updated_at=now, **values)
+        )
+        breaker.health.clear()
+        breaker.changed = False
+
+
+@asynccontextmanager
+async def tracked_breakers(target_ids: Optional[Iterable[str]] = None) -> AsyncIterator[Dict[str, TargetBreaker]]:
+    """
+    크롤링 동안 쓸 breaker를 불러오고 끝나면(실패해도) 저장
+    
+    사용:
+        async with tracked_breakers() as breakers:
+            await ingest_stream(session, stream_all_targets(..., breakers=breakers))
+    """
+    async with get_db_session() as session:
+        breakers = await load_breakers(session, target_ids)
+    try:
+        yield breakers
+    finally:
+        try:
+            async with get_db_session() as session:
+                await save_breakers(session, breakers)
+        except Exception as e:
+            logger.error(f"circuit breaker 상태를 저장하지 못했습니다: {e}")
+
+
+async def list_breakers(session: AsyncSession) -> List[CrawlBreaker]:
+    """저장된 모든 breaker (대상 id 순)"""
+    result = await session.execute(select(CrawlBreaker).order_by(CrawlBreaker.target_id))
+    return list(result.scalars().all())
+
+
+async def reset_breaker(session: AsyncSession, target_id: str) -> bool:
+    """
+    breaker를 닫힘으로 되돌림 (파서를 고친 뒤 대기 시간 없이 바로 다시 크롤링할 때, 커밋은 호출 측에서)
+    
+    Returns:
+        저장된 breaker가 있었는지
+    """
+    result = await session.execute(
+        update(CrawlBreaker)
+        .where(CrawlBreaker.target_id == target_id)
+        .values(state=CLOSED, consecutive_failures=0, consecutive_empty=0, trips=0, opened_at=None,
+                open_until=None, updated_at=datetime.utcnow())
+    )
+    return result.rowcount == 1
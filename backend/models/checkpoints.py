@@ -0,0 +1,113 @@
+"""
+크롤링 진행 위치(체크포인트) 저장
+- 백필처럼 수천 페이지를 도는 크롤링이 재시작 후 마지막으로 저장한 페이지 다음부터 이어서 진행
+- 게시글 저장과 같은 트랜잭션에서 갱신하므로 체크포인트가 저장된 데이터보다 앞서지 않음
+- 재시작 사이에 새 글이 올라오면 게시글이 뒤 페이지로 밀리므로, 같은 페이지 번호에서 이어가면
+  일부 게시글을 다시 볼 뿐 건너뛰지는 않음 (upsert라 다시 저장해도 안전)
+"""
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crawler.records import CrawledPost
+from models.database import CrawlCheckpoint
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "active"
+DONE = "done"
+
+
+async def start_checkpoint(session: AsyncSession, name: str, target_id: str, last_page: int,
+                           until_date: Optional[datetime] = None, reset: bool = False) -> CrawlCheckpoint:
+    """
+    체크포인트 조회 (없거나 reset이면 1페이지부터 새로 시작, 커밋은 호출 측에서)
+    
+    이어서 진행할 때도 범위(last_page)와 종료 날짜(until_date)는 이번 값으로 바꿈
+    (범위를 더 과거로 늘리면 완료된 체크포인트도 멈춘 곳부터 다시 진행)
+    """
+    result = await session.execute(select(CrawlCheckpoint).where(CrawlCheckpoint.name == name))
+    checkpoint = result.scalar_one_or_none()
+    now = datetime.utcnow()
+    
+    if checkpoint is None:
+        checkpoint = CrawlCheckpoint(name=name, target_id=target_id, pages_done=0, posts_saved=0)
+        session.add(checkpoint)
+        reset = True
+    elif checkpoint.status == DONE and _extends(checkpoint, last_page, until_date):
+        # 완료된 백필의 범위를 늘림 -> 멈춘 곳부터 다시 진행
+        checkpoint.status = ACTIVE
+        checkpoint.completed_at = None
+    
+    if reset:
+        checkpoint.next_page = 1
+        checkpoint.pages_done = 0
+        checkpoint.posts_saved = 0
+        checkpoint.oldest_post_id = None
+        checkpoint.oldest_created_at = None
+        checkpoint.status = ACTIVE
+        checkpoint.started_at = now
+        checkpoint.completed_at = None
+    
+    checkpoint.last_page = last_page
+    checkpoint.until_date = until_date
+    checkpoint.updated_at = now
+    return checkpoint
+
+
+def _extends(checkpoint: CrawlCheckpoint, last_page: int, until_date: Optional[datetime]) -> bool:
+    """새 범위가 이전 범위보다 더 과거까지 가는지"""
+    if last_page > checkpoint.last_page:
+        return True
+    if checkpoint.until_date is None:
+        return False
+    return until_date is None or until_date < checkpoint.until_date
+
+
+def reached_until(posts: List[CrawledPost], until_date: Optional[datetime]) -> bool:
+    """페이지의 가장 최근 게시글도 until_date보다 오래됐는지 (작성 시각을 모르면 False)"""
+    if until_date is None:
+        return False
+    dates = [post.created_at for post in posts if post.created_at is not None]
+    return bool(dates) and max(dates) < until_date
+
+
+def advance_checkpoint(checkpoint: CrawlCheckpoint, page: int, posts: List[CrawledPost], saved: int) -> bool:
+    """
+    페이지 하나를 저장한 뒤 체크포인트 갱신 (커밋은 게시글 저장과 함께 호출 측에서)
+    
+    Returns:
+        이 페이지로 끝났는지 (마지막 페이지 또는 종료 날짜 도달)
+    """
+    now = datetime.utcnow()
+    checkpoint.next_page = page + 1
+    checkpoint.pages_done += 1
+    checkpoint.posts_saved += saved
+    checkpoint.updated_at = now
+    checkpoint.last_error = None
+    
+    numeric = [post for post in posts if post.post_id.isdigit()]
+    if numeric:
+        oldest = min(numeric, key=lambda post: int(post.post_id))
+        if checkpoint.oldest_post_id is None or int(oldest.post_id) < int(checkpoint.oldest_post_id):
+            checkpoint.oldest_post_id = oldest.post_id
+    dates = [post.created_at for post in posts if post.created_at is not None]
+    if dates and (checkpoint.oldest_created_at is None or min(dates) < checkpoint.oldest_created_at):
+        checkpoint.oldest_created_at = min(dates)
+    
+    finished = page >= checkpoint.last_page or reached_until(posts, checkpoint.until_date)
+    if finished:
+        checkpoint.status = DONE
+        checkpoint.completed_at = now
+    return finished
+
+
+async def list_checkpoints(session: AsyncSession, prefix: str = "") -> List[CrawlCheckpoint]:
+    """이름이 prefix로 시작하는 체크포인트 목록"""
+    result = await session.execute(
+        select(CrawlCheckpoint).where(CrawlCheckpoint.name.startswith(prefix)).order_by(CrawlCheckpoint.name)
+    )
+    return list(result.scalars().all())
@@ -1,9 +1,9 @@
 """
 데이터베이스 모델 및 연결 관리
 """
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, JSON, Index, create_engine
+from datetime import datetime, timedelta
+from typing import Optional, Dict
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, JSON, Index, create_engine, select, func, cast, inspect, text, and_, or_
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from contextlib import asynccontextmanager
@@ -18,7 +18,7 @@ class Post(Base):
     __tablename__ = "posts"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(String(50), unique=True, nullable=False, index=True)  # 원본 게시글 ID
+    post_id = Column(String(50), nullable=False, index=True)  # 원본 게시글 ID (갤러리 안에서만 고유)
     gallery_id = Column(String(50), nullable=False, index=True)
     title = Column(String(500), nullable=False)
     author = Column(String(100), nullable=True)
@@ -29,8 +29,25 @@ class Post(Base):
     comment_count = Column(Integer, default=0)
     url = Column(String(500), nullable=True)
     
+    # 본문 (body_fetcher로 수집, 수집 전에는 body_fetched_at이 NULL)
+    body_text = Column(Text, nullable=True)
+    image_count = Column(Integer, nullable=True)
+    link_count = Column(Integer, nullable=True)
+    body_fetched_at = Column(DateTime, nullable=True, index=True)
+    
+    # 반응 증가 속도 (참여도 갱신 크롤링에서 직전 관측 대비 계산, 시간당)
+    metrics_updated_at = Column(DateTime, nullable=True)  # 카운터를 관측한 시각 (NULL이면 crawled_at)
+    views_per_hour = Column(Float, nullable=True)
+    recommends_per_hour = Column(Float, nullable=True)
+    comments_per_hour = Column(Float, nullable=True)
+    
     # 관계
     keywords = relationship("PostKeyword", back_populates="post", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # 자연 키 (디시인사이드/아카라이브 게시글 번호는 소스가 달라 겹칠 수 있음)
+        Index('uq_posts_gallery_post', 'gallery_id', 'post_id', unique=True),
+    )
 
 
 class PostKeyword(Base):
@@ -45,6 +62,22 @@ class PostKeyword(Base):
     post = relationship("Post", back_populates="keywords")
 
 
+class PostMetricSnapshot(Base):
+    """게시글 카운터 스냅샷 (참여도 갱신 크롤링에서 값이 바뀐 경우만 추가)"""
+    __tablename__ = "post_metric_snapshots"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+    view_count = Column(Integer, nullable=False)
+    recommend_count = Column(Integer, nullable=False)
+    comment_count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_snapshot_post_time', 'post_id', 'captured_at'),
+    )
+
+
 class DailyReport(Base):
     """일일 리포트 모델"""
     __tablename__ = "daily_reports"
@@ -83,6 +116,7 @@ class ChatServiceCharacter(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     service = Column(String(50), nullable=False, index=True)  # 'zeta', 'babechat', 'crack', 'elyn'
+    period = Column(String(20), nullable=False, default="daily", server_default="daily")  # 랭킹 기간 ('daily', 'weekly' 등)
     character_id = Column(String(100), nullable=False)  # 서비스 내 고유 ID
     rank = Column(Integer, nullable=False)
     name = Column(String(200), nullable=False)
@@ -96,9 +130,82 @@ class ChatServiceCharacter(Base):
     
     __table_args__ = (
         Index('idx_service_rank', 'service', 'rank'),
+        Index('idx_service_period_rank', 'service', 'period', 'rank'),
     )
 
 
+class CrawlTask(Base):
+    """크롤링 작업 큐 항목 (worker.py 프로세스들이 lease를 잡고 처리)"""
+    __tablename__ = "crawl_tasks"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    target_id = Column(String(50), nullable=False)  # target_galleries의 id
+    start_page = Column(Integer, nullable=False)
+    end_page = Column(Integer, nullable=False)  # 포함
+    priority = Column(Integer, nullable=False, default=0)  # 클수록 먼저
+    status = Column(String(20), nullable=False, default="pending")  # pending, leased, done, failed
+    dedupe_key = Column(String(200), unique=True, nullable=False)  # 같은 작업을 두 번 넣지 않도록
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # 재시도 대기 후 다시 잡을 수 있는 시각
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result_count = Column(Integer, nullable=True)  # 저장한 게시글 수
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_crawl_task_queue', 'status', 'priority', 'id'),
+    )
+
+
+class CrawlCheckpoint(Base):
+    """긴 크롤링(백필)의 진행 위치 (재시작하면 이어서 진행)"""
+    __tablename__ = "crawl_checkpoints"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)  # 예: "backfill:wrtnai"
+    target_id = Column(String(50), nullable=False)  # target_galleries의 id
+    next_page = Column(Integer, nullable=False, default=1)  # 다음에 크롤링할 페이지
+    last_page = Column(Integer, nullable=False)  # 이 페이지까지 (포함)
+    until_date = Column(DateTime, nullable=True)  # 이보다 오래된 게시글만 나오는 페이지에서 종료
+    status = Column(String(20), nullable=False, default="active")  # active, done
+    pages_done = Column(Integer, nullable=False, default=0)
+    posts_saved = Column(Integer, nullable=False, default=0)
+    oldest_post_id = Column(String(50), nullable=True)
+    oldest_created_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class CrawlBreaker(Base):
+    """대상별 circuit breaker 상태 + 파서 상태 누적 카운터 (crawler/circuit_breaker.py)"""
+    __tablename__ = "crawl_breakers"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    target_id = Column(String(50), unique=True, nullable=False)  # target_galleries의 id
+    state = Column(String(20), nullable=False, default="closed")  # closed, open, half_open
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    consecutive_empty = Column(Integer, nullable=False, default=0)
+    trips = Column(Integer, nullable=False, default=0)
+    opened_at = Column(DateTime, nullable=True)
+    open_until = Column(DateTime, nullable=True)
+    last_reason = Column(String(20), nullable=True)  # fetch_failed, no_rows
+    last_error = Column(Text, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    # 파서 상태 누적 카운터
+    pages_fetched = Column(Integer, nullable=False, default=0)
+    pages_failed = Column(Integer, nullable=False, default=0)
+    pages_empty = Column(Integer, nullable=False, default=0)
+    pages_unchanged = Column(Integer, nullable=False, default=0, server_default="0")  # 페이지 캐시로 파싱 생략
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    runs_skipped = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 # 데이터베이스 엔진 및 세션
 settings = get_settings()
 async_engine = create_async_engine(settings.database_url, echo=False)
@@ -109,10 +216,66 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+# 기존 테이블에 나중에 추가된 컬럼 (create_all은 기존 테이블에 컬럼을 추가하지 않음)
+ADDED_COLUMNS = {
+    "posts": ["body_text", "image_count", "link_count", "body_fetched_at",
+              "metrics_updated_at", "views_per_hour", "recommends_per_hour", "comments_per_hour"],
+    "chat_service_characters": ["period"],
+    "crawl_breakers": ["pages_unchanged"],
+}
+
+
+def _add_missing_columns(conn) -> None:
+    """ADDED_COLUMNS 중 실제 테이블에 없는 컬럼을 ALTER TABLE로 추가"""
+    inspector = inspect(conn)
+    for table_name, column_names in ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in column_names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {name} {column.type.compile(dialect=conn.dialect)}"
+            # 기본값이 있는 컬럼은 기존 행에도 기본값을 채움
+            if column.server_default is not None:
+                ddl += f" DEFAULT '{column.server_default.arg}'"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            conn.execute(text(ddl))
+
+
+def _migrate_post_key(conn) -> None:
+    """
+    posts 자연 키를 post_id 단독에서 (gallery_id, post_id)로 변경
+    
+    예전 post_id unique 인덱스(제약)를 지우고 일반 인덱스와 복합 unique 인덱스를 만듦
+    (기존 행은 post_id만으로 이미 고유하므로 복합 키도 고유)
+    """
+    inspector = inspect(conn)
+    if not inspector.has_table("posts"):
+        return
+    for index in inspector.get_indexes("posts"):
+        if index["column_names"] == ["post_id"] and index.get("unique"):
+            conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    if conn.dialect.name != "sqlite":
+        for constraint in inspector.get_unique_constraints("posts"):
+            if constraint["column_names"] == ["post_id"]:
+                conn.execute(text(f'ALTER TABLE posts DROP CONSTRAINT "{constraint["name"]}"'))
+    
+    existing = {index["name"] for index in inspect(conn).get_indexes("posts")}
+    for index in Base.metadata.tables["posts"].indexes:
+        if index.name not in existing:
+            index.create(conn)
+
+
 async def init_db():
-    """데이터베이스 초기화 - 테이블 생성"""
+    """데이터베이스 초기화 - 테이블 생성 및 추가된 컬럼/키 반영"""
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_migrate_post_key)
 
 
 @asynccontextmanager
@@ -136,3 +299,38 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+async def get_high_water_marks(session: AsyncSession) -> Dict[str, int]:
+    """갤러리별로 이미 저장된 가장 큰 게시글 번호 (증분 크롤링 기준점)"""
+    result = await session.execute(
+        select(Post.gallery_id, func.max(cast(Post.post_id, Integer)))
+        .group_by(Post.gallery_id)
+    )
+    return {gallery_id: max_id for gallery_id, max_id in result.all() if max_id is not None}
+
+
+async def latest_characters_condition(session: AsyncSession, period: str, service: Optional[str] = None):
+    """
+    서비스별 가장 최근 크롤링 캐릭터 순위 조건 (데이터가 없으면 None)
+    
+    서비스/기간마다 마지막으로 저장된 시각이 다름 (바뀌지 않았거나 실패한 랭킹은 이전 순위를 유지)
+    각 서비스의 최근 크롤링 시간 기준 5분 이내 (동일 크롤링 세션에서 생성된 데이터를 모두 포함)
+    """
+    latest_query = select(
+        ChatServiceCharacter.service, func.max(ChatServiceCharacter.crawled_at)
+    ).where(ChatServiceCharacter.period == period).group_by(ChatServiceCharacter.service)
+    if service:
+        latest_query = latest_query.where(ChatServiceCharacter.service == service)
+    
+    latest = (await session.execute(latest_query)).all()
+    if not latest:
+        return None
+    return or_(*[
+        and_(
+            ChatServiceCharacter.service == service_name,
+            ChatServiceCharacter.crawled_at >= crawled_at - timedelta(minutes=5),
+            ChatServiceCharacter.crawled_at <= crawled_at,
+        )
+        for service_name, crawled_at in latest
+    ])
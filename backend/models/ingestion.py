@@ -0,0 +1,438 @@
+"""
+크롤링 게시글 일괄 저장 (upsert)
+- INSERT ... ON CONFLICT 로 배치 단위 저장 (SQLite / PostgreSQL)
+- 게시글 자연 키는 (gallery_id, post_id) - 소스가 다르면 게시글 번호가 겹칠 수 있음
+- 이미 저장된 게시글은 조회수/추천수/댓글수가 바뀐 경우만 최신 값으로 갱신 (그대로면 쓰지 않음)
+- 저장된 게시글 Bloom filter(crawler/seen_filter.py)에 없는 게시글은 DB 확인 없이 INSERT,
+  필터에 있는 게시글만 배치당 한 번의 조회로 정확히 확인
+- insert 행은 공통 레코드(crawler/records.py)의 to_row()로 변환 (소스별 분기 없음)
+- ingest_stream: 크롤링 스트림을 받아 배치마다 커밋 (크롤링 도중에도 DB에 반영, 커밋한 페이지는 페이지 캐시에 확정)
+- refresh_engagement: 참여도 갱신 크롤링 결과로 카운터 일괄 갱신 + 시간당 증가 속도 계산 + 스냅샷 추가
+- ingest_missing_bodies: 본문을 아직 받지 않은 게시글의 본문 수집 후 저장
+- replace_service_characters: 캐릭터챗 서비스 순위를 새 크롤링 결과로 교체
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import and_, or_, select, func, update, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from crawler.page_cache import confirm_pages
+from crawler.records import CharacterData, CrawledPost
+from crawler.seen_filter import SAVE_INTERVAL_SECONDS, PostKey, SeenPosts
+from models.database import Post, PostMetricSnapshot, ChatServiceCharacter
+
+logger = logging.getLogger(__name__)
+
+# 재크롤링 시 갱신하는 컬럼
+MUTABLE_COUNTERS = ("view_count", "recommend_count", "comment_count")
+# 카운터별 시간당 증가 속도 컬럼
+VELOCITY_COLUMNS = {
+    "view_count": "views_per_hour",
+    "recommend_count": "recommends_per_hour",
+    "comment_count": "comments_per_hour",
+}
+# 직전 관측 후 이 시간이 지나지 않은 게시글은 갱신하지 않음 (짧은 간격의 증가 속도는 잡음이 큼)
+MIN_REFRESH_INTERVAL = timedelta(minutes=5)
+
+
+@dataclass
+class IngestResult:
+    """저장 결과"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0  # 이미 저장되어 있고 카운터도 그대로라 쓰지 않은 게시글
+    
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+    
+    def __add__(self, other: "IngestResult") -> "IngestResult":
+        return IngestResult(self.inserted + other.inserted, self.updated + other.updated,
+                            self.unchanged + other.unchanged)
+
+
+# 프로세스 공용 저장된 게시글 필터 (seen_posts()로 처음 쓸 때 만듦)
+_seen: Optional[SeenPosts] = None
+
+
+async def seen_posts(session: AsyncSession) -> Optional[SeenPosts]:
+    """
+    저장된 게시글 필터 (seen_filter_enabled가 꺼져 있으면 None)
+    
+    처음 쓸 때 파일에서 불러오고, 파일이 없으면(또는 크기 설정이 바뀌었으면) DB의 모든 키로 채움
+    """
+    global _seen
+    if not get_settings().seen_filter_enabled:
+        return None
+    if _seen is None:
+        seen = SeenPosts.from_settings()
+        if not seen.loaded:
+            count = 0
+            result = await session.stream(select(Post.gallery_id, Post.post_id))
+            async for rows in result.partitions(10000):
+                seen.add_many((gallery_id, post_id) for gallery_id, post_id in rows)
+                count += len(rows)
+            seen.save()
+            logger.info(f"저장된 게시글 필터 생성: {count}개")
+        _seen = seen
+    return _seen
+
+
+def save_seen_posts() -> None:
+    """저장된 게시글 필터를 파일로 저장 (크롤링이 끝날 때)"""
+    if _seen is not None:
+        _seen.save()
+
+
+def _key_filter(keys: Iterable[PostKey]):
+    """(gallery_id, post_id) 목록 조건 (갤러리별 IN - 복합 인덱스 사용)"""
+    by_gallery: Dict[str, List[str]] = defaultdict(list)
+    for gallery_id, post_id in keys:
+        by_gallery[gallery_id].append(post_id)
+    return or_(*[and_(Post.gallery_id == gallery_id, Post.post_id.in_(post_ids))
+                 for gallery_id, post_ids in by_gallery.items()])
+
+
+async def _stored_posts(session: AsyncSession, keys: List[PostKey], *columns) -> Dict[PostKey, Any]:
+    """이미 저장된 게시글의 행 (Post.id와 columns)"""
+    result = await session.execute(
+        select(Post.id, Post.gallery_id, Post.post_id, *columns).where(_key_filter(keys))
+    )
+    return {(row.gallery_id, row.post_id): row for row in result.all()}
+
+
+def dialect_insert(session: AsyncSession):
+    """DB 종류에 맞는 ON CONFLICT 지원 insert 생성자"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"upsert를 지원하지 않는 데이터베이스입니다: {dialect}")
+
+
+async def upsert_posts(session: AsyncSession, posts: Iterable[CrawledPost], batch_size: int = 500,
+                       crawled_at: Optional[datetime] = None) -> IngestResult:
+    """
+    게시글 일괄 upsert
+    
+    - 필터에 없는 게시글: 확인 없이 INSERT ... ON CONFLICT DO NOTHING RETURNING (실제로 추가된 게시글만 신규)
+    - 필터에 있는 게시글: 배치당 한 번의 조회로 저장 여부/카운터 확인 후
+      카운터가 바뀐 게시글만 기본 키로 일괄 UPDATE, 그대로인 게시글은 쓰지 않음
+      (필터가 뒤처져 INSERT가 충돌한 게시글 - 다른 프로세스가 저장 등 - 도 같이 확인)
+    
+    Args:
+        session: DB 세션 (커밋은 호출 측에서)
+        posts: CrawledPost 목록
+        batch_size: 한 번의 INSERT 문에 담을 행 수
+        crawled_at: 신규 게시글의 크롤링 시각 (None이면 현재 시각, 아카이브 재파싱 시 원래 시각)
+    
+    Returns:
+        신규 저장/갱신 건수
+    """
+    # 같은 배치 안의 중복 키는 마지막 값만 사용 (PostgreSQL은 한 문장 내 중복 충돌 불가)
+    crawled_at = crawled_at or datetime.utcnow()
+    rows_by_key: Dict[PostKey, Dict[str, Any]] = {}
+    for post in posts:
+        rows_by_key[(post.gallery_id, post.post_id)] = post.to_row(crawled_at)
+    keys = list(rows_by_key)
+    
+    seen = await seen_posts(session)
+    insert = dialect_insert(session)
+    result = IngestResult()
+    counters = [getattr(Post, column) for column in MUTABLE_COUNTERS]
+    
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
+        
+        # 필터에 있는 게시글만 실제로 저장되어 있는지 확인 (필터가 없으면 전부)
+        maybe_known = [key for key in chunk if seen is None or seen.might_contain(key)]
+        known = {}
+        if maybe_known:
+            known = await _stored_posts(session, maybe_known, *counters)
+        
+        new_keys = [key for key in chunk if key not in known]
+        inserted = set()
+        if new_keys:
+            stmt = (
+                insert(Post).values([rows_by_key[key] for key in new_keys])
+                .on_conflict_do_nothing(index_elements=[Post.gallery_id, Post.post_id])
+                .returning(Post.gallery_id, Post.post_id)
+            )
+            inserted = {tuple(row) for row in (await session.execute(stmt)).all()}
+            # 필터가 뒤처져 이미 있던 게시글 - 필터에 있던 게시글처럼 카운터를 확인해 갱신
+            stale = [key for key in new_keys if key not in inserted]
+            if stale:
+                known.update(await _stored_posts(session, stale, *counters))
+        
+        updates = []
+        for key, row in known.items():
+            values = rows_by_key[key]
+            if any(values[column] != getattr(row, column) for column in MUTABLE_COUNTERS):
+                # 카운터를 관측한 시각도 함께 갱신 (참여도 갱신 시 증가 속도의 기준점)
+                updates.append({"id": row.id, "metrics_updated_at": values["crawled_at"],
+                                **{column: values[column] for column in MUTABLE_COUNTERS}})
+        # 기본 키 기준 일괄 UPDATE (executemany)
+        if updates:
+            await session.execute(update(Post), updates)
+        
+        if seen is not None:
+            seen.add_many(chunk)
+        result += IngestResult(inserted=len(inserted), updated=len(updates), unchanged=len(known) - len(updates))
+    
+    if seen is not None:
+        seen.save(min_interval=SAVE_INTERVAL_SECONDS)
+    logger.info(f"게시글 upsert 완료: 신규 {result.inserted}개, 갱신 {result.updated}개, 변경 없음 {result.unchanged}개")
+    return result
+
+
+async def refresh_engagement(session: AsyncSession, posts: Iterable[CrawledPost],
+                             captured_at: Optional[datetime] = None) -> IngestResult:
+    """
+    참여도 갱신 크롤링 결과 저장 (커밋은 호출 측에서)
+    
+    - 이미 있는 게시글: 카운터와 직전 관측 대비 시간당 증가 속도를 일괄 UPDATE,
+      카운터가 바뀐 게시글만 스냅샷 추가
+    - 처음 보는 게시글: upsert_posts와 같이 추가하고 첫 스냅샷 추가
+    
+    Args:
+        session: DB 세션
+        posts: CrawledPost 목록
+        captured_at: 관측 시각 (None이면 현재 시각)
+    
+    Returns:
+        신규 저장/갱신 건수
+    """
+    captured_at = captured_at or datetime.utcnow()
+    latest: Dict[PostKey, CrawledPost] = {}
+    for post in posts:
+        latest[(post.gallery_id, post.post_id)] = post
+    if not latest:
+        return IngestResult()
+    
+    observed_at = func.coalesce(Post.metrics_updated_at, Post.crawled_at).label("observed_at")
+    known = await _stored_posts(session, list(latest), observed_at,
+                                *[getattr(Post, column) for column in MUTABLE_COUNTERS])
+    
+    new_posts = [post for key, post in latest.items() if key not in known]
+    ingest = await upsert_posts(session, new_posts, crawled_at=captured_at) if new_posts else IngestResult()
+    if new_posts:
+        inserted = await _stored_posts(session, [(post.gallery_id, post.post_id) for post in new_posts])
+        known_new = {key: row.id for key, row in inserted.items()}
+    else:
+        known_new = {}
+    
+    updates: List[Dict[str, Any]] = []
+    snapshots: List[Dict[str, Any]] = [
+        _snapshot_row(row_id, latest[key], captured_at) for key, row_id in known_new.items()
+    ]
+    for key, row in known.items():
+        post = latest[key]
+        if row.observed_at is not None and captured_at - row.observed_at < MIN_REFRESH_INTERVAL:
+            continue
+        hours = (captured_at - row.observed_at).total_seconds() / 3600 if row.observed_at else None
+        values: Dict[str, Any] = {"id": row.id, "metrics_updated_at": captured_at}
+        changed = False
+        for column, velocity_column in VELOCITY_COLUMNS.items():
+            current, previous = getattr(post, column), getattr(row, column) or 0
+            values[column] = current
+            values[velocity_column] = round((current - previous) / hours, 3) if hours else None
+            changed = changed or current != previous
+        updates.append(values)
+        if changed:
+            snapshots.append(_snapshot_row(row.id, post, captured_at))
+    
+    # 기본 키 기준 일괄 UPDATE (executemany)
+    if updates:
+        await session.execute(update(Post), updates)
+    if snapshots:
+        await session.execute(PostMetricSnapshot.__table__.insert(), snapshots)
+    
+    logger.info(f"참여도 갱신 완료: 신규 {ingest.inserted}개, 갱신 {len(updates)}개, 스냅샷 {len(snapshots)}개")
+    return ingest + IngestResult(updated=len(updates))
+
+
+def _snapshot_row(row_id: int, post: CrawledPost, captured_at: datetime) -> Dict[str, Any]:
+    return {
+        "post_id": row_id,
+        "captured_at": captured_at,
+        "view_count": post.view_count,
+        "recommend_count": post.recommend_count,
+        "comment_count": post.comment_count,
+    }
+
+
+async def prune_snapshots(session: AsyncSession, retention_days: Optional[int] = None) -> int:
+    """보관 기간이 지난 스냅샷 삭제 (커밋은 호출 측에서)"""
+    retention_days = retention_days or get_settings().engagement_snapshot_retention_days
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = await session.execute(delete(PostMetricSnapshot).where(PostMetricSnapshot.captured_at < cutoff))
+    return result.rowcount or 0
+
+
+async def ingest_stream(session: AsyncSession, batches: AsyncIterable[List[CrawledPost]],
+                        batch_size: Optional[int] = None, refresh: bool = False) -> IngestResult:
+    """
+    크롤링 스트림(페이지 단위 게시글 목록)을 받아 batch_size개씩 upsert 후 커밋
+    
+    크롤링이 중간에 실패해도 이미 커밋된 배치는 남음
+    커밋한 페이지(PendingPage)만 페이지 캐시에 확정하고 끝나면 캐시 저장 (커밋 전에 실패한 페이지는 다음 실행에서 다시 파싱)
+    
+    Args:
+        session: DB 세션 (배치마다 커밋)
+        batches: 게시글 목록을 yield 하는 async iterable (stream_all_targets 등)
+        batch_size: 커밋 단위 게시글 수 (None이면 설정값)
+        refresh: 참여도 갱신 모드 (refresh_engagement로 저장, 증가 속도/스냅샷 기록)
+    
+    Returns:
+        전체 신규 저장/갱신 건수
+    """
+    batch_size = batch_size or get_settings().ingest_batch_size
+    result = IngestResult()
+    buffer: List = []
+    pages: List = []  # buffer에 들어간 페이지 (커밋 후 페이지 캐시에 확정)
+    caches = set()
+    
+    async def flush() -> None:
+        nonlocal result, buffer, pages
+        if not buffer:
+            return
+        if refresh:
+            result += await refresh_engagement(session, buffer)
+        else:
+            result += await upsert_posts(session, buffer, batch_size=batch_size)
+        await session.commit()
+        caches.update(confirm_pages(pages))
+        buffer = []
+        pages = []
+    
+    async for posts in batches:
+        buffer.extend(posts)
+        pages.append(posts)
+        if len(buffer) >= batch_size:
+            await flush()
+    await flush()
+    save_seen_posts()
+    for cache in caches:
+        cache.save()
+    
+    logger.info(f"스트림 저장 완료: 신규 {result.inserted}개, 갱신 {result.updated}개, 변경 없음 {result.unchanged}개")
+    return result
+
+
+async def ingest_missing_bodies(session: AsyncSession, limit: Optional[int] = None, http=None) -> int:
+    """
+    본문을 아직 받지 않은 게시글(body_fetched_at IS NULL)의 본문 수집 후 저장 (최신 게시글 우선)
+    
+    Args:
+        session: DB 세션 (커밋은 호출 측에서)
+        limit: 한 번에 수집할 최대 게시글 수 (None이면 설정값)
+        http: 공유 HTTP 레지스트리 (None이면 임시로 생성)
+    
+    Returns:
+        본문을 저장한 게시글 수
+    """
+    from crawler.body_fetcher import BODY_SELECTORS, BodyFetcher, supports_url
+    
+    limit = limit or get_settings().body_fetch_max_posts
+    # 지원하지 않는 사이트의 게시글은 계속 NULL로 남으므로 조회 단계에서 제외 (limit을 차지하지 않도록)
+    supported = or_(*[Post.url.like(f"%://{host}/%") for host in BODY_SELECTORS])
+    result = await session.execute(
+        select(Post.gallery_id, Post.post_id, Post.url)
+        .where(Post.body_fetched_at.is_(None), Post.url.isnot(None), supported)
+        .order_by(Post.crawled_at.desc(), Post.id.desc())
+        .limit(limit)
+    )
+    targets = [(gallery_id, post_id, url) for gallery_id, post_id, url in result.all() if supports_url(url)]
+    if not targets:
+        return 0
+    
+    logger.info(f"본문 수집 시작: {len(targets)}개 게시글")
+    bodies = await BodyFetcher(http=http).fetch_bodies(targets)
+    
+    await save_post_bodies(session, bodies)
+    
+    logger.info(f"본문 수집 완료: {len(bodies)}/{len(targets)}개 저장")
+    return len(bodies)
+
+
+async def _legacy_body_post(session: AsyncSession, body) -> Optional[int]:
+    """
+    갤러리를 모르는 본문(예전 아카이브 재파싱)의 게시글 id
+    
+    같은 번호의 게시글 중 상세 페이지 주소가 같은 게시글, 없으면 번호가 하나뿐일 때 그 게시글
+    (여러 갤러리에 같은 번호가 있어 정할 수 없으면 None)
+    """
+    rows = (await session.execute(select(Post.id, Post.url).where(Post.post_id == body.post_id))).all()
+    matched = [row.id for row in rows if body.url and row.url == body.url]
+    if len(matched) == 1:
+        return matched[0]
+    if len(rows) == 1:
+        return rows[0].id
+    return None
+
+
+async def save_post_bodies(session: AsyncSession, bodies: Iterable, fetched_at: Optional[datetime] = None) -> int:
+    """
+    수집한 본문(PostBody) 저장 (커밋은 호출 측에서)
+    
+    Returns:
+        본문을 저장한 게시글 수 (갤러리를 정할 수 없는 본문은 건너뜀)
+    """
+    fetched_at = fetched_at or datetime.utcnow()
+    count = 0
+    for body in bodies:
+        if body.gallery_id is not None:
+            condition = and_(Post.gallery_id == body.gallery_id, Post.post_id == body.post_id)
+        else:
+            post_pk = await _legacy_body_post(session, body)
+            if post_pk is None:
+                logger.warning(f"본문의 게시글을 정할 수 없어 건너뜀: [{body.post_id}] {body.url} "
+                               f"(갤러리 정보 없음, 같은 번호의 게시글이 없거나 여러 개)")
+                continue
+            condition = Post.id == post_pk
+        await session.execute(
+            update(Post)
+            .where(condition)
+            .values(
+                body_text=body.body_text,
+                image_count=body.image_count,
+                link_count=body.link_count,
+                body_fetched_at=fetched_at,
+            )
+        )
+        count += 1
+    return count
+
+
+async def replace_service_characters(session: AsyncSession, service: str, characters: Iterable[CharacterData],
+                                     crawled_at: Optional[datetime] = None, period: str = "daily") -> int:
+    """
+    서비스/기간의 캐릭터 순위를 새 크롤링 결과로 교체 (커밋은 호출 측에서)
+    
+    Args:
+        session: DB 세션
+        service: 서비스 이름 ('zeta', 'lunatalk' 등)
+        characters: CharacterData 목록
+        crawled_at: 크롤링 시각 (None이면 현재 시각, 아카이브 재파싱 시 원래 시각)
+        period: 랭킹 기간 ('daily', 'weekly' 등, 다른 기간의 순위는 그대로 둠)
+    
+    Returns:
+        저장한 캐릭터 수
+    """
+    crawled_at = crawled_at or datetime.utcnow()
+    await session.execute(delete(ChatServiceCharacter).where(
+        ChatServiceCharacter.service == service,
+        ChatServiceCharacter.period == period,
+    ))
+    
+    rows = [char_data.to_row(service, period, crawled_at) for char_data in characters]
+    if rows:
+        await session.execute(ChatServiceCharacter.__table__.insert(), rows)
+    return len(rows)
@@ -0,0 +1,235 @@
+"""
+DB 기반 크롤링 작업 큐
+- 작업 = (대상 갤러리, 페이지 구간, 우선순위)
+- 워커는 lease를 잡고(lease_task) 처리 중에는 주기적으로 연장(extend_lease)
+  - lease가 만료되면 (워커 프로세스 종료 등) 다른 워커가 다시 가져감
+  - lease는 조건부 UPDATE(compare-and-set)로 잡으므로 여러 프로세스/머신이 동시에 가져가도 한 워커만 성공
+- 실패하면 재시도 대기(시도마다 2배) 후 다시 pending, max_attempts를 넘으면 failed
+- 완료 처리는 lease를 가진 워커만 가능하고 여러 번 호출해도 결과가 같음 (게시글 저장도 upsert라 재실행해도 안전)
+- enqueue는 dedupe_key 기준으로 이미 있는 작업을 건너뜀 (같은 배치를 여러 번 넣어도 한 번만 실행)
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from models.database import CrawlTask
+from models.ingestion import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# 다른 워커와 같은 작업을 동시에 노렸을 때 다음 후보로 다시 시도하는 횟수
+LEASE_CAS_ATTEMPTS = 5
+
+
+@dataclass
+class TaskSpec:
+    """넣을 작업"""
+    target_id: str
+    start_page: int
+    end_page: int
+    priority: int = 0
+    batch: str = ""  # 같은 배치 안에서만 중복 제거 (예: 날짜, 백필 작업 이름)
+    
+    @property
+    def dedupe_key(self) -> str:
+        return f"{self.batch}:{self.target_id}:{self.start_page}-{self.end_page}"
+
+
+def split_pages(target_id: str, first_page: int, last_page: int, pages_per_task: int,
+                priority: int = 0, batch: str = "") -> List[TaskSpec]:
+    """페이지 구간을 pages_per_task 페이지씩 나눈 작업 목록"""
+    pages_per_task = max(pages_per_task, 1)
+    return [
+        TaskSpec(target_id, start, min(start + pages_per_task - 1, last_page), priority, batch)
+        for start in range(first_page, last_page + 1, pages_per_task)
+    ]
+
+
+def crawl_task_specs(pages: int, start_page: int = 1, target_ids: Optional[List[str]] = None, priority: int = 0,
+                     batch: str = "", pages_per_task: Optional[int] = None) -> List[TaskSpec]:
+    """설정된 갤러리(target_galleries)별 start_page~pages 페이지 작업 목록"""
+    settings = get_settings()
+    pages_per_task = pages_per_task or settings.crawl_task_pages
+    specs = []
+    for gallery_config in settings.target_galleries:
+        if target_ids and gallery_config["id"] not in target_ids:
+            continue
+        specs.extend(split_pages(gallery_config["id"], start_page, pages, pages_per_task, priority, batch))
+    return specs
+
+
+async def enqueue_tasks(session: AsyncSession, tasks: Iterable[TaskSpec]) -> int:
+    """
+    작업 추가 (dedupe_key가 이미 있으면 건너뜀, 커밋은 호출 측에서)
+    
+    Returns:
+        새로 추가된 작업 수
+    """
+    settings = get_settings()
+    now = datetime.utcnow()
+    rows = {
+        task.dedupe_key: {
+            "target_id": task.target_id,
+            "start_page": task.start_page,
+            "end_page": task.end_page,
+            "priority": task.priority,
+            "status": PENDING,
+            "dedupe_key": task.dedupe_key,
+            "attempts": 0,
+            "max_attempts": settings.crawl_task_max_attempts,
+            "available_at": now,
+            "created_at": now,
+        }
+        for task in tasks
+    }
+    if not rows:
+        return 0
+    
+    insert = dialect_insert(session)
+    stmt = insert(CrawlTask).values(list(rows.values())).on_conflict_do_nothing(
+        index_elements=[CrawlTask.dedupe_key]
+    )
+    result = await session.execute(stmt)
+    return max(result.rowcount or 0, 0)
+
+
+async def lease_task(session: AsyncSession, owner: str, lease_seconds: Optional[float] = None) -> Optional[CrawlTask]:
+    """
+    처리할 작업 하나의 lease를 잡음 (우선순위 높은 순, 같으면 먼저 들어온 순, 바로 커밋)
+    
+    대기 중인 작업과 lease가 만료된 작업이 대상
+    
+    Returns:
+        잡은 작업 (없으면 None)
+    """
+    lease_seconds = lease_seconds or get_settings().crawl_task_lease_seconds
+    now = datetime.utcnow()
+    
+    # lease가 만료됐는데 시도 횟수를 다 쓴 작업은 실패 처리
+    await session.execute(
+        update(CrawlTask)
+        .where(CrawlTask.status == LEASED, CrawlTask.lease_expires_at < now,
+               CrawlTask.attempts >= CrawlTask.max_attempts)
+        .values(status=FAILED, lease_owner=None, last_error="lease 만료 (재시도 횟수 초과)")
+    )
+    
+    claimable = or_(
+        and_(CrawlTask.status == PENDING, CrawlTask.available_at <= now),
+        and_(CrawlTask.status == LEASED, CrawlTask.lease_expires_at < now),
+    )
+    for _ in range(LEASE_CAS_ATTEMPTS):
+        candidate = await session.execute(
+            select(CrawlTask.id)
+            .where(claimable)
+            .order_by(CrawlTask.priority.desc(), CrawlTask.id)
+            .limit(1)
+        )
+        task_id = candidate.scalar()
+        if task_id is None:
+            await session.commit()
+            return None
+        
+        # 그 사이 다른 워커가 가져갔으면 rowcount가 0
+        claimed = await session.execute(
+            update(CrawlTask)
+            .where(CrawlTask.id == task_id, claimable)
+            .values(status=LEASED, lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    attempts=CrawlTask.attempts + 1)
+        )
+        await session.commit()
+        if claimed.rowcount == 1:
+            return await session.get(CrawlTask, task_id, populate_existing=True)
+    return None
+
+
+async def extend_lease(session: AsyncSession, task_id: int, owner: str,
+                       lease_seconds: Optional[float] = None) -> bool:
+    """처리 중인 작업의 lease 연장 (lease를 잃었으면 False, 바로 커밋)"""
+    lease_seconds = lease_seconds or get_settings().crawl_task_lease_seconds
+    result = await session.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task_id, CrawlTask.status == LEASED, CrawlTask.lease_owner == owner)
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def complete_task(session: AsyncSession, task_id: int, owner: str, result_count: int) -> bool:
+    """
+    작업 완료 처리 (바로 커밋)
+    
+    lease를 가진 워커만 완료할 수 있고, 이미 완료된 작업이면 아무것도 바꾸지 않음
+    
+    Returns:
+        이번 호출로 완료 처리됐는지
+    """
+    result = await session.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task_id, CrawlTask.status == LEASED, CrawlTask.lease_owner == owner)
+        .values(status=DONE, result_count=result_count, completed_at=datetime.utcnow(),
+                lease_owner=None, lease_expires_at=None, last_error=None)
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def fail_task(session: AsyncSession, task: CrawlTask, owner: str, error: str, retry: bool = True) -> str:
+    """
+    작업 실패 처리 (바로 커밋)
+    
+    Args:
+        task: lease_task로 잡은 작업
+        retry: False면 남은 시도 횟수와 관계없이 failed (설정 오류 등 재시도해도 소용없는 경우)
+    
+    Returns:
+        바뀐 상태 (pending 또는 failed)
+    """
+    if retry and task.attempts < task.max_attempts:
+        delay = get_settings().crawl_task_retry_delay_seconds * 2 ** max(task.attempts - 1, 0)
+        values = {"status": PENDING, "available_at": datetime.utcnow() + timedelta(seconds=delay)}
+    else:
+        values = {"status": FAILED}
+    
+    await session.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task.id, CrawlTask.status == LEASED, CrawlTask.lease_owner == owner)
+        .values(lease_owner=None, lease_expires_at=None, last_error=error[:2000], **values)
+    )
+    await session.commit()
+    return values["status"]
+
+
+async def defer_task(session: AsyncSession, task: CrawlTask, owner: str, until: Optional[datetime], reason: str) -> bool:
+    """
+    작업을 until까지 미룸 (대상의 circuit breaker가 열린 경우, 시도 횟수는 쓰지 않음, 바로 커밋)
+    
+    Returns:
+        미뤘는지 (lease를 잃었으면 False)
+    """
+    result = await session.execute(
+        update(CrawlTask)
+        .where(CrawlTask.id == task.id, CrawlTask.status == LEASED, CrawlTask.lease_owner == owner)
+        .values(status=PENDING, available_at=until or datetime.utcnow(), attempts=CrawlTask.attempts - 1,
+                lease_owner=None, lease_expires_at=None, last_error=reason[:2000])
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def queue_stats(session: AsyncSession) -> Dict[str, int]:
+    """상태별 작업 수"""
+    result = await session.execute(select(CrawlTask.status, func.count()).group_by(CrawlTask.status))
+    stats = {status: 0 for status in (PENDING, LEASED, DONE, FAILED)}
+    stats.update({status: count for status, count in result.all()})
+    return stats
@@ -0,0 +1,191 @@
+"""
+아카이브 재파싱 스크립트
+저장된 원본 HTML(crawler/archive.py)을 현재 파서로 다시 파싱해 게시글/본문/캐릭터 순위를 재구성
+- 네트워크 요청 없음
+- 파싱은 여러 프로세스에서 병렬로, DB 저장은 시간 순서대로 (마지막 값이 가장 최근 페이지 기준)
+
+실행 예:
+    python reparse.py --since 2024-01-01 --until 2024-02-01
+    python reparse.py --kind dcinside_list --kind arcalive_list --workers 8
+    python reparse.py --dry-run
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import get_settings
+from crawler.archive import ArchiveEntry, PageArchive
+from models.database import AsyncSessionLocal, init_db
+from models.ingestion import IngestResult, upsert_posts, save_post_bodies, replace_service_characters
+
+# 게시글 목록 / 본문 / 캐릭터 순위 파서 종류
+POST_KINDS = ("dcinside_list", "dcinside_mobile_list", "arcalive_list")
+BODY_KINDS = ("post_body",)
+CHARACTER_KINDS = {"zeta_ranking": "zeta", "lunatalk_ranking": "lunatalk", "babechat_ranking": "babechat"}
+KINDS = POST_KINDS + BODY_KINDS + tuple(CHARACTER_KINDS)
+
+
+def parse_entry(root: str, entry: ArchiveEntry) -> Tuple[ArchiveEntry, Optional[Any], Optional[str]]:
+    """
+    아카이브 항목 하나를 읽어 파싱 (작업 프로세스에서 실행)
+    
+    Returns:
+        (항목, 파싱 결과, 에러 메시지)
+    """
+    from crawler import arcalive_crawler, babechat_crawler, dcinside_crawler, lunatalk_crawler, zeta_crawler
+    from crawler.body_fetcher import extract_post_body
+    
+    try:
+        html = PageArchive(root, entry.codec).read_text(entry)
+        if entry.kind == "dcinside_list":
+            return entry, dcinside_crawler.parse_post_list(html, entry.meta["gallery_id"]), None
+        if entry.kind == "dcinside_mobile_list":
+            return entry, dcinside_crawler.parse_mobile_post_list(
+                html, entry.meta["gallery_id"], is_minor=entry.meta.get("is_minor", True)
+            ), None
+        if entry.kind == "arcalive_list":
+            return entry, arcalive_crawler.parse_post_list(html, entry.meta["board_id"]), None
+        if entry.kind == "post_body":
+            body = extract_post_body(html, entry.url)
+            if body is not None:
+                body.post_id = entry.meta["post_id"]
+                body.gallery_id = entry.meta.get("gallery_id")
+                body.url = entry.url
+            return entry, body, None
+        if entry.kind == "zeta_ranking":
+            return entry, zeta_crawler.parse_rankings(html), None
+        if entry.kind == "lunatalk_ranking":
+            return entry, lunatalk_crawler.parse_rankings(html), None
+        if entry.kind == "babechat_ranking":
+            return entry, babechat_crawler.parse_rankings(html), None
+        return entry, None, f"지원하지 않는 종류: {entry.kind}"
+    except Exception as e:
+        return entry, None, f"{type(e).__name__}: {e}"
+
+
+def select_entries(archive: PageArchive, since: Optional[datetime], until: Optional[datetime],
+                   kinds: List[str]) -> List[ArchiveEntry]:
+    """재파싱할 항목 (정상 응답 + 지원하는 파서 종류, 시간 순서)"""
+    entries = []
+    for entry in archive.iter_entries(since, until):
+        if entry.status != 200 or entry.kind not in kinds:
+            continue
+        entries.append(entry)
+    return entries
+
+
+async def reparse(archive: PageArchive, entries: List[ArchiveEntry], workers: int, dry_run: bool) -> Dict[str, Any]:
+    """항목들을 병렬로 파싱하고 시간 순서대로 DB에 반영"""
+    loop = asyncio.get_running_loop()
+    root = str(archive.root)
+    window = max(workers * 8, 1)
+    
+    posts_result = IngestResult()
+    parsed_posts = 0
+    body_count = 0
+    errors = 0
+    latest_characters: Dict[Tuple[str, str], Tuple[ArchiveEntry, List]] = {}
+    
+    async with AsyncSessionLocal() as session:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(entries), window):
+                # 파싱은 병렬, 결과는 원래(시간) 순서대로 처리
+                futures = [loop.run_in_executor(pool, parse_entry, root, entry)
+                           for entry in entries[start:start + window]]
+                for future in futures:
+                    entry, parsed, error = await future
+                    if error:
+                        errors += 1
+                        print(f"  ⚠️  {entry.url} ({entry.fetched_at}): {error}")
+                        continue
+                    
+                    if entry.kind in POST_KINDS:
+                        parsed_posts += len(parsed)
+                        if not dry_run and parsed:
+                            posts_result += await upsert_posts(session, parsed, crawled_at=entry.fetched_datetime)
+                    elif entry.kind in BODY_KINDS:
+                        if parsed is not None:
+                            body_count += 1
+                            if not dry_run:
+                                await save_post_bodies(session, [parsed], fetched_at=entry.fetched_datetime)
+                    else:
+                        period = entry.meta.get("period") or "daily"
+                        latest_characters[(CHARACTER_KINDS[entry.kind], period)] = (entry, parsed)
+                
+                if not dry_run:
+                    await session.commit()
+                print(f"  ... {min(start + window, len(entries))}/{len(entries)} 항목 처리")
+        
+        # 캐릭터 순위는 서비스/기간별 가장 최근 페이지로 교체
+        character_count = 0
+        for (service, period), (entry, characters) in latest_characters.items():
+            character_count += len(characters)
+            if not dry_run:
+                await replace_service_characters(session, service, characters, crawled_at=entry.fetched_datetime,
+                                                 period=period)
+        if not dry_run:
+            await session.commit()
+    
+    return {
+        "parsed_posts": parsed_posts,
+        "posts": posts_result,
+        "bodies": body_count,
+        "characters": character_count,
+        "errors": errors,
+    }
+
+
+def parse_date_arg(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+async def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="원본 HTML 아카이브 재파싱")
+    parser.add_argument("--since", help="시작 시각 (포함, 예: 2024-01-01)")
+    parser.add_argument("--until", help="종료 시각 (미포함, 예: 2024-02-01)")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="재파싱할 종류 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="파싱 프로세스 수")
+    parser.add_argument("--archive-dir", default=settings.archive_dir, help="아카이브 디렉토리")
+    parser.add_argument("--dry-run", action="store_true", help="파싱만 하고 DB에 저장하지 않음")
+    args = parser.parse_args()
+    
+    archive = PageArchive(args.archive_dir, settings.archive_compression)
+    kinds = args.kind or list(KINDS)
+    
+    print("=" * 60)
+    print(f"🗄️  아카이브 재파싱: {archive.root}")
+    print(f"   기간: {args.since or '처음'} ~ {args.until or '끝'}, 종류: {', '.join(kinds)}")
+    print(f"   작업 프로세스: {args.workers}개{' (dry-run)' if args.dry_run else ''}")
+    print("=" * 60)
+    
+    entries = select_entries(archive, parse_date_arg(args.since), parse_date_arg(args.until), kinds)
+    if not entries:
+        print("재파싱할 항목이 없습니다.")
+        return
+    
+    if not args.dry_run:
+        await init_db()
+    started = time.perf_counter()
+    summary = await reparse(archive, entries, max(args.workers, 1), args.dry_run)
+    elapsed = time.perf_counter() - started
+    
+    print()
+    print("=" * 60)
+    print(f"✅ 재파싱 완료: {len(entries)}개 페이지, {elapsed:.1f}초 ({len(entries) / elapsed:.1f} pages/sec)")
+    print(f"   게시글: {summary['parsed_posts']}개 파싱, 신규 {summary['posts'].inserted}개, 갱신 {summary['posts'].updated}개")
+    print(f"   본문: {summary['bodies']}개, 캐릭터: {summary['characters']}개, 실패: {summary['errors']}개")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 """
 스케줄러 작업 정의
 - 일일 자동 크롤링
+- 참여도 갱신 크롤링 (최근 페이지의 조회수/추천수/댓글수 변화)
 - 리포트 생성
 """
 import sys
@@ -13,10 +14,15 @@ from datetime import datetime, timedelta
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from config import get_settings
-from models.database import get_db_session, Post, DailyReport
-from crawler.dcinside_crawler import run_crawler
+from models.database import get_db_session, get_high_water_marks, Post, DailyReport
+from models.ingestion import ingest_stream, ingest_missing_bodies, prune_snapshots
+from models.breakers import tracked_breakers
+from models.work_queue import crawl_task_specs, enqueue_tasks
+from crawler.multi_crawler import stream_all_targets
+from crawler.telemetry import crawl_run
 from analyzer.trend_analyzer import generate_daily_report
 from sqlalchemy import select
 
@@ -30,49 +36,83 @@ async def daily_crawl_job():
     """
     일일 크롤링 작업
     - 매일 자정에 실행
-    - 갤러리 크롤링 후 DB 저장
+    - 설정된 모든 갤러리를 증분 크롤링하며 배치 단위로 DB 저장
     """
     logger.info("=== 일일 크롤링 작업 시작 ===")
     
+    if settings.crawl_use_work_queue:
+        await enqueue_daily_crawl()
+        return
+    
     try:
-        # 크롤링 실행
-        posts = await run_crawler(pages=settings.max_pages_per_crawl)
-        logger.info(f"크롤링 완료: {len(posts)}개 게시글 수집")
-        
-        # DB에 저장
+        # 갤러리별 마지막으로 저장된 게시글 번호까지만 크롤링
         async with get_db_session() as session:
-            saved_count = 0
-            for post_data in posts:
-                # 중복 체크
-                existing = await session.execute(
-                    select(Post).where(Post.post_id == post_data.post_id)
-                )
-                if existing.scalar_one_or_none():
-                    continue
-                
-                post = Post(
-                    post_id=post_data.post_id,
-                    gallery_id=post_data.gallery_id,
-                    title=post_data.title,
-                    author=post_data.author,
-                    created_at=post_data.created_at,
-                    view_count=post_data.view_count,
-                    recommend_count=post_data.recommend_count,
-                    comment_count=post_data.comment_count,
-                    url=post_data.url
-                )
-                session.add(post)
-                saved_count += 1
+            high_water_marks = await get_high_water_marks(session)
+        
+        # 요청/파싱 지표는 crawl_state_dir/runs 에 실행 요약으로 저장
+        with crawl_run("daily_crawl"):
+            # 크롤링하면서 배치마다 저장 (신규는 추가, 기존 게시글은 카운터 갱신)
+            # circuit breaker가 열린 갤러리는 건너뜀 (연속 요청 실패/0행)
+            async with tracked_breakers() as breakers, get_db_session() as session:
+                result = await ingest_stream(session, stream_all_targets(
+                    pages=settings.max_pages_per_crawl,
+                    high_water_marks=high_water_marks,
+                    breakers=breakers
+                ))
+                logger.info(f"DB 저장 완료: {result.inserted}개 신규 게시글, {result.updated}개 갱신")
             
-            await session.commit()
-            logger.info(f"DB 저장 완료: {saved_count}개 신규 게시글")
+            # 새 게시글 본문 수집 (선택)
+            if settings.fetch_post_bodies:
+                async with get_db_session() as session:
+                    await ingest_missing_bodies(session)
         
         logger.info("=== 일일 크롤링 작업 완료 ===")
-        
+    
     except Exception as e:
         logger.error(f"크롤링 작업 실패: {e}")
 
 
+async def enqueue_daily_crawl():
+    """
+    일일 크롤링을 작업 큐에 넣음 (crawl_use_work_queue - 실제 크롤링은 worker.py 프로세스들이 처리)
+    - 최신 페이지부터 처리되도록 백필 작업보다 높은 우선순위
+    - 같은 날 여러 번 실행돼도 작업은 한 번만 추가됨
+    """
+    try:
+        specs = crawl_task_specs(settings.max_pages_per_crawl, priority=10,
+                                 batch=f"daily-{datetime.utcnow().strftime('%Y-%m-%d')}")
+        async with get_db_session() as session:
+            added = await enqueue_tasks(session, specs)
+        logger.info(f"=== 일일 크롤링 작업 큐에 추가: {added}개 (워커가 처리) ===")
+    except Exception as e:
+        logger.error(f"크롤링 작업 추가 실패: {e}")
+
+
+async def engagement_refresh_job():
+    """
+    참여도 갱신 작업
+    - 갤러리별 최근 페이지를 다시 크롤링해 기존 게시글의 카운터/시간당 증가 속도 갱신
+    - 목록 페이지에 카운터가 모두 있으므로 갤러리당 요청은 engagement_refresh_pages번
+    """
+    logger.info("=== 참여도 갱신 작업 시작 ===")
+    
+    try:
+        with crawl_run("engagement_refresh"):
+            async with tracked_breakers() as breakers, get_db_session() as session:
+                result = await ingest_stream(session, stream_all_targets(
+                    pages=settings.engagement_refresh_pages, breakers=breakers
+                ), refresh=True)
+        
+        async with get_db_session() as session:
+            pruned = await prune_snapshots(session)
+        
+        logger.info(f"=== 참여도 갱신 작업 완료: 갱신 {result.updated}개, 신규 {result.inserted}개, "
+                    f"오래된 스냅샷 {pruned}개 삭제 ===")
+    
+    except Exception as e:
+        logger.error(f"참여도 갱신 작업 실패: {e}")
+
+
 async def daily_report_job():
     """
     일일 리포트 생성 작업
@@ -113,15 +153,20 @@ async def daily_report_job():
             posts_dict = [
                 {
                     "title": p.title,
+                    "body": p.body_text,
                     "view_count": p.view_count,
                     "recommend_count": p.recommend_count,
-                    "comment_count": p.comment_count
+                    "comment_count": p.comment_count,
+                    "views_per_hour": p.views_per_hour,
+                    "recommends_per_hour": p.recommends_per_hour,
+                    "comments_per_hour": p.comments_per_hour
                 }
                 for p in posts
             ]
             prev_posts_dict = [
                 {
                     "title": p.title,
+                    "body": p.body_text,
                     "view_count": p.view_count,
                     "recommend_count": p.recommend_count,
                     "comment_count": p.comment_count
@@ -167,7 +212,7 @@ async def daily_report_job():
             await session.commit()
         
         logger.info("=== 일일 리포트 생성 완료 ===")
-        
+    
     except Exception as e:
         logger.error(f"리포트 생성 실패: {e}")
 
@@ -185,6 +230,15 @@ def create_scheduler() -> AsyncIOScheduler:
         replace_existing=True
     )
     
+    # N시간마다 참여도 갱신
+    scheduler.add_job(
+        engagement_refresh_job,
+        IntervalTrigger(hours=settings.engagement_refresh_interval_hours),
+        id="engagement_refresh",
+        name="참여도 갱신",
+        replace_existing=True
+    )
+    
     # 매일 00:30 리포트 생성 (크롤링 완료 후)
     scheduler.add_job(
         daily_report_job,
@@ -196,6 +250,7 @@ def create_scheduler() -> AsyncIOScheduler:
     
     logger.info("스케줄러 작업 등록 완료")
     logger.info("- 일일 크롤링: 매일 00:00")
+    logger.info(f"- 참여도 갱신: {settings.engagement_refresh_interval_hours}시간마다")
     logger.info("- 일일 리포트: 매일 00:30")
     
     return scheduler
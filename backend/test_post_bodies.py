@@ -0,0 +1,92 @@
+"""
+본문 저장 테스트 (게시글 키 = 갤러리 + 게시글 번호)
+- 두 갤러리에 같은 번호의 게시글이 있을 때 본문이 다른 갤러리의 게시글을 덮어쓰지 않는지 확인
+- 갤러리를 모르는 예전 아카이브 본문은 상세 페이지 주소로 찾고, 정할 수 없으면 건너뜀
+
+실행: python test_post_bodies.py (임시 SQLite DB 사용)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 설정/엔진이 만들어지기 전에 임시 DB와 상태 디렉터리로 바꿈
+_temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_temp_dir.name}/test.db"
+os.environ["CRAWL_STATE_DIR"] = _temp_dir.name
+
+from sqlalchemy import select
+
+from crawler.body_fetcher import PostBody
+from crawler.records import CrawledPost
+from models.database import Post, get_db_session, init_db
+from models.ingestion import save_post_bodies, upsert_posts
+
+DC_URL = "https://gall.dcinside.com/mgallery/board/view/?id={gallery_id}&no={post_id}"
+
+
+def crawled(gallery_id: str, post_id: str) -> CrawledPost:
+    return CrawledPost(post_id, gallery_id, "제목", "작성자", datetime(2026, 1, 1), 10, 0, 0,
+                       DC_URL.format(gallery_id=gallery_id, post_id=post_id))
+
+
+def body(post_id: str, text: str, gallery_id: str = None, url: str = None) -> PostBody:
+    return PostBody(post_id=post_id, body_text=text, image_count=0, link_count=0, gallery_id=gallery_id, url=url)
+
+
+async def bodies() -> dict:
+    async with get_db_session() as session:
+        result = await session.execute(select(Post.gallery_id, Post.post_id, Post.body_text))
+        return {(gallery_id, post_id): text for gallery_id, post_id, text in result.all()}
+
+
+async def save(*items: PostBody) -> int:
+    async with get_db_session() as session:
+        count = await save_post_bodies(session, items)
+        await session.commit()
+    return count
+
+
+async def test_post_bodies():
+    await init_db()
+    async with get_db_session() as session:
+        await upsert_posts(session, [crawled("wrtnai", "100"), crawled("aichatting", "100"), crawled("wrtnai", "200")])
+        await session.commit()
+    
+    # 갤러리가 있는 본문은 그 갤러리의 게시글만
+    assert await save(body("100", "뤼튼 본문", gallery_id="wrtnai")) == 1
+    stored = await bodies()
+    assert stored[("wrtnai", "100")] == "뤼튼 본문"
+    assert stored[("aichatting", "100")] is None
+    print("✅ 갤러리가 있는 본문은 같은 번호의 다른 갤러리 게시글을 건드리지 않음")
+    
+    # 갤러리를 모르는 본문은 상세 페이지 주소로 찾음
+    assert await save(body("100", "AI챗팅 본문", url=DC_URL.format(gallery_id="aichatting", post_id="100"))) == 1
+    stored = await bodies()
+    assert stored[("wrtnai", "100")] == "뤼튼 본문"
+    assert stored[("aichatting", "100")] == "AI챗팅 본문"
+    print("✅ 갤러리를 모르는 본문은 상세 페이지 주소로 게시글을 찾음")
+    
+    # 주소로도 정할 수 없으면 건너뜀
+    assert await save(body("100", "덮어쓰면 안 됨"), body("100", "덮어쓰면 안 됨", url="https://example.com/100")) == 0
+    stored = await bodies()
+    assert stored[("wrtnai", "100")] == "뤼튼 본문"
+    assert stored[("aichatting", "100")] == "AI챗팅 본문"
+    print("✅ 여러 갤러리에 같은 번호가 있고 주소도 맞지 않으면 건너뜀")
+    
+    # 번호가 하나뿐이면 주소가 없어도 저장
+    assert await save(body("200", "하나뿐인 게시글")) == 1
+    assert (await bodies())[("wrtnai", "200")] == "하나뿐인 게시글"
+    print("✅ 같은 번호의 게시글이 하나뿐이면 주소 없이도 저장")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(test_post_bodies())
+    finally:
+        _temp_dir.cleanup()
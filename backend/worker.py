@@ -0,0 +1,270 @@
+"""
+크롤링 작업 큐 워커
+DB 작업 큐(models/work_queue.py)에서 작업(갤러리 페이지 구간)을 가져와 크롤링하고 저장
+- run: N개 프로세스로 큐를 처리 (여러 머신에서 같은 DB를 보고 실행해도 됨)
+  - 호스트별 요청 속도는 전체 워커 수(--total-workers)로 나눠 가짐
+    (워커를 늘려도 사이트 입장의 요청 속도는 프로세스 하나일 때와 같음, 여러 갤러리/호스트를 병렬로 처리하는 만큼 빨라짐)
+  - 처리 중에는 lease를 주기적으로 연장, 프로세스가 죽으면 lease 만료 후 다른 워커가 이어서 처리
+  - 대상의 circuit breaker가 열려 있거나 처리 중에 열리면 작업을 반열림 시각까지 미룸 (시도 횟수는 쓰지 않음)
+- enqueue: 갤러리별 페이지 구간을 작업으로 추가 (같은 배치 이름이면 중복 추가되지 않음)
+- status: 상태별 작업 수
+
+실행 예:
+    python worker.py enqueue --pages 20 --priority 5
+    python worker.py run --processes 4
+    python worker.py run --processes 2 --drain
+    python worker.py status
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import get_settings
+from crawler.archive import PageArchive
+from crawler.circuit_breaker import TargetBreaker
+from crawler.http_client import HttpClientRegistry
+from crawler.multi_crawler import iter_target_pages
+from crawler.page_cache import PageCache
+from crawler.page_pipeline import UnchangedPage
+from crawler.rate_limiter import HostRateLimiter
+from crawler.telemetry import crawl_run
+from models.database import AsyncSessionLocal, CrawlTask, init_db
+from models.breakers import tracked_breakers
+from models.ingestion import ingest_stream
+from models.work_queue import (
+    complete_task, crawl_task_specs, defer_task, enqueue_tasks, extend_lease, fail_task, lease_task, queue_stats,
+)
+
+logger = logging.getLogger("worker")
+
+
+async def _counting(pages: AsyncIterator[List], counter: Dict[str, int]) -> AsyncIterator[List]:
+    """페이지 수/게시글이 있었던 페이지 수 집계 (바뀌지 않아 파싱을 생략한 페이지도 게시글이 있던 페이지)"""
+    async for posts in pages:
+        counter["pages"] += 1
+        if posts or isinstance(posts, UnchangedPage):
+            counter["non_empty"] += 1
+        yield posts
+
+
+async def _keep_lease(task_id: int, worker_id: str, interval: float) -> None:
+    """처리하는 동안 lease 연장"""
+    while True:
+        await asyncio.sleep(interval)
+        async with AsyncSessionLocal() as session:
+            if not await extend_lease(session, task_id, worker_id):
+                logger.warning(f"[작업 {task_id}] lease를 잃었습니다 (다른 워커가 다시 처리할 수 있음)")
+                return
+
+
+async def _defer(task: CrawlTask, worker_id: str, breaker: TargetBreaker, label: str) -> None:
+    """circuit breaker가 열린 대상의 작업을 반열림 시각까지 미룸"""
+    async with AsyncSessionLocal() as session:
+        await defer_task(session, task, worker_id, breaker.open_until,
+                         f"circuit breaker 열림 ({breaker.last_reason}): {breaker.last_error}")
+    logger.warning(f"{label} 미룸: circuit breaker 열림 ({breaker.open_until} 까지)")
+
+
+async def process_task(task: CrawlTask, worker_id: str, http: HttpClientRegistry,
+                       galleries: Dict[str, dict]) -> bool:
+    """작업 하나 처리 (성공하면 True, 예상하지 못한 예외는 작업 실패로 기록하고 워커는 계속)"""
+    label = f"[작업 {task.id}] {task.target_id} {task.start_page}~{task.end_page}페이지 (시도 {task.attempts})"
+    try:
+        return await _process_task(task, worker_id, http, galleries, label)
+    except Exception as e:
+        logger.exception(f"{label} 처리 중 예외")
+        try:
+            async with AsyncSessionLocal() as session:
+                status = await fail_task(session, task, worker_id, f"{type(e).__name__}: {e}")
+            logger.error(f"{label} 실패 ({status}): {e}")
+        except Exception as fail_error:
+            # DB 오류 등 - lease가 만료되면 다른 워커가 다시 가져감
+            logger.error(f"{label} 실패 처리도 하지 못했습니다: {fail_error}")
+        return False
+
+
+async def _process_task(task: CrawlTask, worker_id: str, http: HttpClientRegistry,
+                        galleries: Dict[str, dict], label: str) -> bool:
+    """대상 확인 + circuit breaker 확인 후 크롤링"""
+    gallery_config = galleries.get(task.target_id)
+    if gallery_config is None:
+        # 설정에서 빠진 갤러리 등 - 재시도해도 소용없음
+        async with AsyncSessionLocal() as session:
+            await fail_task(session, task, worker_id, f"알 수 없는 대상: {task.target_id}", retry=False)
+        logger.error(f"{label} 실패: 알 수 없는 대상")
+        return False
+    
+    async with tracked_breakers([task.target_id]) as breakers:
+        breaker = breakers[task.target_id]
+        if not breaker.allow():
+            breaker.skip()
+            await _defer(task, worker_id, breaker, label)
+            return False
+        return await _crawl_task(task, worker_id, http, gallery_config, breaker, label)
+
+
+async def _crawl_task(task: CrawlTask, worker_id: str, http: HttpClientRegistry, gallery_config: dict,
+                      breaker: TargetBreaker, label: str) -> bool:
+    """작업의 페이지 구간 크롤링 + 저장 후 완료/실패/미룸 처리"""
+    pages = iter_target_pages(gallery_config, task.end_page, http, start_page=task.start_page, breaker=breaker)
+    if pages is None:
+        async with AsyncSessionLocal() as session:
+            await fail_task(session, task, worker_id, f"지원하지 않는 타입/목록 소스: {gallery_config['type']}", retry=False)
+        logger.error(f"{label} 실패: 지원하지 않는 타입/목록 소스")
+        return False
+    
+    logger.info(f"{label} 시작")
+    counter = {"pages": 0, "non_empty": 0}
+    failed_before = breaker.health["pages_failed"]
+    heartbeat = asyncio.create_task(_keep_lease(task.id, worker_id, get_settings().crawl_task_lease_seconds / 3))
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await ingest_stream(session, _counting(pages, counter))
+        if not breaker.allow():
+            # 처리 중에 열림 - 저장한 페이지는 그대로 두고 구간 전체를 나중에 다시 처리 (upsert라 안전)
+            await _defer(task, worker_id, breaker, label)
+            return False
+        failed_pages = breaker.health["pages_failed"] - failed_before
+        if counter["non_empty"] == 0 and failed_pages:
+            # 크롤러는 페이지 요청이 실패해도 빈 목록으로 넘어가므로, 요청 실패가 있고 게시글이 없으면 실패로 보고 재시도
+            # (모든 페이지를 받았는데 게시글이 없으면 마지막 페이지 뒤의 구간 등 - 0개로 완료)
+            raise RuntimeError(f"{counter['pages']}페이지 중 {failed_pages}페이지 요청 실패, 게시글 없음 (차단 등)")
+    except Exception as e:
+        async with AsyncSessionLocal() as session:
+            status = await fail_task(session, task, worker_id, str(e))
+        logger.error(f"{label} 실패 ({status}): {e}")
+        return False
+    finally:
+        heartbeat.cancel()
+    
+    async with AsyncSessionLocal() as session:
+        completed = await complete_task(session, task.id, worker_id, result.total)
+    if completed:
+        logger.info(f"{label} 완료: {result.total}개 (신규 {result.inserted}개)")
+    else:
+        logger.warning(f"{label} 처리했지만 lease가 만료되어 완료 처리하지 못했습니다 (다시 처리돼도 결과는 같음)")
+    return completed
+
+
+async def run_worker(total_workers: int, drain: bool) -> int:
+    """
+    큐가 빌 때까지(drain) 또는 계속 작업을 처리
+    
+    Returns:
+        처리한 작업 수
+    """
+    settings = get_settings()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    galleries = {gallery_config["id"]: gallery_config for gallery_config in settings.target_galleries}
+    await init_db()
+    
+    processed = 0
+    logger.info(f"워커 시작: {worker_id} (전체 워커 {total_workers}개)")
+    with crawl_run(f"worker-{os.getpid()}"):
+        # 전체 워커가 호스트별 요청 속도를 나눠 가짐 (요청 간격을 워커 수만큼 늘림)
+        async with HttpClientRegistry(rate_limiter=HostRateLimiter.scaled(total_workers),
+                                      archive=PageArchive.from_settings(),
+                                      page_cache=PageCache.from_settings()) as http:
+            while True:
+                async with AsyncSessionLocal() as session:
+                    task = await lease_task(session, worker_id)
+                if task is None:
+                    if drain:
+                        break
+                    await asyncio.sleep(settings.crawl_worker_poll_seconds)
+                    continue
+                await process_task(task, worker_id, http, galleries)
+                processed += 1
+            http.log_stats()
+    logger.info(f"워커 종료: {worker_id}, 작업 {processed}개 처리")
+    return processed
+
+
+def _worker_process(total_workers: int, drain: bool) -> None:
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [{os.getpid()}] %(name)s: %(message)s")
+    asyncio.run(run_worker(total_workers, drain))
+
+
+def run_processes(processes: int, total_workers: int, drain: bool) -> None:
+    """워커 프로세스 N개 실행 후 모두 끝날 때까지 대기"""
+    if processes == 1:
+        _worker_process(total_workers, drain)
+        return
+    
+    # DB 엔진/이벤트 루프를 물려받지 않도록 spawn으로 새 인터프리터에서 시작
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_worker_process, args=(total_workers, drain), name=f"crawl-worker-{i}")
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+
+async def enqueue(args: argparse.Namespace) -> None:
+    specs = crawl_task_specs(args.pages, start_page=args.start_page, target_ids=args.target,
+                             priority=args.priority, batch=args.batch, pages_per_task=args.pages_per_task)
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        added = await enqueue_tasks(session, specs)
+        await session.commit()
+    print(f"📥 작업 {added}개 추가 (요청 {len(specs)}개, 배치 '{args.batch}', 나머지는 이미 있음)")
+
+
+async def status() -> None:
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        stats = await queue_stats(session)
+    print("📋 작업 큐: " + ", ".join(f"{name} {count}개" for name, count in stats.items()))
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="크롤링 작업 큐 워커")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="작업 처리")
+    run_parser.add_argument("--processes", type=int, default=1, help="이 머신에서 실행할 워커 프로세스 수")
+    run_parser.add_argument("--total-workers", type=int, default=None,
+                            help="모든 머신의 워커 수 합계 (호스트별 요청 속도를 나눌 때 사용, 기본: --processes)")
+    run_parser.add_argument("--drain", action="store_true", help="지금 처리할 작업이 없으면 종료")
+    
+    enqueue_parser = commands.add_parser("enqueue", help="갤러리별 페이지 구간 작업 추가")
+    enqueue_parser.add_argument("--pages", type=int, default=settings.max_pages_per_crawl, help="마지막 페이지")
+    enqueue_parser.add_argument("--start-page", type=int, default=1)
+    enqueue_parser.add_argument("--target", action="append", help="대상 갤러리 ID (여러 번 지정 가능, 기본: 전부)")
+    enqueue_parser.add_argument("--priority", type=int, default=0, help="클수록 먼저 처리")
+    enqueue_parser.add_argument("--pages-per-task", type=int, default=settings.crawl_task_pages)
+    enqueue_parser.add_argument("--batch", default=datetime.utcnow().strftime("%Y-%m-%d"),
+                                help="배치 이름 (같은 배치 안의 같은 구간은 한 번만 추가, 기본: 오늘 날짜)")
+    
+    commands.add_parser("status", help="상태별 작업 수")
+    args = parser.parse_args()
+    
+    if args.command == "run":
+        processes = max(args.processes, 1)
+        run_processes(processes, args.total_workers or processes, args.drain)
+    elif args.command == "enqueue":
+        asyncio.run(enqueue(args))
+    else:
+        asyncio.run(status())
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,9 @@ export interface Post {
   recommend_count: number
   comment_count: number
   url: string | null
+  views_per_hour?: number | null
+  recommends_per_hour?: number | null
+  comments_per_hour?: number | null
 }
 
 export interface DailyReport {
@@ -82,6 +85,7 @@ export interface CharacterRanking {
 export interface ChatServiceCharacter {
   id: number
   service: string
+  period?: string
   character_id: string
   rank: number
   name: string
@@ -104,11 +108,11 @@ export const fetchPosts = async (skip = 0, limit = 50): Promise<Post[]> => {
   return data
 }
 
-export const fetchPopularPosts = async (limit = 15, days = 7): Promise<Post[]> => {
+export const fetchPopularPosts = async (limit = 15, days = 7, sort: 'recommend' | 'velocity' = 'recommend'): Promise<Post[]> => {
   if (USE_STATIC_DATA) {
     return fetchStaticData<Post[]>('popular_posts.json')
   }
-  const { data } = await api.get('/posts/popular', { params: { limit, days } })
+  const { data } = await api.get('/posts/popular', { params: { limit, days, sort } })
   return data
 }
 
@@ -177,7 +181,7 @@ export const generateReport = async (date?: string) => {
   return data
 }
 
-export const fetchChatServiceCharacters = async (service?: string, limit = 30): Promise<ChatServiceCharacter[]> => {
+export const fetchChatServiceCharacters = async (service?: string, limit = 30, period?: string): Promise<ChatServiceCharacter[]> => {
   if (USE_STATIC_DATA) {
     const allCharacters = await fetchStaticData<ChatServiceCharacter[]>('chat_characters.json')
     // 서비스 필터링
@@ -190,6 +194,9 @@ export const fetchChatServiceCharacters = async (service?: string, limit = 30):
   if (service) {
     params.service = service
   }
+  if (period) {
+    params.period = period
+  }
   const { data } = await api.get('/characters/chat-services', { params })
   return data
 }